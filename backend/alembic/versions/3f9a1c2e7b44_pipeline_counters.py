@@ -0,0 +1,129 @@
+"""pipeline_counters
+
+Revision ID: 3f9a1c2e7b44
+Revises: 68c4af5a8d13
+Create Date: 2026-10-18 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a1c2e7b44'
+down_revision: Union[str, None] = '68c4af5a8d13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Statement-level triggers with transition tables: a set-based UPDATE of 20k
+# opportunities applies one grouped delta per counter row instead of 20k
+# single-row upserts. Transition tables only allow one event per trigger, so the
+# same function is attached three times and branches on TG_OP.
+PIPELINE_COUNTERS_FUNCTION = """
+CREATE OR REPLACE FUNCTION pipeline_counters_apply_delta() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO pipeline_counters AS pc
+            (stage, territory_id, owner_id, funding_type, deal_count, value_sgd, updated_at)
+        SELECT stage, territory_id, owner_id, funding_type,
+               count(*), coalesce(sum(round(deal_value_sgd::numeric, 2)), 0), now()
+        FROM new_rows
+        WHERE is_active
+        GROUP BY stage, territory_id, owner_id, funding_type
+        ON CONFLICT (stage, territory_id, owner_id, funding_type) DO UPDATE
+        SET deal_count = pc.deal_count + EXCLUDED.deal_count,
+            value_sgd = pc.value_sgd + EXCLUDED.value_sgd,
+            updated_at = EXCLUDED.updated_at;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO pipeline_counters AS pc
+            (stage, territory_id, owner_id, funding_type, deal_count, value_sgd, updated_at)
+        SELECT stage, territory_id, owner_id, funding_type,
+               -count(*), -coalesce(sum(round(deal_value_sgd::numeric, 2)), 0), now()
+        FROM old_rows
+        WHERE is_active
+        GROUP BY stage, territory_id, owner_id, funding_type
+        ON CONFLICT (stage, territory_id, owner_id, funding_type) DO UPDATE
+        SET deal_count = pc.deal_count + EXCLUDED.deal_count,
+            value_sgd = pc.value_sgd + EXCLUDED.value_sgd,
+            updated_at = EXCLUDED.updated_at;
+    ELSE
+        -- Net the before/after images so edits that don't touch a counted
+        -- column (notes, next_action, ...) never lock a counter row.
+        INSERT INTO pipeline_counters AS pc
+            (stage, territory_id, owner_id, funding_type, deal_count, value_sgd, updated_at)
+        SELECT stage, territory_id, owner_id, funding_type,
+               sum(delta_count), sum(delta_value), now()
+        FROM (
+            SELECT stage, territory_id, owner_id, funding_type,
+                   1 AS delta_count, round(deal_value_sgd::numeric, 2) AS delta_value
+            FROM new_rows WHERE is_active
+            UNION ALL
+            SELECT stage, territory_id, owner_id, funding_type,
+                   -1, -round(deal_value_sgd::numeric, 2)
+            FROM old_rows WHERE is_active
+        ) AS deltas
+        GROUP BY stage, territory_id, owner_id, funding_type
+        HAVING sum(delta_count) <> 0 OR sum(delta_value) <> 0
+        ON CONFLICT (stage, territory_id, owner_id, funding_type) DO UPDATE
+        SET deal_count = pc.deal_count + EXCLUDED.deal_count,
+            value_sgd = pc.value_sgd + EXCLUDED.value_sgd,
+            updated_at = EXCLUDED.updated_at;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+TRIGGERS = {
+    'INSERT': "REFERENCING NEW TABLE AS new_rows",
+    'UPDATE': "REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows",
+    'DELETE': "REFERENCING OLD TABLE AS old_rows",
+}
+
+
+def upgrade() -> None:
+    op.create_table('pipeline_counters',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('stage', postgresql.ENUM('new_hunt', 'discovery', 'proposal', 'negotiation', 'order_book', name='dealstage', create_type=False), nullable=False),
+    sa.Column('territory_id', sa.Integer(), nullable=True),
+    sa.Column('owner_id', sa.Integer(), nullable=False),
+    sa.Column('funding_type', postgresql.ENUM('customer', 'aws', 'dual', name='fundingtype', create_type=False), nullable=False),
+    sa.Column('deal_count', sa.Integer(), nullable=False),
+    sa.Column('value_sgd', sa.Numeric(precision=18, scale=2), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pipeline_counters_owner_id'), 'pipeline_counters', ['owner_id'], unique=False)
+    op.create_index('uq_pipeline_counters_group', 'pipeline_counters', ['stage', 'territory_id', 'owner_id', 'funding_type'], unique=True, postgresql_nulls_not_distinct=True)
+
+    op.execute(PIPELINE_COUNTERS_FUNCTION)
+    for event, referencing in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER opportunities_pipeline_counters_{event.lower()} "
+            f"AFTER {event} ON opportunities {referencing} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION pipeline_counters_apply_delta()"
+        )
+
+    # Backfill from existing opportunities
+    op.execute("""
+        INSERT INTO pipeline_counters (stage, territory_id, owner_id, funding_type, deal_count, value_sgd)
+        SELECT stage, territory_id, owner_id, funding_type,
+               count(*), coalesce(sum(round(deal_value_sgd::numeric, 2)), 0)
+        FROM opportunities
+        WHERE is_active
+        GROUP BY stage, territory_id, owner_id, funding_type
+    """)
+
+
+def downgrade() -> None:
+    for event in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS opportunities_pipeline_counters_{event.lower()} ON opportunities")
+    op.execute("DROP FUNCTION IF EXISTS pipeline_counters_apply_delta()")
+    op.drop_index('uq_pipeline_counters_group', table_name='pipeline_counters')
+    op.drop_index(op.f('ix_pipeline_counters_owner_id'), table_name='pipeline_counters')
+    op.drop_table('pipeline_counters')
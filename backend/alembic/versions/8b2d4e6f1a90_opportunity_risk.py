@@ -0,0 +1,181 @@
+"""opportunity_risk
+
+Revision ID: 8b2d4e6f1a90
+Revises: 3f9a1c2e7b44
+Create Date: 2026-10-18 11:40:05.771930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b2d4e6f1a90'
+down_revision: Union[str, None] = '3f9a1c2e7b44'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Risk score (0-170). Thresholds follow the days-in-stage colour rules
+# (< 15d on track, 15-30d watch, > 30d stalled):
+#   stall     15-30 days in stage -> 10; > 30 days -> 30 + 1 per 2 extra days (max 60)
+#   overdue   expected_close_date passed -> 25 + 1 per 3 days overdue (max 55)
+#   ACE       AWS-funded / program deal without an ace_id -> 15
+#   health    red -> 40, amber -> 10
+# >= 60 is critical, >= 25 is warning; anything lower gets no row.
+RISK_SCORE_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunity_risk_score(
+    p_stage dealstage,
+    p_stage_entered_at timestamptz,
+    p_expected_close_date date,
+    p_funding_type fundingtype,
+    p_program program,
+    p_ace_id varchar,
+    p_health_status healthstatus
+) RETURNS TABLE (
+    risk_score integer,
+    days_in_stage integer,
+    overdue_days integer,
+    missing_ace_fields boolean
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        (CASE
+            WHEN c.days_in_stage > 30 THEN 30 + least(c.days_in_stage - 30, 60) / 2
+            WHEN c.days_in_stage >= 15 THEN 10
+            ELSE 0
+         END
+         + CASE WHEN c.overdue_days > 0 THEN 25 + least(c.overdue_days, 90) / 3 ELSE 0 END
+         + CASE WHEN c.missing_ace_fields THEN 15 ELSE 0 END
+         + CASE p_health_status WHEN 'red' THEN 40 WHEN 'amber' THEN 10 ELSE 0 END
+        )::integer,
+        c.days_in_stage,
+        c.overdue_days,
+        c.missing_ace_fields
+    FROM (
+        SELECT
+            greatest(current_date - p_stage_entered_at::date, 0) AS days_in_stage,
+            greatest(coalesce(current_date - p_expected_close_date, 0), 0) AS overdue_days,
+            (p_funding_type IN ('aws', 'dual') OR p_program <> 'none')
+                AND nullif(btrim(p_ace_id), '') IS NULL AS missing_ace_fields
+    ) AS c
+$$;
+"""
+
+# Shared by the trigger (scoped to the changed rows) and the periodic refresh
+# (all rows); {source} is either the transition table or ``opportunities``.
+RISK_UPSERT = """
+    DELETE FROM opportunity_risk r
+    USING {source} o
+    CROSS JOIN LATERAL opportunity_risk_score(
+        o.stage, o.stage_entered_at, o.expected_close_date,
+        o.funding_type, o.program, o.ace_id, o.health_status) s
+    WHERE r.opportunity_id = o.id
+      AND (NOT o.is_active OR o.stage = 'order_book' OR s.risk_score < 25);
+
+    INSERT INTO opportunity_risk AS r
+        (opportunity_id, risk_score, severity, days_in_stage, overdue_days,
+         missing_ace_fields, health_status, scored_at)
+    SELECT o.id, s.risk_score,
+           CASE WHEN s.risk_score >= 60 THEN 'critical' ELSE 'warning' END::riskseverity,
+           s.days_in_stage, s.overdue_days, s.missing_ace_fields, o.health_status, now()
+    FROM {source} o
+    CROSS JOIN LATERAL opportunity_risk_score(
+        o.stage, o.stage_entered_at, o.expected_close_date,
+        o.funding_type, o.program, o.ace_id, o.health_status) s
+    WHERE o.is_active AND o.stage <> 'order_book' AND s.risk_score >= 25
+    ON CONFLICT (opportunity_id) DO UPDATE
+    SET risk_score = EXCLUDED.risk_score,
+        severity = EXCLUDED.severity,
+        days_in_stage = EXCLUDED.days_in_stage,
+        overdue_days = EXCLUDED.overdue_days,
+        missing_ace_fields = EXCLUDED.missing_ace_fields,
+        health_status = EXCLUDED.health_status,
+        scored_at = EXCLUDED.scored_at
+    WHERE (r.risk_score, r.days_in_stage, r.overdue_days, r.missing_ace_fields, r.health_status)
+          IS DISTINCT FROM
+          (EXCLUDED.risk_score, EXCLUDED.days_in_stage, EXCLUDED.overdue_days,
+           EXCLUDED.missing_ace_fields, EXCLUDED.health_status);
+"""
+
+RISK_TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunity_risk_apply() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+""" + RISK_UPSERT.format(source="new_rows") + """
+    RETURN NULL;
+END;
+$$;
+"""
+
+# Time-based components (stall age, overdue close) move without any write, so
+# the ranking is also refreshed periodically.
+RISK_REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION opportunity_risk_refresh_all() RETURNS integer
+LANGUAGE plpgsql AS $$
+DECLARE
+    risky integer;
+BEGIN
+""" + RISK_UPSERT.format(source="opportunities") + """
+    SELECT count(*) INTO risky FROM opportunity_risk;
+    RETURN risky;
+END;
+$$;
+"""
+
+TRIGGERS = {
+    'INSERT': "REFERENCING NEW TABLE AS new_rows",
+    'UPDATE': "REFERENCING NEW TABLE AS new_rows",
+}
+
+
+def upgrade() -> None:
+    healthstatus = postgresql.ENUM('green', 'amber', 'red', 'unknown', name='healthstatus')
+    healthstatus.create(op.get_bind(), checkfirst=True)
+    op.add_column('opportunities', sa.Column('health_status', postgresql.ENUM('green', 'amber', 'red', 'unknown', name='healthstatus', create_type=False), server_default='unknown', nullable=False))
+    op.create_index(op.f('ix_opportunities_health_status'), 'opportunities', ['health_status'], unique=False)
+
+    op.create_table('opportunity_risk',
+    sa.Column('opportunity_id', sa.Integer(), nullable=False),
+    sa.Column('risk_score', sa.Integer(), nullable=False),
+    sa.Column('severity', sa.Enum('critical', 'warning', name='riskseverity'), nullable=False),
+    sa.Column('days_in_stage', sa.Integer(), nullable=False),
+    sa.Column('overdue_days', sa.Integer(), nullable=False),
+    sa.Column('missing_ace_fields', sa.Boolean(), nullable=False),
+    sa.Column('health_status', postgresql.ENUM('green', 'amber', 'red', 'unknown', name='healthstatus', create_type=False), nullable=False),
+    sa.Column('scored_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['opportunity_id'], ['opportunities.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('opportunity_id')
+    )
+    op.create_index(op.f('ix_opportunity_risk_severity'), 'opportunity_risk', ['severity'], unique=False)
+    op.create_index('ix_opportunity_risk_rank', 'opportunity_risk', [sa.text('risk_score DESC'), 'opportunity_id'], unique=False)
+
+    op.execute(RISK_SCORE_FUNCTION)
+    op.execute(RISK_TRIGGER_FUNCTION)
+    op.execute(RISK_REFRESH_FUNCTION)
+    for event, referencing in TRIGGERS.items():
+        op.execute(
+            f"CREATE TRIGGER opportunities_risk_{event.lower()} "
+            f"AFTER {event} ON opportunities {referencing} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION opportunity_risk_apply()"
+        )
+
+    op.execute("SELECT opportunity_risk_refresh_all()")
+
+
+def downgrade() -> None:
+    for event in TRIGGERS:
+        op.execute(f"DROP TRIGGER IF EXISTS opportunities_risk_{event.lower()} ON opportunities")
+    op.execute("DROP FUNCTION IF EXISTS opportunity_risk_refresh_all()")
+    op.execute("DROP FUNCTION IF EXISTS opportunity_risk_apply()")
+    op.execute("DROP FUNCTION IF EXISTS opportunity_risk_score(dealstage, timestamptz, date, fundingtype, program, varchar, healthstatus)")
+    op.drop_index('ix_opportunity_risk_rank', table_name='opportunity_risk')
+    op.drop_index(op.f('ix_opportunity_risk_severity'), table_name='opportunity_risk')
+    op.drop_table('opportunity_risk')
+    sa.Enum(name='riskseverity').drop(op.get_bind(), checkfirst=True)
+    op.drop_index(op.f('ix_opportunities_health_status'), table_name='opportunities')
+    op.drop_column('opportunities', 'health_status')
+    sa.Enum(name='healthstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,28 @@
+"""import_job_discarded
+
+Revision ID: a4c8e2f6b913
+Revises: f1b7d3e9a462
+Create Date: 2026-10-19 14:21:09.318442
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c8e2f6b913'
+down_revision: Union[str, None] = 'f1b7d3e9a462'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE importjobstatus ADD VALUE IF NOT EXISTS 'discarded' AFTER 'failed'")
+
+
+def downgrade() -> None:
+    # Postgres cannot drop an enum value; 'discarded' stays on the type
+    pass
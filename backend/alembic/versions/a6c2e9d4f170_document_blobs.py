@@ -0,0 +1,78 @@
+"""document_blobs
+
+Revision ID: a6c2e9d4f170
+Revises: f5b1d7c3a842
+Create Date: 2026-10-18 19:21:08.530417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a6c2e9d4f170'
+down_revision: Union[str, None] = 'f5b1d7c3a842'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# ref_count follows the documents pointing at a blob, whichever way they go:
+# the documents API, or an opportunity delete cascading to its documents.
+# Blobs that drop to zero stay until purged together with their S3 object.
+DOCUMENT_BLOB_REFS_FUNCTION = """
+CREATE OR REPLACE FUNCTION document_blobs_apply_ref() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.content_sha256 IS NOT NULL THEN
+        UPDATE document_blobs SET ref_count = ref_count - 1
+        WHERE sha256 = OLD.content_sha256;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.content_sha256 IS NOT NULL THEN
+        UPDATE document_blobs SET ref_count = ref_count + 1
+        WHERE sha256 = NEW.content_sha256;
+    END IF;
+    RETURN NULL;
+END;
+$$;
+"""
+
+
+def upgrade() -> None:
+    op.create_table('document_blobs',
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('s3_key', sa.String(length=512), nullable=False),
+    sa.Column('size_bytes', sa.BigInteger(), nullable=False),
+    sa.Column('mime_type', sa.String(length=100), nullable=True),
+    sa.Column('ref_count', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('sha256')
+    )
+    op.create_index('ix_document_blobs_unreferenced', 'document_blobs', ['sha256'], unique=False, postgresql_where=sa.text('ref_count = 0'))
+
+    op.add_column('documents', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+    op.create_foreign_key('documents_content_sha256_fkey', 'documents', 'document_blobs', ['content_sha256'], ['sha256'])
+    op.create_index(op.f('ix_documents_content_sha256'), 'documents', ['content_sha256'], unique=False)
+    # Deduplicated documents share their blob's key
+    op.drop_constraint('documents_s3_key_key', 'documents', type_='unique')
+    op.create_index(op.f('ix_documents_s3_key'), 'documents', ['s3_key'], unique=False)
+
+    op.execute(DOCUMENT_BLOB_REFS_FUNCTION)
+    op.execute(
+        "CREATE TRIGGER documents_blob_refs "
+        "AFTER INSERT OR DELETE OR UPDATE OF content_sha256 ON documents "
+        "FOR EACH ROW EXECUTE FUNCTION document_blobs_apply_ref()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS documents_blob_refs ON documents")
+    op.execute("DROP FUNCTION IF EXISTS document_blobs_apply_ref()")
+    op.drop_index(op.f('ix_documents_s3_key'), table_name='documents')
+    op.create_unique_constraint('documents_s3_key_key', 'documents', ['s3_key'])
+    op.drop_index(op.f('ix_documents_content_sha256'), table_name='documents')
+    op.drop_constraint('documents_content_sha256_fkey', 'documents', type_='foreignkey')
+    op.drop_column('documents', 'content_sha256')
+    op.drop_index('ix_document_blobs_unreferenced', table_name='document_blobs')
+    op.drop_table('document_blobs')
@@ -0,0 +1,44 @@
+"""docai_pipeline
+
+Revision ID: b3e8f1a7c925
+Revises: a6c2e9d4f170
+Create Date: 2026-10-18 21:58:44.207319
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3e8f1a7c925'
+down_revision: Union[str, None] = 'a6c2e9d4f170'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE extractionstatus ADD VALUE IF NOT EXISTS 'failed'")
+    op.add_column('documents', sa.Column('ocr_text', sa.Text(), nullable=True))
+    op.add_column('documents', sa.Column('claimed_by', sa.String(length=100), nullable=True))
+    op.add_column('documents', sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('documents', sa.Column('attempts', sa.Integer(), server_default=sa.text('0'), nullable=False))
+    op.add_column('documents', sa.Column('error_message', sa.Text(), nullable=True))
+    # Stage workers claim the oldest documents waiting in a pipeline status
+    op.create_index(
+        'ix_documents_pipeline_queue', 'documents', ['extraction_status', 'uploaded_at', 'id'],
+        unique=False,
+        postgresql_where=sa.text("extraction_status IN ('pending', 'ocr_running', 'extracting')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_pipeline_queue', table_name='documents')
+    op.drop_column('documents', 'error_message')
+    op.drop_column('documents', 'attempts')
+    op.drop_column('documents', 'heartbeat_at')
+    op.drop_column('documents', 'claimed_by')
+    op.drop_column('documents', 'ocr_text')
+    # Postgres cannot drop an enum value; 'failed' stays on the type
@@ -0,0 +1,58 @@
+"""import_staging_rows
+
+Revision ID: c41e7a9d2b15
+Revises: 8b2d4e6f1a90
+Create Date: 2026-10-18 14:02:31.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c41e7a9d2b15'
+down_revision: Union[str, None] = '8b2d4e6f1a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # UNLOGGED: staged rows are scratch data, skip WAL for the bulk COPY
+    op.create_table('import_staging_rows',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('batch_id', sa.String(length=36), nullable=False),
+    sa.Column('row_number', sa.Integer(), nullable=False),
+    sa.Column('account_name', sa.String(length=255), nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('stage', sa.String(length=20), nullable=False),
+    sa.Column('deal_value', sa.Float(), nullable=False),
+    sa.Column('currency_code', sa.String(length=3), nullable=False),
+    sa.Column('funding_type', sa.String(length=20), nullable=False),
+    sa.Column('program', sa.String(length=20), nullable=False),
+    sa.Column('expected_close_date', sa.Date(), nullable=True),
+    sa.Column('ace_id', sa.String(length=100), nullable=True),
+    sa.Column('po_id', sa.String(length=100), nullable=True),
+    sa.Column('map_status', sa.String(length=50), nullable=True),
+    sa.Column('owner_ref', sa.String(length=255), nullable=True),
+    sa.Column('territory_name', sa.String(length=100), nullable=True),
+    sa.Column('notes', sa.Text(), nullable=True),
+    sa.Column('next_action', sa.Text(), nullable=True),
+    sa.Column('is_active', sa.Boolean(), nullable=False),
+    sa.Column('account_id', sa.Integer(), nullable=True),
+    sa.Column('owner_id', sa.Integer(), nullable=True),
+    sa.Column('territory_id', sa.Integer(), nullable=True),
+    sa.Column('deal_value_sgd', sa.Float(), nullable=True),
+    sa.Column('opportunity_id', sa.Integer(), nullable=True),
+    sa.Column('merge_action', sa.String(length=20), nullable=True),
+    sa.Column('error', sa.String(length=100), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    prefixes=['UNLOGGED'],
+    )
+    op.create_index('ix_import_staging_rows_batch', 'import_staging_rows', ['batch_id', 'row_number'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_import_staging_rows_batch', table_name='import_staging_rows')
+    op.drop_table('import_staging_rows')
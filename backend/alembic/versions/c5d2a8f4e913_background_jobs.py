@@ -0,0 +1,60 @@
+"""background_jobs
+
+Revision ID: c5d2a8f4e913
+Revises: b3e8f1a7c925
+Create Date: 2026-10-18 23:05:17.482910
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d2a8f4e913'
+down_revision: Union[str, None] = 'b3e8f1a7c925'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('background_jobs',
+    sa.Column('id', sa.BigInteger(), nullable=False),
+    sa.Column('task', sa.String(length=100), nullable=False),
+    sa.Column('payload', sa.JSON(), nullable=False),
+    sa.Column('priority', sa.Integer(), nullable=False),
+    sa.Column('status', sa.Enum('queued', 'running', 'succeeded', 'failed', name='jobstatus'), nullable=False),
+    sa.Column('dedupe_key', sa.String(length=200), nullable=True),
+    sa.Column('run_after', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('attempts', sa.Integer(), nullable=False),
+    sa.Column('max_attempts', sa.Integer(), nullable=False),
+    sa.Column('locked_by', sa.String(length=100), nullable=True),
+    sa.Column('locked_until', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('result', sa.JSON(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_background_jobs_task'), 'background_jobs', ['task'], unique=False)
+    # Workers take the next live job in priority order
+    op.create_index(
+        'ix_background_jobs_ready', 'background_jobs', [sa.text('priority DESC'), 'run_after', 'id'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('queued', 'running')")
+    )
+    op.create_index(
+        'ix_background_jobs_dedupe_key', 'background_jobs', ['dedupe_key'],
+        unique=True,
+        postgresql_where=sa.text("dedupe_key IS NOT NULL AND status IN ('queued', 'running')")
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_background_jobs_dedupe_key', table_name='background_jobs')
+    op.drop_index('ix_background_jobs_ready', table_name='background_jobs')
+    op.drop_index(op.f('ix_background_jobs_task'), table_name='background_jobs')
+    op.drop_table('background_jobs')
+    sa.Enum(name='jobstatus').drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,30 @@
+"""import_account_resolution
+
+Revision ID: d7f3b8e1c620
+Revises: c41e7a9d2b15
+Create Date: 2026-10-18 15:27:44.402617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7f3b8e1c620'
+down_revision: Union[str, None] = 'c41e7a9d2b15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('import_staging_rows', sa.Column('account_decision', sa.String(length=10), nullable=True))
+    op.add_column('import_staging_rows', sa.Column('account_score', sa.Float(), nullable=True))
+    op.add_column('import_staging_rows', sa.Column('error_detail', sa.String(length=255), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('import_staging_rows', 'error_detail')
+    op.drop_column('import_staging_rows', 'account_score')
+    op.drop_column('import_staging_rows', 'account_decision')
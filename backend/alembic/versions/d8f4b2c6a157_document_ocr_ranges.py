@@ -0,0 +1,40 @@
+"""document_ocr_ranges
+
+Revision ID: d8f4b2c6a157
+Revises: c5d2a8f4e913
+Create Date: 2026-10-18 23:41:36.905128
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8f4b2c6a157'
+down_revision: Union[str, None] = 'c5d2a8f4e913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('documents', sa.Column('page_count', sa.Integer(), nullable=True))
+    op.create_table('document_ocr_ranges',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('document_id', sa.Integer(), nullable=False),
+    sa.Column('first_page', sa.Integer(), nullable=False),
+    sa.Column('last_page', sa.Integer(), nullable=False),
+    sa.Column('s3_key', sa.String(length=512), nullable=False),
+    sa.Column('job_id', sa.String(length=255), nullable=True),
+    sa.Column('text', sa.Text(), nullable=True),
+    sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['document_id'], ['documents.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('document_id', 'first_page', name='uq_document_ocr_ranges_document_page')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('document_ocr_ranges')
+    op.drop_column('documents', 'page_count')
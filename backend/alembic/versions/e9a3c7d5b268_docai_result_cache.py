@@ -0,0 +1,39 @@
+"""docai_result_cache
+
+Revision ID: e9a3c7d5b268
+Revises: d8f4b2c6a157
+Create Date: 2026-10-19 00:12:50.317264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a3c7d5b268'
+down_revision: Union[str, None] = 'd8f4b2c6a157'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('docai_result_cache',
+    sa.Column('content_sha256', sa.String(length=64), nullable=False),
+    sa.Column('stage', sa.String(length=20), nullable=False),
+    sa.Column('version', sa.String(length=255), nullable=False),
+    sa.Column('ocr_text', sa.Text(), nullable=True),
+    sa.Column('page_count', sa.Integer(), nullable=True),
+    sa.Column('extracted_fields', sa.JSON(), nullable=True),
+    sa.Column('confidence_score', sa.Float(), nullable=True),
+    sa.Column('hits', sa.Integer(), server_default=sa.text('0'), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('last_hit_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['content_sha256'], ['document_blobs.sha256'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('content_sha256', 'stage', 'version')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('docai_result_cache')
@@ -0,0 +1,59 @@
+"""document_fields_jsonb
+
+Revision ID: f1b7d3e9a462
+Revises: e9a3c7d5b268
+Create Date: 2026-10-19 10:12:48.531907
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1b7d3e9a462'
+down_revision: Union[str, None] = 'e9a3c7d5b268'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Lowest confidence among the fields the model found a value for (NULL if none)
+MIN_FIELD_CONFIDENCE = """
+CREATE FUNCTION docai_min_field_confidence(fields jsonb) RETURNS double precision
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT min((entry->>'confidence')::double precision)
+    FROM jsonb_each(CASE WHEN jsonb_typeof(fields) = 'object' THEN fields END) AS field(name, entry)
+    WHERE jsonb_typeof(entry) = 'object' AND coalesce(entry->'value', 'null'::jsonb) <> 'null'::jsonb
+$$
+"""
+
+
+def upgrade() -> None:
+    op.alter_column(
+        'documents', 'extracted_fields',
+        type_=postgresql.JSONB(astext_type=sa.Text()),
+        postgresql_using='extracted_fields::jsonb',
+    )
+    op.execute(MIN_FIELD_CONFIDENCE)
+    op.create_index(
+        'ix_documents_extracted_fields', 'documents', ['extracted_fields'],
+        unique=False, postgresql_using='gin', postgresql_ops={'extracted_fields': 'jsonb_path_ops'},
+    )
+    op.create_index(
+        'ix_documents_review_min_confidence', 'documents',
+        [sa.text('docai_min_field_confidence(extracted_fields)')],
+        unique=False, postgresql_where=sa.text("extraction_status = 'review'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_documents_review_min_confidence', table_name='documents')
+    op.drop_index('ix_documents_extracted_fields', table_name='documents')
+    op.execute("DROP FUNCTION docai_min_field_confidence(jsonb)")
+    op.alter_column(
+        'documents', 'extracted_fields',
+        type_=sa.JSON(),
+        postgresql_using='extracted_fields::json',
+    )
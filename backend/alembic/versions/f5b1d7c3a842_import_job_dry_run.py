@@ -0,0 +1,31 @@
+"""import_job_dry_run
+
+Revision ID: f5b1d7c3a842
+Revises: e2a9c5f4d318
+Create Date: 2026-10-18 18:02:37.114205
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5b1d7c3a842'
+down_revision: Union[str, None] = 'e2a9c5f4d318'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TYPE importjobstatus ADD VALUE IF NOT EXISTS 'previewed' AFTER 'merging'")
+    op.add_column('import_jobs', sa.Column('dry_run', sa.Boolean(), server_default=sa.text('false'), nullable=False))
+    op.add_column('import_jobs', sa.Column('preview', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('import_jobs', 'preview')
+    op.drop_column('import_jobs', 'dry_run')
+    # Postgres cannot drop an enum value; 'previewed' stays on the type
@@ -1,8 +1,12 @@
 from fastapi import APIRouter
-from .endpoints import health, auth, users
+from .endpoints import health, auth, users, dashboard, imports, exports, documents
 
 api_router = APIRouter()
 
 api_router.include_router(health.router, tags=["health"])
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+api_router.include_router(imports.router, prefix="/imports", tags=["imports"])
+api_router.include_router(exports.router, prefix="/exports", tags=["exports"])
+api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
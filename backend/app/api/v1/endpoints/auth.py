@@ -10,8 +10,8 @@ from datetime import datetime
 
 from app.core.database import get_db
 from app.core.config import settings
-from app.core.security import verify_password, create_access_token, get_password_hash
-from app.core.deps import get_current_user
+from app.core.security import verify_password_async, create_access_token, get_password_hash_async
+from app.core.deps import forget_user, get_current_user
 from app.models.user import User
 from app.schemas.user_schemas import UserCreate, UserResponse, LoginResponse
 
@@ -41,7 +41,7 @@ async def login(
     result = await db.execute(select(User).where(User.email == form_data.username))
     user = result.scalar_one_or_none()
 
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    if not user or not await verify_password_async(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -57,6 +57,7 @@ async def login(
     # Stamp last login
     user.last_login = datetime.utcnow()
     await db.commit()
+    forget_user(user.id)
     await db.refresh(user)
 
     # Issue JWT — sub carries the user PK as a string
@@ -101,7 +102,7 @@ async def register(
 
     new_user = User(
         email=user_data.email,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await get_password_hash_async(user_data.password),
         first_name=user_data.first_name,
         last_name=user_data.last_name,
         role=user_data.role,
@@ -0,0 +1,130 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+import structlog
+from ....core.database import get_db
+from ....core.deps import get_current_user, get_current_active_superuser
+from ....models.user import User
+from ....models.opportunity import FundingType
+from ....schemas.dashboard import (
+    PipelineSummarySchema,
+    PipelineCounterReconcileSchema,
+    AttentionRequiredResponseSchema,
+)
+from ....services.pipeline_counter_service import PipelineCounterService
+from ....services.risk_scoring_service import RiskScoringService
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+@router.get(
+    "/pipeline-summary",
+    response_model=PipelineSummarySchema,
+    summary="Get pipeline summary",
+    description="Headline pipeline KPIs read from the incrementally maintained pipeline counters"
+)
+async def get_pipeline_summary(
+    territory_id: Optional[int] = Query(None, description="Filter by territory"),
+    owner_id: Optional[int] = Query(None, description="Filter by deal owner"),
+    funding_type: Optional[FundingType] = Query(None, description="Filter by funding type"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> PipelineSummarySchema:
+    """Get total pipeline value and deals in progress."""
+    try:
+        service = PipelineCounterService(db)
+        return await service.get_summary(
+            territory_id=territory_id,
+            owner_id=owner_id,
+            funding_type=funding_type,
+        )
+    except Exception as e:
+        logger.error("Error retrieving pipeline summary", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving pipeline summary"
+        )
+
+
+@router.post(
+    "/pipeline-counters/reconcile",
+    response_model=PipelineCounterReconcileSchema,
+    summary="Reconcile pipeline counters",
+    description="Compare pipeline counters with the opportunities table and optionally rebuild them (admin only)"
+)
+async def reconcile_pipeline_counters(
+    repair: bool = Query(False, description="Rebuild the counters if drift is found"),
+    current_user: User = Depends(get_current_active_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> PipelineCounterReconcileSchema:
+    """Run the pipeline counter reconciliation job (admin only)."""
+    try:
+        service = PipelineCounterService(db)
+        result = await service.reconcile(repair=repair)
+
+        logger.info(
+            "Pipeline counters reconciled",
+            drifted_groups=result.drifted_groups,
+            repaired=result.repaired,
+            requested_by=current_user.id,
+        )
+        return result
+
+    except Exception as e:
+        logger.error("Error reconciling pipeline counters", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error reconciling pipeline counters"
+        )
+
+
+@router.get(
+    "/attention-required",
+    response_model=AttentionRequiredResponseSchema,
+    summary="Get deals requiring attention",
+    description="Top risky deals from the precomputed risk ranking, with critical and warning counts"
+)
+async def get_attention_required(
+    limit: int = Query(10, ge=1, le=100, description="Number of deals to return"),
+    territory_id: Optional[int] = Query(None, description="Filter by territory"),
+    owner_id: Optional[int] = Query(None, description="Filter by deal owner"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AttentionRequiredResponseSchema:
+    """Get the top risky deals."""
+    try:
+        service = RiskScoringService(db)
+        return await service.get_attention_required(
+            limit=limit,
+            territory_id=territory_id,
+            owner_id=owner_id,
+        )
+    except Exception as e:
+        logger.error("Error retrieving attention-required deals", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error retrieving attention-required deals"
+        )
+
+
+@router.post(
+    "/attention-required/refresh",
+    summary="Refresh risk ranking",
+    description="Re-score every open deal to pick up stall age and overdue close dates (admin only)"
+)
+async def refresh_attention_required(
+    current_user: User = Depends(get_current_active_superuser),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    """Run the risk ranking refresh job (admin only)."""
+    try:
+        service = RiskScoringService(db)
+        deals_at_risk = await service.refresh_all()
+        return {"deals_at_risk": deals_at_risk}
+    except Exception as e:
+        logger.error("Error refreshing risk ranking", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error refreshing risk ranking"
+        )
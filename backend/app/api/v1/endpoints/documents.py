@@ -0,0 +1,241 @@
+import os
+from urllib.parse import quote
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+import structlog
+from ....core.config import settings
+from ....core.database import get_db
+from ....core.deps import get_current_sales_user, get_current_user
+from ....models.document import DocumentType
+from ....models.opportunity import Opportunity
+from ....models.user import User, UserRole
+from ....schemas.document_schemas import DocumentDetailSchema, DocumentReviewSchema, DocumentUploadSchema
+from ....services.document_service import DocumentService, low_confidence_fields
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+def _upload_size(upload: UploadFile) -> int:
+    if upload.size is not None:
+        return upload.size
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+
+@router.post(
+    "",
+    response_model=DocumentUploadSchema,
+    status_code=status.HTTP_201_CREATED,
+    summary="Upload document",
+    description="Attach a document (SOW, PO, handover, ...) to a deal. Content already stored for any deal is referenced instead of uploaded again."
+)
+async def upload_document(
+    opportunity_id: int = Form(..., description="Opportunity to attach the document to"),
+    document_type: DocumentType = Form(DocumentType.other, description="Document type"),
+    file: UploadFile = File(..., description="Document file"),
+    current_user: User = Depends(get_current_sales_user),
+    db: AsyncSession = Depends(get_db),
+) -> DocumentUploadSchema:
+    """Store the upload under its content hash and create the document."""
+    if _upload_size(file) > settings.docai_max_file_size_mb * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {settings.docai_max_file_size_mb} MB"
+        )
+    if await db.get(Opportunity, opportunity_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Opportunity not found"
+        )
+
+    try:
+        stored = await DocumentService(db).store_document(
+            opportunity_id,
+            document_type,
+            file.file,
+            file.filename or "document",
+            file.content_type,
+            current_user,
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error uploading document", opportunity_id=opportunity_id, error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error uploading document"
+        )
+    return DocumentUploadSchema.model_validate(stored.document).model_copy(
+        update={"deduplicated": stored.deduplicated}
+    )
+
+
+def _review_item(document, threshold: float) -> DocumentReviewSchema:
+    return DocumentReviewSchema.model_validate(document).model_copy(
+        update={"low_confidence_fields": low_confidence_fields(document, threshold)}
+    )
+
+
+@router.get(
+    "/review",
+    response_model=List[DocumentReviewSchema],
+    summary="Review queue",
+    description="Documents awaiting review, oldest extraction first; optionally only those with a field under the confidence threshold"
+)
+async def get_review_queue(
+    low_confidence: bool = Query(False, description="Only documents with a field under the confidence threshold"),
+    threshold: Optional[float] = Query(None, ge=0.0, le=1.0, description="Confidence threshold (default DOCAI_MIN_CONFIDENCE_THRESHOLD)"),
+    opportunity_id: Optional[int] = Query(None, description="Filter by opportunity"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(50, ge=1, le=200, description="Page size"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> List[DocumentReviewSchema]:
+    """Reviewer queue with extracted fields and the ones that need a closer look."""
+    threshold = settings.docai_min_confidence_threshold if threshold is None else threshold
+    documents = await DocumentService(db).review_queue(
+        low_confidence=low_confidence,
+        threshold=threshold,
+        opportunity_id=opportunity_id,
+        page=page,
+        page_size=page_size,
+    )
+    return [_review_item(document, threshold) for document in documents]
+
+
+@router.get(
+    "/search",
+    response_model=List[DocumentReviewSchema],
+    summary="Find documents by PO number",
+    description="Documents whose extracted PO number matches exactly, newest first"
+)
+async def search_documents(
+    po_number: str = Query(..., min_length=1, max_length=100, description="Purchase order number"),
+    limit: int = Query(50, ge=1, le=200, description="Maximum documents to return"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> List[DocumentReviewSchema]:
+    """Look up a PO across every document's extracted fields."""
+    documents = await DocumentService(db).find_by_field("po_id", po_number, limit=limit)
+    return [_review_item(document, settings.docai_min_confidence_threshold) for document in documents]
+
+
+@router.get(
+    "/{document_id}",
+    response_model=DocumentDetailSchema,
+    summary="Get document",
+    description="Document details with Document AI progress; long PDFs report pages OCR'd so far"
+)
+async def get_document(
+    document_id: int,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> DocumentDetailSchema:
+    """Document with pipeline status, for the review screen to poll."""
+    service = DocumentService(db)
+    document = await service.get_document(document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    return DocumentDetailSchema.model_validate(document).model_copy(
+        update={"ocr_pages_done": await service.ocr_pages_done(document)}
+    )
+
+
+@router.delete(
+    "/{document_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    summary="Delete document",
+    description="Delete a document (its uploader or an admin); its file is removed once no other document shares the same content"
+)
+async def delete_document(
+    document_id: int,
+    current_user: User = Depends(get_current_sales_user),
+    db: AsyncSession = Depends(get_db),
+) -> Response:
+    """Delete a document and release its stored content."""
+    service = DocumentService(db)
+    document = await service.get_document(document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+    if (
+        document.uploaded_by_id != current_user.id
+        and current_user.role != UserRole.admin
+        and not current_user.is_superuser
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only the uploader or an admin can delete this document"
+        )
+
+    try:
+        await service.delete_document(document)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error deleting document", document_id=document_id, error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error deleting document"
+        )
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+@router.get(
+    "/{document_id}/content",
+    summary="Stream document",
+    description="Stream a document's file for preview or download; supports single byte-range requests",
+    response_class=StreamingResponse,
+    responses={206: {"description": "Partial content (Range request)"}, 416: {"description": "Range not satisfiable"}},
+)
+async def get_document_content(
+    document_id: int,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Proxy the file from S3 chunk by chunk (PDF viewers fetch pages with Range requests)."""
+    service = DocumentService(db)
+    document = await service.get_document(document_id)
+    if document is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Document not found"
+        )
+
+    try:
+        stream = await service.open_content(document, range_header)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error opening document content", document_id=document_id, error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error opening document"
+        )
+
+    headers = {
+        "Accept-Ranges": "bytes",
+        "Content-Length": str(stream.content_length),
+        "Content-Disposition": f"inline; filename*=UTF-8''{quote(document.original_filename)}",
+    }
+    if stream.etag:
+        headers["ETag"] = stream.etag
+    if stream.partial:
+        headers["Content-Range"] = stream.content_range
+    return StreamingResponse(
+        stream.chunks,
+        status_code=status.HTTP_206_PARTIAL_CONTENT if stream.partial else status.HTTP_200_OK,
+        media_type=document.mime_type or stream.content_type or "application/octet-stream",
+        headers=headers,
+    )
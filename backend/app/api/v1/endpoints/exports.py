@@ -0,0 +1,98 @@
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import StreamingResponse
+import structlog
+from ....core.deps import get_current_user
+from ....models.user import User
+from ....schemas.export_schemas import ExportColumnSchema, ExportRequestSchema, ExportUploadSchema
+from ....services.export import COLUMNS, DEFAULT_COLUMNS, ExportRequestError, PipelineExport
+from ....services.storage import get_storage
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+def _prepare_export(request: ExportRequestSchema, user: User) -> PipelineExport:
+    try:
+        return PipelineExport(
+            user,
+            export_format=request.format,
+            columns=request.columns,
+            filter_model=request.filter_model,
+            sort_model=[entry.model_dump() for entry in request.sort_model],
+            include_inactive=request.include_inactive,
+        )
+    except ExportRequestError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Error preparing pipeline export", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error preparing pipeline export"
+        )
+
+
+@router.get(
+    "/opportunities/columns",
+    response_model=List[ExportColumnSchema],
+    summary="List export columns",
+    description="Columns available for pipeline export projections, filters and sorts"
+)
+async def list_export_columns(
+    current_user: User = Depends(get_current_user),
+) -> List[ExportColumnSchema]:
+    """Exportable pipeline columns."""
+    return [
+        ExportColumnSchema(key=column.key, header=column.header, kind=column.kind, default=column.key in DEFAULT_COLUMNS)
+        for column in COLUMNS
+    ]
+
+
+@router.post(
+    "/opportunities",
+    summary="Export pipeline",
+    description="Stream the pipeline as .xlsx or .csv using the grid's filter model, sort model and column projection",
+    response_class=StreamingResponse,
+    responses={200: {"content": {
+        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet": {},
+        "text/csv": {},
+    }}},
+)
+async def export_opportunities(
+    request: ExportRequestSchema,
+    current_user: User = Depends(get_current_user),
+) -> StreamingResponse:
+    """Stream an export; rows are written as they are read from the database."""
+    export = _prepare_export(request, current_user)
+    return StreamingResponse(
+        export.stream(),
+        media_type=export.media_type,
+        headers={"Content-Disposition": f'attachment; filename="{export.filename}"'},
+    )
+
+
+@router.post(
+    "/opportunities/s3",
+    response_model=ExportUploadSchema,
+    summary="Export pipeline to S3",
+    description="Stream the export straight into S3 (multipart upload) and return a presigned download URL"
+)
+async def export_opportunities_to_s3(
+    request: ExportRequestSchema,
+    current_user: User = Depends(get_current_user),
+) -> ExportUploadSchema:
+    """Write a large export to S3 instead of through this connection."""
+    export = _prepare_export(request, current_user)
+    try:
+        return await export.upload(get_storage())
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Error exporting pipeline to S3", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error exporting pipeline to S3"
+        )
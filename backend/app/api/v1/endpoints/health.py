@@ -1,8 +1,11 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from ....core.deps import get_db
+from ....core.deps import get_db, get_current_active_superuser
 from ....core.config import settings
+from ....core.metrics import metrics_snapshot
+from ....services.s3_service import s3_bucket_status
+from ....models.user import User
 import time
 from datetime import datetime
 
@@ -52,8 +55,21 @@ async def detailed_health_check(db: AsyncSession = Depends(get_db)):
             "message": f"Database connection failed: {str(e)}"
         }
     
+    # S3 bucket status from the background probe (no network call here)
+    if settings.storage_backend == "s3":
+        health_info["checks"]["s3"] = s3_bucket_status()
+
     # Response time
     response_time = round((time.time() - start_time) * 1000, 2)
     health_info["response_time_ms"] = response_time
     
-    return health_info
\ No newline at end of file
+    return health_info
+
+
+@router.get("/health/metrics")
+async def concurrency_metrics(current_user: User = Depends(get_current_active_superuser)):
+    """Queue depth, in-flight work and latency of bounded worker pools in this process (admin only)."""
+    return {
+        "timestamp": datetime.utcnow().isoformat(),
+        "metrics": metrics_snapshot()
+    }
@@ -0,0 +1,199 @@
+import os
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from sqlalchemy.ext.asyncio import AsyncSession
+import structlog
+from ....core.config import settings
+from ....core.database import get_db
+from ....core.deps import get_current_import_user
+from ....models.import_job import ImportJobStatus
+from ....models.user import User
+from ....schemas.import_schemas import ImportJobSchema
+from ....services.import_wizard import (
+    ImportFileError,
+    ImportWizardService,
+    job_to_schema,
+    start_import_job,
+)
+
+logger = structlog.get_logger()
+router = APIRouter()
+
+
+def _upload_size(upload: UploadFile) -> int:
+    if upload.size is not None:
+        return upload.size
+    upload.file.seek(0, os.SEEK_END)
+    size = upload.file.tell()
+    upload.file.seek(0)
+    return size
+
+
+@router.post(
+    "/opportunities",
+    response_model=ImportJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Import deal tracker",
+    description="Queue an .xlsx / .csv deal tracker import into accounts and opportunities (admin, CRO, sales manager). Poll the returned job for progress. With dry_run the job stops at a diff preview until committed."
+)
+async def import_opportunities(
+    file: UploadFile = File(..., description="Deal tracker workbook (.xlsx) or CSV export"),
+    dry_run: bool = Query(False, description="Preview inserts, updates and unchanged rows without writing"),
+    current_user: User = Depends(get_current_import_user),
+    db: AsyncSession = Depends(get_db),
+) -> ImportJobSchema:
+    """Spool the upload and start a background import job."""
+    if _upload_size(file) > settings.import_max_file_size_mb * 1024 * 1024:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {settings.import_max_file_size_mb} MB"
+        )
+
+    try:
+        service = ImportWizardService(db, current_user)
+        job = await service.create_job(file.file, file.filename or "", dry_run=dry_run)
+        start_import_job(job.id)
+        return job_to_schema(job)
+    except ImportFileError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Error queuing import", error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error queuing import"
+        )
+
+
+@router.get(
+    "/jobs/{job_id}",
+    response_model=ImportJobSchema,
+    summary="Get import job",
+    description="Progress of an import job: rows processed, errors so far and ETA"
+)
+async def get_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_import_user),
+    db: AsyncSession = Depends(get_db),
+) -> ImportJobSchema:
+    """Poll an import job."""
+    job = await ImportWizardService(db, current_user).get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    return job_to_schema(job)
+
+
+@router.post(
+    "/jobs/{job_id}/resume",
+    response_model=ImportJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Resume import job",
+    description="Resume a failed import job from its last committed chunk"
+)
+async def resume_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_import_user),
+    db: AsyncSession = Depends(get_db),
+) -> ImportJobSchema:
+    """Restart a failed job; staged chunks are kept."""
+    job = await ImportWizardService(db, current_user).get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    if job.status == ImportJobStatus.completed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import job already completed"
+        )
+    if job.status == ImportJobStatus.previewed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import job is a finished preview; commit it instead"
+        )
+    if job.status == ImportJobStatus.discarded:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Import job was discarded"
+        )
+    start_import_job(job.id)
+    return job_to_schema(job)
+
+
+@router.post(
+    "/jobs/{job_id}/commit",
+    response_model=ImportJobSchema,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Commit import preview",
+    description="Merge the staged rows of a previewed dry-run job; unchanged rows are skipped"
+)
+async def commit_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_import_user),
+    db: AsyncSession = Depends(get_db),
+) -> ImportJobSchema:
+    """Turn a dry-run preview into a real import."""
+    service = ImportWizardService(db, current_user)
+    job = await service.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+    if job.status != ImportJobStatus.previewed:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only previewed dry-run jobs can be committed"
+        )
+
+    try:
+        job = await service.commit_preview(job)
+        start_import_job(job.id)
+        return job_to_schema(job)
+    except Exception as e:
+        logger.error("Error committing import preview", job_id=job_id, error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error committing import preview"
+        )
+
+
+@router.post(
+    "/jobs/{job_id}/discard",
+    response_model=ImportJobSchema,
+    summary="Discard import job",
+    description="Drop a previewed dry run or a failed job: its staged rows and spooled upload are removed and it can no longer be committed or resumed"
+)
+async def discard_import_job(
+    job_id: str,
+    current_user: User = Depends(get_current_import_user),
+    db: AsyncSession = Depends(get_db),
+) -> ImportJobSchema:
+    """Throw away a preview or a failed import."""
+    service = ImportWizardService(db, current_user)
+    job = await service.get_job(job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Import job not found"
+        )
+
+    try:
+        discarded = await service.discard_job(job)
+    except Exception as e:
+        logger.error("Error discarding import job", job_id=job_id, error=str(e), exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Error discarding import job"
+        )
+    if not discarded:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only previewed or failed import jobs can be discarded"
+        )
+    return job_to_schema(job)
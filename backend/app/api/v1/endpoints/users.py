@@ -4,7 +4,7 @@ from sqlalchemy import select
 from typing import Optional, List
 import structlog
 from ....core.database import get_db
-from ....core.deps import get_current_user, get_current_active_superuser
+from ....core.deps import forget_user, get_current_user, get_current_active_superuser
 from ....models.user import User
 from ....schemas.user_schemas import UserResponse, UserUpdate
 
@@ -118,6 +118,7 @@ async def update_user(
             setattr(user, field, value)
 
         await db.commit()
+        forget_user(user.id)
         await db.refresh(user)
 
         logger.info(
@@ -170,6 +171,7 @@ async def deactivate_user(
         
         user.is_active = False
         await db.commit()
+        forget_user(user.id)
         
         logger.info(
             "User deactivated",
@@ -226,20 +228,24 @@ async def update_my_profile(
                 detail="No valid fields to update"
             )
         
+        # current_user may come from the auth cache, detached from this session
+        user = await db.get(User, current_user.id)
+
         # Update fields
         for field, value in update_data.items():
-            setattr(current_user, field, value)
+            setattr(user, field, value)
         
         await db.commit()
-        await db.refresh(current_user)
+        forget_user(user.id)
+        await db.refresh(user)
         
         logger.info(
             "User profile updated",
-            user_id=current_user.id,
+            user_id=user.id,
             updated_fields=list(update_data.keys()),
         )
         
-        return UserResponse.model_validate(current_user)
+        return UserResponse.model_validate(user)
 
     except HTTPException:
         raise
@@ -1,7 +1,7 @@
 from functools import lru_cache
 from typing import Optional, List
 import secrets
-from pydantic import Field, field_validator
+from pydantic import AliasChoices, Field, field_validator
 from pydantic_settings import BaseSettings
 
 
@@ -26,6 +26,10 @@ class Settings(BaseSettings):
     secret_key: str = Field(default_factory=lambda: secrets.token_urlsafe(32))
     algorithm: str = "HS256"
     access_token_expire_minutes: int = Field(480, gt=0)
+    auth_user_cache_seconds: int = Field(30, ge=0, alias="AUTH_USER_CACHE_SECONDS")
+    auth_cache_size: int = Field(10000, ge=0, alias="AUTH_CACHE_SIZE")
+    password_hash_workers: int = Field(2, ge=1, le=16, alias="PASSWORD_HASH_WORKERS")
+    password_hash_max_queued: int = Field(32, ge=1, alias="PASSWORD_HASH_MAX_QUEUED")
 
     # Currency (SGD base, Currency Freaks API)
     base_currency: str = Field("SGD", pattern=r'^[A-Z]{3}$')
@@ -35,8 +39,20 @@ class Settings(BaseSettings):
 
     # AWS (Textract, Bedrock, S3, Secrets Manager)
     aws_region: str = Field("ap-southeast-1", alias="AWS_REGION")
-    aws_s3_bucket_name: str = Field("pipeline-pulse-documents", alias="AWS_S3_BUCKET_NAME")
+    # S3_BUCKET_NAME is the name older deployments set
+    aws_s3_bucket_name: str = Field(
+        "pipeline-pulse-documents",
+        validation_alias=AliasChoices("AWS_S3_BUCKET_NAME", "S3_BUCKET_NAME")
+    )
     aws_s3_presigned_url_expiry: int = Field(3600, alias="AWS_S3_PRESIGNED_URL_EXPIRY_SECONDS")
+    aws_s3_presigned_url_cache_size: int = Field(5000, ge=0, alias="AWS_S3_PRESIGNED_URL_CACHE_SIZE")
+    aws_s3_presigned_url_cache_margin_seconds: int = Field(300, ge=0, alias="AWS_S3_PRESIGNED_URL_CACHE_MARGIN_SECONDS")
+    aws_s3_endpoint_url: Optional[str] = Field(None, alias="AWS_S3_ENDPOINT_URL")
+    aws_s3_max_concurrency: int = Field(16, ge=1, le=128, alias="AWS_S3_MAX_CONCURRENCY")
+    aws_s3_health_check_interval_seconds: int = Field(300, ge=10, alias="AWS_S3_HEALTH_CHECK_INTERVAL_SECONDS")
+    aws_s3_download_chunk_kb: int = Field(256, ge=16, le=8192, alias="AWS_S3_DOWNLOAD_CHUNK_KB")
+    aws_s3_multipart_part_size_mb: int = Field(8, ge=5, le=512, alias="AWS_S3_MULTIPART_PART_SIZE_MB")
+    aws_s3_multipart_concurrency: int = Field(4, ge=1, le=32, alias="AWS_S3_MULTIPART_CONCURRENCY")
     aws_textract_region: str = Field("ap-southeast-1", alias="AWS_TEXTRACT_REGION")
     aws_bedrock_region: str = Field("us-east-1", alias="AWS_BEDROCK_REGION")
     aws_bedrock_model_id: str = Field(
@@ -47,6 +63,60 @@ class Settings(BaseSettings):
     # Document AI pipeline
     docai_max_file_size_mb: int = Field(20, alias="DOCAI_MAX_FILE_SIZE_MB")
     docai_min_confidence_threshold: float = Field(0.80, alias="DOCAI_MIN_CONFIDENCE_THRESHOLD")
+    # Stage worker pools (per worker process) and the documents each stage claims ahead of them
+    docai_ocr_concurrency: int = Field(4, ge=1, le=64, alias="DOCAI_OCR_CONCURRENCY")
+    docai_extract_concurrency: int = Field(8, ge=1, le=64, alias="DOCAI_EXTRACT_CONCURRENCY")
+    docai_stage_queue_size: int = Field(4, ge=0, le=256, alias="DOCAI_STAGE_QUEUE_SIZE")
+    docai_max_extract_backlog: int = Field(50, ge=1, alias="DOCAI_MAX_EXTRACT_BACKLOG")
+    docai_poll_interval_seconds: float = Field(2.0, gt=0, alias="DOCAI_POLL_INTERVAL_SECONDS")
+    docai_claim_timeout_seconds: int = Field(120, ge=10, alias="DOCAI_CLAIM_TIMEOUT_SECONDS")
+    docai_max_attempts: int = Field(3, ge=1, le=20, alias="DOCAI_MAX_ATTEMPTS")
+    docai_ocr_pages_per_range: int = Field(10, ge=1, le=3000, alias="DOCAI_OCR_PAGES_PER_RANGE")
+    docai_textract_poll_seconds: float = Field(5.0, gt=0, alias="DOCAI_TEXTRACT_POLL_SECONDS")
+    docai_textract_max_poll_seconds: float = Field(30.0, gt=0, alias="DOCAI_TEXTRACT_MAX_POLL_SECONDS")
+    docai_textract_polls_per_second: float = Field(5.0, gt=0, alias="DOCAI_TEXTRACT_POLLS_PER_SECOND")
+    docai_textract_max_jobs: int = Field(100, ge=1, alias="DOCAI_TEXTRACT_MAX_JOBS")
+    docai_textract_timeout_seconds: int = Field(900, ge=30, alias="DOCAI_TEXTRACT_TIMEOUT_SECONDS")
+    # Stage engines; the stubs are local stand-ins for offline runs and benchmarks
+    docai_ocr_engine: str = Field("textract", pattern=r'^(textract|stub)$', alias="DOCAI_OCR_ENGINE")
+    # Stage 2: small documents share a prompt; model calls are paced to a tokens-per-minute budget
+    docai_extractor: str = Field("bedrock", pattern=r'^(bedrock|stub)$', alias="DOCAI_EXTRACTOR")
+    docai_extract_batch_size: int = Field(4, ge=1, le=16, alias="DOCAI_EXTRACT_BATCH_SIZE")
+    docai_extract_batch_wait_ms: int = Field(200, ge=0, le=5000, alias="DOCAI_EXTRACT_BATCH_WAIT_MS")
+    docai_extract_batch_max_chars: int = Field(8000, ge=0, alias="DOCAI_EXTRACT_BATCH_MAX_CHARS")
+    docai_bedrock_tokens_per_minute: int = Field(100_000, ge=1000, alias="DOCAI_BEDROCK_TOKENS_PER_MINUTE")
+    docai_bedrock_max_retries: int = Field(5, ge=0, le=20, alias="DOCAI_BEDROCK_MAX_RETRIES")
+    docai_bedrock_retry_base_seconds: float = Field(2.0, gt=0, alias="DOCAI_BEDROCK_RETRY_BASE_SECONDS")
+    docai_bedrock_retry_max_seconds: float = Field(60.0, gt=0, alias="DOCAI_BEDROCK_RETRY_MAX_SECONDS")
+    docai_stub_ocr_job_seconds: float = Field(2.0, ge=0, alias="DOCAI_STUB_OCR_JOB_SECONDS")
+    docai_stub_ocr_seconds_per_page: float = Field(0.3, ge=0, alias="DOCAI_STUB_OCR_SECONDS_PER_PAGE")
+    docai_stub_latency_seconds: float = Field(1.0, ge=0, alias="DOCAI_STUB_LATENCY_SECONDS")
+    docai_stub_seconds_per_1k_tokens: float = Field(0.5, ge=0, alias="DOCAI_STUB_SECONDS_PER_1K_TOKENS")
+    docai_worker_in_api: bool = Field(False, alias="DOCAI_WORKER_IN_API")
+
+    # Excel migration import wizard
+    import_max_file_size_mb: int = Field(50, alias="IMPORT_MAX_FILE_SIZE_MB")
+    import_chunk_size: int = Field(1000, ge=100, le=10000, alias="IMPORT_CHUNK_SIZE")
+    import_validation_workers: int = Field(2, ge=0, le=16, alias="IMPORT_VALIDATION_WORKERS")
+    import_spool_dir: str = Field("/tmp/pipeline-pulse/imports", alias="IMPORT_SPOOL_DIR")
+    import_job_stale_seconds: int = Field(300, ge=30, alias="IMPORT_JOB_STALE_SECONDS")
+    import_job_expiry_hours: int = Field(72, ge=1, alias="IMPORT_JOB_EXPIRY_HOURS")
+
+    # Background job queue (Postgres, app.services.jobs)
+    jobs_worker_concurrency: int = Field(4, ge=1, le=64, alias="JOBS_WORKER_CONCURRENCY")
+    jobs_poll_interval_seconds: float = Field(1.0, gt=0, alias="JOBS_POLL_INTERVAL_SECONDS")
+    jobs_visibility_timeout_seconds: int = Field(300, ge=10, alias="JOBS_VISIBILITY_TIMEOUT_SECONDS")
+    jobs_max_attempts: int = Field(5, ge=1, le=50, alias="JOBS_MAX_ATTEMPTS")
+    jobs_retry_base_seconds: float = Field(10.0, ge=0, alias="JOBS_RETRY_BASE_SECONDS")
+    jobs_retry_max_seconds: float = Field(3600.0, ge=0, alias="JOBS_RETRY_MAX_SECONDS")
+    jobs_worker_in_api: bool = Field(False, alias="JOBS_WORKER_IN_API")
+
+    # File storage: "s3", or "local" (filesystem under storage_local_root) for development and benchmarks
+    storage_backend: str = Field("s3", pattern=r'^(s3|local)$', alias="STORAGE_BACKEND")
+    storage_local_root: str = Field("/tmp/pipeline-pulse/storage", alias="STORAGE_LOCAL_ROOT")
+
+    # Pipeline export
+    export_batch_rows: int = Field(1000, ge=100, le=10000, alias="EXPORT_BATCH_ROWS")
 
     # Monitoring
     sentry_dsn: Optional[str] = Field(None, alias="SENTRY_DSN")
@@ -1,9 +1,13 @@
-from typing import Optional
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import inspect, select
+from .config import settings
 from .database import get_db  # single canonical get_db — re-exported for importers
+from .metrics import cache_metric
 from .security import verify_token
 from ..models.user import User, UserRole
 import structlog
@@ -31,6 +35,77 @@ _SYNC_MANAGER_ROLES = {
     UserRole.aws_alliance_manager,
 }
 
+# Roles that can bulk-import the deal tracker
+_IMPORT_ROLES = {
+    UserRole.admin,
+    UserRole.cro,
+    UserRole.sales_manager,
+}
+
+
+# ---------------------------------------------------------------------------
+# Per-process caches for the auth hot path
+# ---------------------------------------------------------------------------
+
+# Decoded claims by token: (claims, expires at). A token's claims never
+# change, so they are reused until the token itself expires.
+_token_claims: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+
+# Column values of active users by id: (values, cached until). Every hit
+# builds a fresh, session-less User, so a request that modifies the one it
+# was handed neither changes the cache nor needs the row loaded. Updates made
+# through the users endpoints drop the entry at once; other workers see them
+# within auth_user_cache_seconds.
+_users: "OrderedDict[int, Tuple[Dict[str, Any], float]]" = OrderedDict()
+_USER_COLUMNS = [attribute.key for attribute in inspect(User).column_attrs]
+
+_token_metric = cache_metric("auth_token_claims")
+_user_metric = cache_metric("auth_users")
+
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    entry = _token_claims.get(token)
+    if entry is not None and entry[1] > time.time():
+        _token_metric.hit()
+        _token_claims.move_to_end(token)
+        return entry[0]
+    _token_metric.miss()
+    payload = verify_token(token)
+    exp = payload.get("exp")
+    if settings.auth_cache_size and isinstance(exp, (int, float)):
+        _token_claims[token] = (payload, exp)
+        _token_claims.move_to_end(token)
+        while len(_token_claims) > settings.auth_cache_size:
+            _token_claims.popitem(last=False)
+    return payload
+
+
+def _cached_user(user_id: int) -> Optional[User]:
+    entry = _users.get(user_id)
+    if entry is None:
+        return None
+    values, cached_until = entry
+    if cached_until <= time.monotonic():
+        del _users[user_id]
+        return None
+    _users.move_to_end(user_id)
+    return User(**values)
+
+
+def _cache_user(user: User) -> None:
+    if not settings.auth_user_cache_seconds or not settings.auth_cache_size:
+        return
+    values = {key: getattr(user, key) for key in _USER_COLUMNS}
+    _users[user.id] = (values, time.monotonic() + settings.auth_user_cache_seconds)
+    _users.move_to_end(user.id)
+    while len(_users) > settings.auth_cache_size:
+        _users.popitem(last=False)
+
+
+def forget_user(user_id: int) -> None:
+    """Drop a user from this process's auth cache; call after changing the user's row."""
+    _users.pop(user_id, None)
+
 
 # ---------------------------------------------------------------------------
 # Token extraction
@@ -80,7 +155,7 @@ async def get_current_user(
     token = _extract_token(request, bearer)
 
     try:
-        payload = verify_token(token)
+        payload = _decode_token(token)
     except HTTPException:
         raise
     except Exception as exc:
@@ -99,8 +174,14 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    user: Optional[User] = _cached_user(int(user_id))
+    if user is not None:
+        _user_metric.hit()
+        return user
+    _user_metric.miss()
+
     result = await db.execute(select(User).where(User.id == int(user_id)))
-    user: Optional[User] = result.scalar_one_or_none()
+    user = result.scalar_one_or_none()
 
     if user is None:
         raise HTTPException(
@@ -114,7 +195,8 @@ async def get_current_user(
             detail="User account is disabled",
         )
 
-    logger.info("Authenticated", user_id=user.id, role=user.role)
+    _cache_user(user)
+    logger.debug("Authenticated", user_id=user.id, role=user.role)
     return user
 
 
@@ -156,3 +238,15 @@ async def get_current_sync_manager(
             detail="Not enough permissions for sync management",
         )
     return current_user
+
+
+async def get_current_import_user(
+    current_user: User = Depends(get_current_user),
+) -> User:
+    """Require a role that can bulk-import opportunities."""
+    if current_user.role not in _IMPORT_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions for data import",
+        )
+    return current_user
@@ -0,0 +1,146 @@
+"""
+In-process concurrency and cache metrics.
+
+Bounded resources (thread pools offloading blocking clients, and the like)
+record how much work is queued, in flight and how long it took; caches
+record their hit rate. Values are per worker process and reset on restart;
+they are exposed through the admin metrics endpoint and are cheap enough
+to update on every call.
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+
+class ConcurrencyMetric:
+    """Queued / in-flight / latency counters for one bounded resource. Thread-safe."""
+
+    def __init__(self, name: str, limit: Optional[int] = None):
+        self.name = name
+        self.limit = limit
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.busy_seconds = 0.0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    def submitted(self) -> float:
+        """Record work waiting for a slot; returns the submit timestamp."""
+        with self._lock:
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        return time.perf_counter()
+
+    def cancelled(self) -> None:
+        """Record queued work that was dropped before it started."""
+        with self._lock:
+            self.queued -= 1
+
+    @contextmanager
+    def running(self, submitted_at: Optional[float] = None) -> Iterator[None]:
+        """Wrap the work itself (on whichever thread runs it)."""
+        started = time.perf_counter()
+        with self._lock:
+            if submitted_at is not None:
+                self.queued -= 1
+                wait = started - submitted_at
+                self.wait_seconds += wait
+                self.max_wait_seconds = max(self.max_wait_seconds, wait)
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        failed = False
+        try:
+            yield
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self.in_flight -= 1
+                self.busy_seconds += elapsed
+                if failed:
+                    self.failed += 1
+                else:
+                    self.completed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "limit": self.limit,
+                "queued": self.queued,
+                "in_flight": self.in_flight,
+                "peak_queued": self.peak_queued,
+                "peak_in_flight": self.peak_in_flight,
+                "completed": self.completed,
+                "failed": self.failed,
+                "avg_seconds": round(self.busy_seconds / finished, 4) if finished else None,
+                "avg_wait_seconds": round(self.wait_seconds / finished, 4) if finished else None,
+                "max_wait_seconds": round(self.max_wait_seconds, 4),
+            }
+
+
+class CacheMetric:
+    """Hit / miss counters for one cache. Thread-safe."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def hit(self) -> None:
+        with self._lock:
+            self.hits += 1
+
+    def miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+_metrics: Dict[str, Any] = {}
+_metrics_lock = threading.Lock()
+
+
+def concurrency_metric(name: str, limit: Optional[int] = None) -> ConcurrencyMetric:
+    """Get (or register) the metric for a named resource."""
+    with _metrics_lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = ConcurrencyMetric(name, limit)
+        elif limit is not None:
+            metric.limit = limit
+        return metric
+
+
+def cache_metric(name: str) -> CacheMetric:
+    """Get (or register) the hit-rate metric for a named cache."""
+    with _metrics_lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = CacheMetric(name)
+        return metric
+
+
+def metrics_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Current values of every registered metric."""
+    with _metrics_lock:
+        metrics = list(_metrics.values())
+    return {metric.name: metric.snapshot() for metric in metrics}
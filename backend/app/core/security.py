@@ -1,9 +1,66 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 import bcrypt
 from jose import JWTError, jwt
 from fastapi import HTTPException, status
 from .config import settings
+from .metrics import concurrency_metric
+
+T = TypeVar("T")
+
+# bcrypt takes 100-300ms of CPU per call (and releases the GIL while it
+# runs), so request handlers hash on this small pool instead of the event
+# loop. Calls waiting beyond password_hash_max_queued are refused with a 503:
+# a login burst then queues a few seconds at most instead of piling up.
+_hash_executor: Optional[ThreadPoolExecutor] = None
+_hash_executor_lock = threading.Lock()
+
+
+def _get_hash_executor() -> ThreadPoolExecutor:
+    global _hash_executor
+    with _hash_executor_lock:
+        if _hash_executor is None:
+            _hash_executor = ThreadPoolExecutor(
+                max_workers=settings.password_hash_workers,
+                thread_name_prefix="password-hash",
+            )
+        return _hash_executor
+
+
+def shutdown_password_hash_executor() -> None:
+    global _hash_executor
+    with _hash_executor_lock:
+        executor, _hash_executor = _hash_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def _run_hash(func: Callable[..., T], *args) -> T:
+    """Run a bcrypt call on the password pool, tracking queue depth and latency."""
+    metric = concurrency_metric("password_hash", limit=settings.password_hash_workers)
+    if metric.queued >= settings.password_hash_max_queued:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in requests, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+    submitted_at = metric.submitted()
+
+    def work() -> T:
+        with metric.running(submitted_at):
+            return func(*args)
+
+    future = _get_hash_executor().submit(work)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # Cancelled while still queued: it will never start, so stop counting it
+        if future.cancelled():
+            metric.cancelled()
+        raise
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -16,6 +73,16 @@ def get_password_hash(password: str) -> str:
     return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
 
 
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """``verify_password`` on the password pool, for request handlers."""
+    return await _run_hash(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """``get_password_hash`` on the password pool, for request handlers."""
+    return await _run_hash(get_password_hash, password)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create an access token."""
     to_encode = data.copy()
@@ -132,7 +132,8 @@ async def http_exception_handler(request: Request, exc: StarletteHTTPException):
             "error": exc.detail,
             "status_code": exc.status_code,
             "request_id": request.headers.get("X-Request-ID"),
-        }
+        },
+        headers=getattr(exc, "headers", None),
     )
 
 
@@ -200,10 +201,22 @@ async def startup_event():
             max_overflow=settings.database_max_overflow,
             echo=settings.debug,
         )
+        from .services.import_wizard import resume_interrupted_import_jobs
+        from .services.s3_service import start_s3_health_probe
+        await resume_interrupted_import_jobs()
+        if settings.storage_backend == "s3":
+            start_s3_health_probe()
+        if settings.docai_worker_in_api:
+            from .services.docai import start_docai_pipeline
+            start_docai_pipeline()
+        if settings.jobs_worker_in_api:
+            from .services.jobs import start_job_worker
+            start_job_worker()
         logger.info(
             "Application started",
             app_name=settings.app_name,
             environment=settings.app_env,
+            storage_backend=settings.storage_backend,
             debug=settings.debug,
         )
     except Exception as e:
@@ -215,6 +228,19 @@ async def startup_event():
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
+    from .core.security import shutdown_password_hash_executor
+    from .services.import_wizard.pool import shutdown_validation_pool
+    from .services.docai import stop_docai_pipeline
+    from .services.docai.aws import shutdown_docai_executor
+    from .services.jobs import stop_job_worker
+    from .services.s3_service import shutdown_s3_executor, stop_s3_health_probe
+    await stop_job_worker()
+    await stop_docai_pipeline()
+    await stop_s3_health_probe()
+    shutdown_validation_pool()
+    shutdown_s3_executor()
+    shutdown_docai_executor()
+    shutdown_password_hash_executor()
     logger.info("Application shutting down")
 
 
@@ -6,15 +6,24 @@ from .lead import Lead
 from .opportunity_snapshot import OpportunitySnapshot
 from .stage_event import StageEvent
 from .document import Document
+from .document_blob import DocumentBlob
+from .document_ocr_range import DocumentOcrRange
+from .docai_result_cache import DocAIResultCache
 from .revenue_milestone import RevenueMilestone
 from .tco_session import TcoSession
 from .ai_q_response import AiQResponse
 from .notification import Notification
 from .currency_rate import CurrencyRate
+from .pipeline_counter import PipelineCounter
+from .opportunity_risk import OpportunityRisk
+from .import_staging_row import ImportStagingRow
+from .import_job import ImportJob
+from .background_job import BackgroundJob
 
 __all__ = [
     "User", "Account", "Territory", "Opportunity", "Lead",
-    "OpportunitySnapshot", "StageEvent", "Document",
+    "OpportunitySnapshot", "StageEvent", "Document", "DocumentBlob", "DocumentOcrRange", "DocAIResultCache",
     "RevenueMilestone", "TcoSession", "AiQResponse",
-    "Notification", "CurrencyRate",
+    "Notification", "CurrencyRate", "PipelineCounter",
+    "OpportunityRisk", "ImportStagingRow", "ImportJob", "BackgroundJob",
 ]
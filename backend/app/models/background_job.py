@@ -0,0 +1,62 @@
+import enum
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Enum, Index, JSON, Text, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class JobStatus(str, enum.Enum):
+    queued = "queued"         # waiting for run_after (new, or backing off after a failure)
+    running = "running"       # claimed by a worker until locked_until
+    succeeded = "succeeded"
+    failed = "failed"         # out of attempts, or a permanent error
+
+
+class BackgroundJob(Base):
+    """A unit of deferred work in the Postgres job queue (``app.services.jobs``).
+
+    Workers claim ready jobs with ``FOR UPDATE SKIP LOCKED``, highest
+    ``priority`` first. A claim is only good until ``locked_until`` (the
+    visibility timeout, extended while the worker is alive); after that any
+    worker may run the job again, so handlers must be idempotent.
+    """
+    __tablename__ = "background_jobs"
+
+    id = Column(BigInteger, primary_key=True)
+    task = Column(String(100), nullable=False, index=True)
+    payload = Column(JSON, nullable=False, default=dict)
+    priority = Column(Integer, nullable=False, default=0)        # higher runs first
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.queued)
+    # At most one queued or running job per key, e.g. a periodic task enqueued by cron
+    dedupe_key = Column(String(200), nullable=True)
+
+    # Scheduling / claim
+    run_after = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False)
+    locked_by = Column(String(100), nullable=True)
+    locked_until = Column(DateTime(timezone=True), nullable=True)
+
+    result = Column(JSON, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)   # latest attempt
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<BackgroundJob id={self.id} task={self.task} status={self.status} attempts={self.attempts}>"
+
+
+LIVE_STATUSES = "status IN ('queued', 'running')"
+
+# Workers take the next live job in priority order
+Index(
+    "ix_background_jobs_ready",
+    BackgroundJob.priority.desc(), BackgroundJob.run_after, BackgroundJob.id,
+    postgresql_where=text(LIVE_STATUSES),
+)
+Index(
+    "ix_background_jobs_dedupe_key",
+    BackgroundJob.dedupe_key,
+    unique=True,
+    postgresql_where=text(f"dedupe_key IS NOT NULL AND {LIVE_STATUSES}"),
+)
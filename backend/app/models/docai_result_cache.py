@@ -0,0 +1,32 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Text, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DocAIResultCache(Base):
+    """A stored OCR or extraction result, reused for any document with the same content.
+
+    Keyed by the content hash, the pipeline stage and the ``version`` of
+    whatever produced it (OCR engine; model id + prompt version for
+    extraction), so changing the model or the prompt starts a fresh cache.
+    Entries go with their blob when it is purged.
+    """
+    __tablename__ = "docai_result_cache"
+
+    content_sha256 = Column(
+        String(64), ForeignKey("document_blobs.sha256", ondelete="CASCADE"), primary_key=True
+    )
+    stage = Column(String(20), primary_key=True)      # "ocr" | "extract"
+    version = Column(String(255), primary_key=True)
+
+    ocr_text = Column(Text, nullable=True)
+    page_count = Column(Integer, nullable=True)
+    extracted_fields = Column(JSON, nullable=True)
+    confidence_score = Column(Float, nullable=True)
+
+    hits = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_hit_at = Column(DateTime(timezone=True), nullable=True)
+
+    def __repr__(self) -> str:
+        return f"<DocAIResultCache sha256={self.content_sha256[:12]} stage={self.stage} version={self.version}>"
@@ -1,5 +1,6 @@
 import enum
-from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, Enum, ForeignKey, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.core.database import Base
@@ -21,6 +22,11 @@ class ExtractionStatus(str, enum.Enum):
     review = "review"                  # Stage 3: Human review
     accepted = "accepted"              # Stage 4: Saved to deal
     rejected = "rejected"
+    failed = "failed"                  # gave up after docai_max_attempts
+
+
+# Literal (not a bound parameter) so the planner can match the partial review index
+IN_REVIEW = "extraction_status = 'review'"
 
 
 class Document(Base):
@@ -30,16 +36,25 @@ class Document(Base):
     opportunity_id = Column(Integer, ForeignKey("opportunities.id", ondelete="CASCADE"), nullable=False, index=True)
     document_type = Column(Enum(DocumentType), nullable=False, default=DocumentType.other)
     original_filename = Column(String(255), nullable=False)
-    s3_key = Column(String(512), nullable=False, unique=True)
+    s3_key = Column(String(512), nullable=False, index=True)   # shared by duplicates of a blob
+    content_sha256 = Column(String(64), ForeignKey("document_blobs.sha256"), nullable=True, index=True)
     file_size_bytes = Column(Integer, nullable=True)
     mime_type = Column(String(100), nullable=True)
 
     # AI pipeline state
     extraction_status = Column(Enum(ExtractionStatus), nullable=False, default=ExtractionStatus.pending, index=True)
     textract_job_id = Column(String(255), nullable=True)
-    extracted_fields = Column(JSON, nullable=True)    # field_name → {value, confidence}
+    ocr_text = Column(Text, nullable=True)            # Stage 1 output, Stage 2 input
+    page_count = Column(Integer, nullable=True)       # PDFs, once the OCR stage has opened them
+    extracted_fields = Column(JSONB, nullable=True)   # field_name → {value, confidence}
     confidence_score = Column(Float, nullable=True)   # overall confidence 0.0–1.0
 
+    # Pipeline claim: the worker running (or holding queued) this document's current stage
+    claimed_by = Column(String(100), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)   # at the current stage
+    error_message = Column(Text, nullable=True)
+
     # Audit
     uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=True)
     uploaded_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -48,5 +63,27 @@ class Document(Base):
     # Relationships
     opportunity = relationship("Opportunity", back_populates="documents")
 
+    __table_args__ = (
+        # Stage workers claim the oldest documents waiting in a pipeline status
+        Index(
+            "ix_documents_pipeline_queue",
+            "extraction_status", "uploaded_at", "id",
+            postgresql_where=text("extraction_status IN ('pending', 'ocr_running', 'extracting')"),
+        ),
+        # Field lookups by containment, e.g. {"po_id": {"value": "PO-123"}}
+        Index(
+            "ix_documents_extracted_fields",
+            "extracted_fields",
+            postgresql_using="gin",
+            postgresql_ops={"extracted_fields": "jsonb_path_ops"},
+        ),
+        # Review queue by weakest field (docai_min_field_confidence is defined in the migration)
+        Index(
+            "ix_documents_review_min_confidence",
+            text("docai_min_field_confidence(extracted_fields)"),
+            postgresql_where=text(IN_REVIEW),
+        ),
+    )
+
     def __repr__(self) -> str:
         return f"<Document id={self.id} type={self.document_type} status={self.extraction_status}>"
@@ -0,0 +1,29 @@
+from sqlalchemy import BigInteger, Column, Integer, String, DateTime, Index, text
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class DocumentBlob(Base):
+    """One stored file, shared by every document with the same content.
+
+    Keyed by the SHA-256 of the bytes; the object lives at a content-addressed
+    S3 key, so re-uploading a PO or SOW that is already stored only adds a
+    ``documents`` row. ``ref_count`` is maintained by the ``documents`` trigger
+    installed in migration ``a6c2e9d4f170`` — application code only reads it.
+    Blobs at zero references are purged together with their S3 object.
+    """
+    __tablename__ = "document_blobs"
+
+    sha256 = Column(String(64), primary_key=True)
+    s3_key = Column(String(512), nullable=False)
+    size_bytes = Column(BigInteger, nullable=False)
+    mime_type = Column(String(100), nullable=True)
+    ref_count = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_document_blobs_unreferenced", "sha256", postgresql_where=text("ref_count = 0")),
+    )
+
+    def __repr__(self) -> str:
+        return f"<DocumentBlob sha256={self.sha256[:12]} refs={self.ref_count}>"
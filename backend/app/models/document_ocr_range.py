@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, UniqueConstraint
+from app.core.database import Base
+
+
+class DocumentOcrRange(Base):
+    """A page range of a large document, OCR'd on its own.
+
+    Multi-page PDFs are split into ranges (``docai_ocr_pages_per_range``)
+    that run in parallel; each range's text is kept here as soon as it is
+    done, so progress survives a worker restart and shows while the rest of
+    the document is still running. The rows are removed once the ranges are
+    merged into ``documents.ocr_text``.
+    """
+    __tablename__ = "document_ocr_ranges"
+
+    id = Column(Integer, primary_key=True)
+    document_id = Column(Integer, ForeignKey("documents.id", ondelete="CASCADE"), nullable=False)
+    first_page = Column(Integer, nullable=False)     # 1-based, inclusive
+    last_page = Column(Integer, nullable=False)
+    s3_key = Column(String(512), nullable=False)     # stored PDF of just these pages
+    job_id = Column(String(255), nullable=True)      # Textract job, when the engine ran one
+    text = Column(Text, nullable=True)               # set once the range is done
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("document_id", "first_page", name="uq_document_ocr_ranges_document_page"),
+    )
+
+    @property
+    def page_count(self) -> int:
+        return self.last_page - self.first_page + 1
+
+    def __repr__(self) -> str:
+        return f"<DocumentOcrRange document_id={self.document_id} pages={self.first_page}-{self.last_page}>"
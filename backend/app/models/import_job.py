@@ -0,0 +1,60 @@
+import enum
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Enum, ForeignKey, Text, JSON
+from sqlalchemy.sql import func
+from app.core.database import Base
+
+
+class ImportJobStatus(str, enum.Enum):
+    queued = "queued"
+    staging = "staging"       # reading / validating / COPYing chunks
+    merging = "merging"       # all rows staged, set-based merge running
+    previewed = "previewed"   # dry run finished; staged rows kept until committed
+    completed = "completed"
+    failed = "failed"
+    discarded = "discarded"   # previewed or failed job dropped; staged rows and upload removed
+
+
+class ImportJob(Base):
+    """A durable spreadsheet import.
+
+    The upload is spooled to disk and processed in the background. Every
+    staged chunk commits together with ``last_row_number``, so a failed or
+    interrupted job resumes after its last committed chunk. The job id
+    doubles as the ``batch_id`` of its rows in ``import_staging_rows``.
+    A ``dry_run`` job stops after computing its diff ``preview``; committing
+    it merges the already staged rows. Previewed and failed jobs that are
+    discarded (or expire) release their staged rows and spooled upload.
+    """
+    __tablename__ = "import_jobs"
+
+    id = Column(String(36), primary_key=True)
+    status = Column(Enum(ImportJobStatus), nullable=False, default=ImportJobStatus.queued, index=True)
+    filename = Column(String(255), nullable=False)
+    file_path = Column(String(500), nullable=False)      # spooled upload
+    created_by_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    dry_run = Column(Boolean, nullable=False, default=False)
+
+    # Progress / checkpoint
+    total_rows = Column(Integer, nullable=True)          # from the sheet dimension; None for CSV
+    rows_processed = Column(Integer, nullable=False, default=0)
+    rows_staged = Column(Integer, nullable=False, default=0)
+    error_count = Column(Integer, nullable=False, default=0)
+    last_row_number = Column(Integer, nullable=False, default=0)   # last source row in a committed chunk
+    chunks_committed = Column(Integer, nullable=False, default=0)
+    error_report = Column(JSON, nullable=True)           # ErrorReport state at the last checkpoint
+    result = Column(JSON, nullable=True)                 # merge counts once completed
+    preview = Column(JSON, nullable=True)                # dry-run diff
+    error_message = Column(Text, nullable=True)
+    staged_at = Column(DateTime(timezone=True), nullable=True)   # set once every chunk is staged
+
+    # Run bookkeeping
+    attempts = Column(Integer, nullable=False, default=0)
+    attempt_started_at = Column(DateTime(timezone=True), nullable=True)
+    attempt_start_rows = Column(Integer, nullable=False, default=0)  # rows_processed when the attempt began
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<ImportJob id={self.id} status={self.status} rows={self.rows_processed}>"
@@ -0,0 +1,54 @@
+from sqlalchemy import Column, BigInteger, Integer, String, Float, Date, Boolean, Text, Index
+from app.core.database import Base
+
+
+class ImportStagingRow(Base):
+    """Validated spreadsheet rows awaiting the set-based merge into accounts / opportunities.
+
+    Bulk-loaded with COPY, one ``batch_id`` per import. UNLOGGED — rows are
+    scratch data that can always be re-staged from the source file. Enum-backed
+    columns hold the enum *names* as text and are cast during the merge.
+    """
+    __tablename__ = "import_staging_rows"
+
+    id = Column(BigInteger, primary_key=True)
+    batch_id = Column(String(36), nullable=False)
+    row_number = Column(Integer, nullable=False)   # 1-based row in the source sheet
+
+    # Parsed business fields
+    account_name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False)
+    stage = Column(String(20), nullable=False)
+    deal_value = Column(Float, nullable=False)
+    currency_code = Column(String(3), nullable=False)
+    funding_type = Column(String(20), nullable=False)
+    program = Column(String(20), nullable=False)
+    expected_close_date = Column(Date, nullable=True)
+    ace_id = Column(String(100), nullable=True)
+    po_id = Column(String(100), nullable=True)
+    map_status = Column(String(50), nullable=True)
+    owner_ref = Column(String(255), nullable=True)       # owner email or full name
+    territory_name = Column(String(100), nullable=True)
+    notes = Column(Text, nullable=True)
+    next_action = Column(Text, nullable=True)
+    is_active = Column(Boolean, nullable=False, default=True)
+
+    # Resolved during the merge
+    account_id = Column(Integer, nullable=True)
+    account_decision = Column(String(10), nullable=True)   # match / new / ambiguous
+    account_score = Column(Float, nullable=True)
+    owner_id = Column(Integer, nullable=True)
+    territory_id = Column(Integer, nullable=True)
+    deal_value_sgd = Column(Float, nullable=True)
+    opportunity_id = Column(Integer, nullable=True)
+    merge_action = Column(String(20), nullable=True)    # insert / update / duplicate / error
+    error = Column(String(100), nullable=True)
+    error_detail = Column(String(255), nullable=True)
+
+    __table_args__ = (
+        Index("ix_import_staging_rows_batch", "batch_id", "row_number"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+    def __repr__(self) -> str:
+        return f"<ImportStagingRow batch={self.batch_id} row={self.row_number} name={self.name!r}>"
@@ -95,6 +95,9 @@ class Opportunity(Base):
     territory_id = Column(Integer, ForeignKey("territories.id"), nullable=True)
     solution_area = Column(Enum(SolutionArea), nullable=True)
 
+    # Deal health (RAG) — feeds the attention-required risk score
+    health_status = Column(Enum(HealthStatus), nullable=False, default=HealthStatus.unknown, index=True)
+
     # AWS APN / ACE fields
     ace_id = Column(String(100), nullable=True, index=True)   # ACE opportunity ID
     map_status = Column(String(50), nullable=True)            # MAP approval status
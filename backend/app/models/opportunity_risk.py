@@ -0,0 +1,40 @@
+import enum
+from sqlalchemy import Column, Integer, Boolean, DateTime, Enum, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+from .opportunity import HealthStatus
+
+
+class RiskSeverity(str, enum.Enum):
+    critical = "critical"
+    warning = "warning"
+
+
+class OpportunityRisk(Base):
+    """Precomputed attention-required ranking — one row per open deal at risk.
+
+    Maintained by the ``opportunities`` statement triggers and the
+    ``opportunity_risk_refresh_all()`` job (migration ``8b2d4e6f1a90``); deals
+    scoring below the warning threshold have no row. Application code only reads
+    this table.
+    """
+    __tablename__ = "opportunity_risk"
+
+    opportunity_id = Column(Integer, ForeignKey("opportunities.id", ondelete="CASCADE"), primary_key=True)
+    risk_score = Column(Integer, nullable=False)
+    severity = Column(Enum(RiskSeverity), nullable=False, index=True)
+
+    # Score components, kept for the "why" shown next to each deal
+    days_in_stage = Column(Integer, nullable=False, default=0)
+    overdue_days = Column(Integer, nullable=False, default=0)
+    missing_ace_fields = Column(Boolean, nullable=False, default=False)
+    health_status = Column(Enum(HealthStatus), nullable=False)
+    scored_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # Top-K read is an index scan in rank order
+        Index("ix_opportunity_risk_rank", risk_score.desc(), "opportunity_id"),
+    )
+
+    def __repr__(self) -> str:
+        return f"<OpportunityRisk opp_id={self.opportunity_id} score={self.risk_score} severity={self.severity}>"
@@ -0,0 +1,39 @@
+from sqlalchemy import Column, Integer, Numeric, DateTime, Enum, Index
+from sqlalchemy.sql import func
+from app.core.database import Base
+from .opportunity import DealStage, FundingType
+
+
+class PipelineCounter(Base):
+    """Pre-aggregated pipeline totals per stage × territory × owner × funding type.
+
+    Rows are maintained by the ``opportunities`` statement triggers installed in
+    migration ``3f9a1c2e7b44`` — application code only reads this table (and the
+    reconciliation job rebuilds it). Only active opportunities are counted.
+    """
+    __tablename__ = "pipeline_counters"
+
+    id = Column(Integer, primary_key=True)
+    stage = Column(Enum(DealStage), nullable=False)
+    territory_id = Column(Integer, nullable=True)
+    owner_id = Column(Integer, nullable=False, index=True)
+    funding_type = Column(Enum(FundingType), nullable=False)
+    deal_count = Column(Integer, nullable=False, default=0)
+    value_sgd = Column(Numeric(18, 2), nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        # NULLS NOT DISTINCT so deals without a territory share one group row (PG 15+)
+        Index(
+            "uq_pipeline_counters_group",
+            "stage", "territory_id", "owner_id", "funding_type",
+            unique=True,
+            postgresql_nulls_not_distinct=True,
+        ),
+    )
+
+    def __repr__(self) -> str:
+        return (
+            f"<PipelineCounter stage={self.stage} territory_id={self.territory_id} "
+            f"owner_id={self.owner_id} funding={self.funding_type} count={self.deal_count}>"
+        )
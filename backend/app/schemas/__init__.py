@@ -29,6 +29,30 @@ from .dashboard import (
     O2RPhaseChartResponseSchema,
     HealthChartResponseSchema,
     DashboardDataResponseSchema,
+    PipelineStageTotalSchema,
+    PipelineSummarySchema,
+    PipelineCounterDriftSchema,
+    PipelineCounterReconcileSchema,
+)
+from .import_schemas import (
+    ImportRowErrorSchema,
+    ImportErrorSummarySchema,
+    ImportResultSchema,
+    ImportRowDiffSchema,
+    ImportPreviewSchema,
+    ImportJobSchema,
+)
+from .export_schemas import (
+    ExportSortSchema,
+    ExportRequestSchema,
+    ExportColumnSchema,
+    ExportUploadSchema,
+)
+from .document_schemas import (
+    DocumentSchema,
+    DocumentDetailSchema,
+    DocumentReviewSchema,
+    DocumentUploadSchema,
 )
 
 __all__ = [
@@ -56,4 +80,22 @@ __all__ = [
     "O2RPhaseChartResponseSchema",
     "HealthChartResponseSchema",
     "DashboardDataResponseSchema",
+    "PipelineStageTotalSchema",
+    "PipelineSummarySchema",
+    "PipelineCounterDriftSchema",
+    "PipelineCounterReconcileSchema",
+    "ImportRowErrorSchema",
+    "ImportErrorSummarySchema",
+    "ImportResultSchema",
+    "ImportRowDiffSchema",
+    "ImportPreviewSchema",
+    "ImportJobSchema",
+    "ExportSortSchema",
+    "ExportRequestSchema",
+    "ExportColumnSchema",
+    "ExportUploadSchema",
+    "DocumentSchema",
+    "DocumentDetailSchema",
+    "DocumentReviewSchema",
+    "DocumentUploadSchema",
 ]
\ No newline at end of file
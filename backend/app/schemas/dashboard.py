@@ -2,7 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Optional, Union
 from datetime import datetime
 from decimal import Decimal
-from ..models.opportunity import HealthStatus, O2RPhase
+from ..models.opportunity import HealthStatus, O2RPhase, DealStage, FundingType
 
 
 class DashboardMetricsSchema(BaseModel):
@@ -80,15 +80,18 @@ class AttentionRequiredItemSchema(BaseModel):
     probability: int = Field(..., ge=0, le=100, description="Win probability percentage")
     phase: O2RPhase = Field(..., description="O2R phase")
     health_status: HealthStatus = Field(..., description="Health status")
-    territory_id: int = Field(..., description="Territory ID")
+    territory_id: Optional[int] = Field(None, description="Territory ID")
     account_id: int = Field(..., description="Account ID")
     proposal_date: Optional[datetime] = Field(None, description="Proposal milestone date")
     kickoff_date: Optional[datetime] = Field(None, description="Kickoff milestone date")
     completion_date: Optional[datetime] = Field(None, description="Completion milestone date")
     created_at: datetime = Field(..., description="Creation timestamp")
     updated_at: datetime = Field(..., description="Last update timestamp")
-    created_by: int = Field(..., description="User ID who created the opportunity")
-    updated_by: int = Field(..., description="User ID who last updated the opportunity")
+    created_by: Optional[int] = Field(None, description="User ID who created the opportunity")
+    updated_by: Optional[int] = Field(None, description="User ID who last updated the opportunity")
+    risk_score: Optional[int] = Field(None, description="Precomputed risk score (higher is riskier)")
+    severity: Optional[str] = Field(None, description="Risk severity: critical or warning")
+    risk_reasons: List[str] = Field(default_factory=list, description="Why the deal needs attention")
     
     class Config:
         from_attributes = True
@@ -150,4 +153,58 @@ class DashboardDataResponseSchema(BaseModel):
     attention_required: AttentionRequiredResponseSchema = Field(..., description="Deals requiring attention")
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+# Pipeline counters (incrementally maintained aggregates)
+class PipelineStageTotalSchema(BaseModel):
+    """Schema for per-stage totals read from pipeline counters."""
+    
+    stage: DealStage = Field(..., description="Deal stage")
+    deal_count: int = Field(..., description="Number of active deals in this stage")
+    value_sgd: Decimal = Field(..., description="Total value of active deals in this stage (SGD)")
+    
+    class Config:
+        from_attributes = True
+
+
+class PipelineSummarySchema(BaseModel):
+    """Schema for headline pipeline KPIs served from pipeline counters."""
+    
+    total_pipeline_value: Decimal = Field(..., description="Total value of open (pre order book) deals (SGD)")
+    deals_in_progress: int = Field(..., description="Number of open (pre order book) deals")
+    order_book_value: Decimal = Field(..., description="Total value of deals in the order book stage (SGD)")
+    order_book_deals: int = Field(..., description="Number of deals in the order book stage")
+    by_stage: List[PipelineStageTotalSchema] = Field(..., description="Totals per deal stage")
+    
+    class Config:
+        from_attributes = True
+
+
+class PipelineCounterDriftSchema(BaseModel):
+    """Schema for a counter group that disagrees with the opportunities table."""
+    
+    stage: DealStage = Field(..., description="Deal stage")
+    territory_id: Optional[int] = Field(None, description="Territory ID")
+    owner_id: int = Field(..., description="Owner user ID")
+    funding_type: FundingType = Field(..., description="Funding type")
+    counted_deals: int = Field(..., description="Deal count held in pipeline_counters")
+    actual_deals: int = Field(..., description="Deal count recomputed from opportunities")
+    counted_value_sgd: Decimal = Field(..., description="Value held in pipeline_counters (SGD)")
+    actual_value_sgd: Decimal = Field(..., description="Value recomputed from opportunities (SGD)")
+    
+    class Config:
+        from_attributes = True
+
+
+class PipelineCounterReconcileSchema(BaseModel):
+    """Schema for the pipeline counter reconciliation job result."""
+    
+    groups_checked: int = Field(..., description="Number of counter groups compared")
+    drifted_groups: int = Field(..., description="Number of groups whose counters had drifted")
+    drift: List[PipelineCounterDriftSchema] = Field(..., description="Drifted groups (before repair)")
+    repaired: bool = Field(..., description="Whether the counters were rebuilt")
+    checked_at: datetime = Field(..., description="Reconciliation timestamp")
+    
+    class Config:
+        from_attributes = True
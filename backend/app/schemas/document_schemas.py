@@ -0,0 +1,57 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from ..models.document import DocumentType, ExtractionStatus
+
+
+class DocumentSchema(BaseModel):
+    """Schema for a deal document."""
+
+    id: int = Field(..., description="Document ID")
+    opportunity_id: int = Field(..., description="Opportunity the document belongs to")
+    document_type: DocumentType = Field(..., description="Document type (SOW, PO, handover, ...)")
+    original_filename: str = Field(..., description="Uploaded file name")
+    file_size_bytes: Optional[int] = Field(None, description="File size")
+    mime_type: Optional[str] = Field(None, description="MIME type")
+    content_sha256: Optional[str] = Field(None, description="SHA-256 of the file content")
+    extraction_status: ExtractionStatus = Field(..., description="Document AI pipeline status")
+    page_count: Optional[int] = Field(None, description="Pages (PDFs, once OCR has started)")
+    uploaded_at: datetime = Field(..., description="Upload time")
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentDetailSchema(DocumentSchema):
+    """Schema for a document with its Document AI progress."""
+
+    ocr_pages_done: Optional[int] = Field(None, description="Pages OCR'd so far (PDFs split into page ranges)")
+    confidence_score: Optional[float] = Field(None, description="Overall extraction confidence 0.0-1.0")
+    error_message: Optional[str] = Field(None, description="Last pipeline error")
+    extraction_completed_at: Optional[datetime] = Field(None, description="Extraction finish time")
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentReviewSchema(DocumentDetailSchema):
+    """Schema for a document with its extracted fields, for the review grid."""
+
+    extracted_fields: Optional[Dict[str, Dict[str, Any]]] = Field(
+        None, description="Extracted fields: field name → {value, confidence}"
+    )
+    low_confidence_fields: List[str] = Field(
+        default_factory=list, description="Fields with a value below the confidence threshold"
+    )
+
+    class Config:
+        from_attributes = True
+
+
+class DocumentUploadSchema(DocumentSchema):
+    """Schema for a newly uploaded document."""
+
+    deduplicated: bool = Field(False, description="Identical content was already stored, so no file was uploaded")
+
+    class Config:
+        from_attributes = True
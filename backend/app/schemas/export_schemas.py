@@ -0,0 +1,45 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Literal, Optional
+
+
+class ExportSortSchema(BaseModel):
+    """Schema for one entry of the grid sort model."""
+
+    colId: str = Field(..., description="Export column key")
+    sort: Literal["asc", "desc"] = Field(..., description="Sort direction")
+
+
+class ExportRequestSchema(BaseModel):
+    """Schema for a pipeline export request, mirroring the grid's current view."""
+
+    format: Literal["xlsx", "csv"] = Field("xlsx", description="File format")
+    columns: Optional[List[str]] = Field(None, description="Column keys in display order (default set when omitted)")
+    filter_model: Dict[str, Any] = Field(default_factory=dict, description="Grid filter model keyed by column")
+    sort_model: List[ExportSortSchema] = Field(default_factory=list, description="Grid sort model")
+    include_inactive: bool = Field(False, description="Include lost / inactive deals")
+
+
+class ExportColumnSchema(BaseModel):
+    """Schema for an exportable column."""
+
+    key: str = Field(..., description="Column key used in projections, filters and sorts")
+    header: str = Field(..., description="Column header in the exported file")
+    kind: str = Field(..., description="Value kind: text, number, date, datetime, boolean or enum")
+    default: bool = Field(..., description="Included when no projection is given")
+
+    class Config:
+        from_attributes = True
+
+
+class ExportUploadSchema(BaseModel):
+    """Schema for an export written to S3."""
+
+    filename: str = Field(..., description="Suggested file name")
+    s3_key: str = Field(..., description="S3 object key")
+    download_url: str = Field(..., description="Presigned download URL")
+    expires_in_seconds: int = Field(..., description="Seconds until the download URL expires")
+    rows: int = Field(..., description="Rows exported")
+    size_bytes: int = Field(..., description="File size")
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,109 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+from ..models.import_job import ImportJobStatus
+
+
+class ImportRowErrorSchema(BaseModel):
+    """Schema for a single rejected spreadsheet row."""
+
+    row_number: int = Field(..., description="1-based row number in the source sheet")
+    field: str = Field(..., description="Import field that failed validation")
+    code: str = Field(..., description="Error code (e.g. 'required', 'unknown_stage', 'missing_fx_rate')")
+    value: Optional[str] = Field(None, description="Offending cell value (truncated)")
+
+    class Config:
+        from_attributes = True
+
+
+class ImportErrorSummarySchema(BaseModel):
+    """Schema for rejected rows grouped by field and error code."""
+
+    field: str = Field(..., description="Import field that failed validation")
+    code: str = Field(..., description="Error code")
+    count: int = Field(..., description="Number of rows with this error")
+    sample_rows: List[int] = Field(..., description="First row numbers with this error")
+
+    class Config:
+        from_attributes = True
+
+
+class ImportResultSchema(BaseModel):
+    """Schema for the outcome of a spreadsheet import."""
+
+    batch_id: str = Field(..., description="Import batch identifier")
+    filename: str = Field(..., description="Uploaded file name")
+    rows_read: int = Field(..., description="Non-blank data rows read from the sheet")
+    rows_staged: int = Field(..., description="Rows that passed validation and were staged")
+    inserted: int = Field(..., description="Opportunities created")
+    updated: int = Field(..., description="Existing opportunities updated")
+    unchanged: int = Field(0, description="Matched rows skipped because nothing changed")
+    duplicates: int = Field(..., description="Rows skipped because a later row in the file has the same deal key")
+    accounts_matched: int = Field(..., description="Distinct account names matched to existing accounts")
+    accounts_created: int = Field(..., description="Accounts created for unknown account names")
+    accounts_ambiguous: int = Field(..., description="Distinct account names held back as ambiguous matches")
+    error_count: int = Field(..., description="Rows rejected by validation or merge")
+    error_summary: List[ImportErrorSummarySchema] = Field(default_factory=list, description="Rejected rows grouped by error, most frequent first")
+    errors: List[ImportRowErrorSchema] = Field(default_factory=list, description="First rejected rows")
+    errors_truncated: bool = Field(False, description="True when more errors occurred than are listed")
+    duration_seconds: float = Field(..., description="Wall-clock import time")
+
+    class Config:
+        from_attributes = True
+
+
+class ImportRowDiffSchema(BaseModel):
+    """Schema for the field-level changes a re-imported row would make."""
+
+    row_number: int = Field(..., description="1-based row number in the source sheet")
+    opportunity_id: int = Field(..., description="Matched opportunity")
+    name: str = Field(..., description="Current opportunity name")
+    changes: Dict[str, List[Any]] = Field(..., description="Changed fields as [current, incoming]")
+
+    class Config:
+        from_attributes = True
+
+
+class ImportPreviewSchema(BaseModel):
+    """Schema for a dry-run import: what committing the job would do."""
+
+    to_insert: int = Field(..., description="Opportunities that would be created")
+    to_update: int = Field(..., description="Existing opportunities that would change")
+    unchanged: int = Field(..., description="Matched rows identical to the existing opportunity")
+    duplicates: int = Field(..., description="Rows superseded by a later row with the same deal key")
+    accounts_matched: int = Field(..., description="Distinct account names matched to existing accounts")
+    accounts_created: int = Field(..., description="Accounts that would be created")
+    accounts_ambiguous: int = Field(..., description="Distinct account names held back as ambiguous matches")
+    error_count: int = Field(..., description="Rows rejected by validation or merge")
+    error_summary: List[ImportErrorSummarySchema] = Field(default_factory=list, description="Rejected rows grouped by error")
+    field_changes: Dict[str, int] = Field(default_factory=dict, description="Updated rows per changed field")
+    sample_changes: List[ImportRowDiffSchema] = Field(default_factory=list, description="First rows that would change")
+
+    class Config:
+        from_attributes = True
+
+
+class ImportJobSchema(BaseModel):
+    """Schema for import job progress, polled while the job runs."""
+
+    id: str = Field(..., description="Import job identifier")
+    status: ImportJobStatus = Field(..., description="Job status")
+    filename: str = Field(..., description="Uploaded file name")
+    dry_run: bool = Field(False, description="Preview only; nothing is written until the job is committed")
+    total_rows: Optional[int] = Field(None, description="Data rows in the sheet (unknown for CSV)")
+    rows_processed: int = Field(..., description="Rows read and validated in committed chunks")
+    rows_staged: int = Field(..., description="Rows that passed validation so far")
+    error_count: int = Field(..., description="Rows rejected so far")
+    chunks_committed: int = Field(..., description="Chunks checkpointed so far")
+    percent_complete: Optional[float] = Field(None, description="Progress percentage (None when total is unknown)")
+    eta_seconds: Optional[float] = Field(None, description="Estimated seconds until staging completes")
+    attempts: int = Field(..., description="Number of runs, including resumes")
+    error_summary: List[ImportErrorSummarySchema] = Field(default_factory=list, description="Rejected rows grouped by error")
+    error_message: Optional[str] = Field(None, description="Failure reason of the last attempt")
+    preview: Optional[ImportPreviewSchema] = Field(None, description="Dry-run diff once previewed")
+    result: Optional[ImportResultSchema] = Field(None, description="Import outcome once completed")
+    created_at: datetime = Field(..., description="When the job was queued")
+    finished_at: Optional[datetime] = Field(None, description="When the job completed")
+
+    class Config:
+        from_attributes = True
@@ -1,9 +1,15 @@
 from .opportunity_service import OpportunityService
 from .currency_service import CurrencyService
 from .s3_service import S3Service
+from .document_service import DocumentService
+from .pipeline_counter_service import PipelineCounterService
+from .risk_scoring_service import RiskScoringService
 
 __all__ = [
     "OpportunityService",
     "CurrencyService",
     "S3Service",
+    "DocumentService",
+    "PipelineCounterService",
+    "RiskScoringService",
 ]
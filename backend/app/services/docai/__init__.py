@@ -0,0 +1,26 @@
+from .engines import AsyncOcrEngine, ExtractionResult, FieldExtractor, OcrEngine, OcrResult, PageRange
+from .extraction import BatchingFieldExtractor, ExtractionModel, ModelReply, ModelThrottled
+from .pipeline import DocAIPipeline, default_extractor, default_ocr_engine, default_pipeline, start_docai_pipeline, stop_docai_pipeline
+from .stub import StubFieldExtractor, StubModel, StubOcrEngine
+
+__all__ = [
+    "AsyncOcrEngine",
+    "ExtractionResult",
+    "FieldExtractor",
+    "OcrEngine",
+    "OcrResult",
+    "PageRange",
+    "BatchingFieldExtractor",
+    "ExtractionModel",
+    "ModelReply",
+    "ModelThrottled",
+    "StubFieldExtractor",
+    "StubModel",
+    "StubOcrEngine",
+    "DocAIPipeline",
+    "default_extractor",
+    "default_ocr_engine",
+    "default_pipeline",
+    "start_docai_pipeline",
+    "stop_docai_pipeline",
+]
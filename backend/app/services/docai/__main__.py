@@ -0,0 +1,45 @@
+"""
+DocAI worker process
+
+    cd backend
+    python -m app.services.docai
+
+Runs the OCR and extraction stages against the configured database until
+SIGINT / SIGTERM; start as many processes as the Textract and Bedrock
+quotas allow — they share the work through row claims. With
+DOCAI_OCR_ENGINE=stub, DOCAI_EXTRACTOR=stub and STORAGE_BACKEND=local it
+runs without AWS.
+"""
+
+import asyncio
+import signal
+
+import structlog
+
+from ...core.config import settings
+from ...core.database import init_db
+from .aws import shutdown_docai_executor
+from .pipeline import default_pipeline
+
+logger = structlog.get_logger()
+
+
+async def main() -> None:
+    init_db(
+        database_url=settings.database_url,
+        pool_size=settings.docai_ocr_concurrency + settings.docai_extract_concurrency + 2,
+        max_overflow=settings.database_max_overflow,
+        echo=settings.debug,
+    )
+    pipeline = default_pipeline()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, pipeline.stop)
+    try:
+        await pipeline.run()
+    finally:
+        shutdown_docai_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,85 @@
+"""
+Textract and Bedrock clients for the pipeline
+
+boto3 is blocking, so calls run on a pool sized to the stage worker pools
+(one thread per concurrent stage call), never on the event loop, and show
+up as the ``docai_aws`` metric.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import boto3
+from botocore.config import Config
+
+from ...core.config import settings
+from ...core.metrics import concurrency_metric
+
+T = TypeVar('T')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_clients: Dict[str, Any] = {}
+_lock = threading.Lock()
+
+
+def _pool_size() -> int:
+    return settings.docai_ocr_concurrency + settings.docai_extract_concurrency
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=_pool_size(), thread_name_prefix='docai-aws')
+        return _executor
+
+
+def get_client(service_name: str, region: str, max_attempts: int = 3):
+    """Shared client per service (boto3 clients are thread-safe).
+
+    ``max_attempts=1`` leaves retries to the caller, e.g. one that paces
+    itself after throttling.
+    """
+    with _lock:
+        client = _clients.get(service_name)
+        if client is None:
+            client = _clients[service_name] = boto3.client(
+                service_name,
+                region_name=region,
+                config=Config(max_pool_connections=_pool_size(), retries={'max_attempts': max_attempts, 'mode': 'standard'})
+            )
+        return client
+
+
+async def run(func: Callable[..., T], *args, **kwargs) -> T:
+    """Run blocking client work on the pool."""
+    metric = concurrency_metric('docai_aws', limit=_pool_size())
+    submitted_at = metric.submitted()
+
+    def work() -> T:
+        with metric.running(submitted_at):
+            return func(*args, **kwargs)
+
+    future = _get_executor().submit(work)
+    try:
+        return await asyncio.wrap_future(future)
+    except asyncio.CancelledError:
+        # Cancelled while still queued: it will never start, so stop counting it
+        if future.cancelled():
+            metric.cancelled()
+        raise
+
+
+async def call(client, operation: str, **kwargs) -> Dict[str, Any]:
+    """Call a client operation on the pool."""
+    return await run(getattr(client, operation), **kwargs)
+
+
+def shutdown_docai_executor() -> None:
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
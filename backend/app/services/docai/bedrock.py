@@ -0,0 +1,64 @@
+"""
+Stage 2 on Amazon Bedrock (Anthropic messages API)
+
+Batching, the tokens-per-minute budget and throttling retries are the
+``BatchingFieldExtractor``'s; this module only makes the calls.
+"""
+
+import json
+from typing import Optional
+
+from botocore.exceptions import ClientError
+
+from ...core.config import settings
+from . import aws
+from .extraction import BatchingFieldExtractor, ExtractionModel, ModelReply, ModelThrottled
+
+# Error codes Bedrock returns when a call may succeed later
+RETRYABLE_ERRORS = {'ThrottlingException', 'ServiceUnavailableException', 'ModelNotReadyException'}
+
+
+class BedrockModel(ExtractionModel):
+    """The configured Bedrock model (aws_bedrock_model_id)."""
+
+    def __init__(self, model_id: Optional[str] = None):
+        self.model_id = model_id or settings.aws_bedrock_model_id
+        # botocore must not retry throttling on its own: the extractor backs off for every caller at once
+        self.client = aws.get_client('bedrock-runtime', settings.aws_bedrock_region, max_attempts=1)
+
+    def _invoke(self, body: str) -> dict:
+        # The response body streams over the same connection: read it on the pool thread too
+        response = self.client.invoke_model(
+            modelId=self.model_id,
+            body=body,
+            contentType='application/json',
+            accept='application/json',
+        )
+        return json.loads(response['body'].read())
+
+    async def invoke(self, prompt: str, max_tokens: int) -> ModelReply:
+        body = {
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": max_tokens,
+            "temperature": 0,
+            "messages": [{"role": "user", "content": prompt}],
+        }
+        try:
+            payload = await aws.run(self._invoke, json.dumps(body))
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in RETRYABLE_ERRORS:
+                raise ModelThrottled(str(e)) from e
+            raise
+        usage = payload.get("usage", {})
+        return ModelReply(
+            text="".join(part.get("text", "") for part in payload.get("content", [])),
+            input_tokens=usage.get("input_tokens"),
+            output_tokens=usage.get("output_tokens"),
+        )
+
+
+class BedrockFieldExtractor(BatchingFieldExtractor):
+    """Field extraction with the configured Bedrock model (aws_bedrock_model_id)."""
+
+    def __init__(self, model_id: Optional[str] = None):
+        super().__init__(BedrockModel(model_id))
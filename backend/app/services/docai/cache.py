@@ -0,0 +1,93 @@
+"""
+Result cache for the pipeline stages
+
+OCR text is cached per content hash and OCR engine; extracted fields per
+content hash, model id and prompt version (``FieldExtractor.cache_version``).
+A re-uploaded or re-run document therefore costs no Textract or Bedrock
+call at all. Engines without a cache version (local stand-ins) are never
+cached. Hit rates show up as the ``docai_ocr_cache`` and
+``docai_extract_cache`` metrics.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from sqlalchemy import func, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.metrics import cache_metric
+from ...models.docai_result_cache import DocAIResultCache
+from ...models.document import Document
+from .engines import ExtractionResult, FieldExtractor, OcrEngine, OcrResult
+
+OCR = "ocr"
+EXTRACT = "extract"
+
+_metrics = {OCR: cache_metric("docai_ocr_cache"), EXTRACT: cache_metric("docai_extract_cache")}
+
+
+async def _lookup(db: AsyncSession, sha256: Optional[str], stage: str, version: Optional[str]) -> Optional[Any]:
+    if sha256 is None or version is None:
+        return None
+    # Counting the hit is the lookup: one round trip either way
+    row = (await db.execute(
+        update(DocAIResultCache)
+        .where(
+            DocAIResultCache.content_sha256 == sha256,
+            DocAIResultCache.stage == stage,
+            DocAIResultCache.version == version,
+        )
+        .values(hits=DocAIResultCache.hits + 1, last_hit_at=datetime.now(timezone.utc))
+        .returning(
+            DocAIResultCache.ocr_text,
+            DocAIResultCache.page_count,
+            DocAIResultCache.extracted_fields,
+            DocAIResultCache.confidence_score,
+        )
+    )).one_or_none()
+    (_metrics[stage].hit if row is not None else _metrics[stage].miss)()
+    return row
+
+
+async def _store(db: AsyncSession, sha256: Optional[str], stage: str, version: Optional[str], **values: Any) -> None:
+    if sha256 is None or version is None:
+        return
+    await db.execute(
+        insert(DocAIResultCache)
+        .values(content_sha256=sha256, stage=stage, version=version, hits=0, **values)
+        .on_conflict_do_update(
+            index_elements=[DocAIResultCache.content_sha256, DocAIResultCache.stage, DocAIResultCache.version],
+            set_={**values, "created_at": func.now()},
+        )
+    )
+
+
+async def cached_ocr(db: AsyncSession, document: Document, engine: OcrEngine) -> Optional[OcrResult]:
+    row = await _lookup(db, document.content_sha256, OCR, engine.cache_version(document))
+    if row is None:
+        return None
+    return OcrResult(text=row.ocr_text, pages=row.page_count)
+
+
+async def remember_ocr(db: AsyncSession, document: Document, engine: OcrEngine, result: OcrResult) -> None:
+    await _store(
+        db, document.content_sha256, OCR, engine.cache_version(document),
+        ocr_text=result.text, page_count=result.pages,
+    )
+
+
+async def cached_extraction(db: AsyncSession, document: Document, extractor: FieldExtractor) -> Optional[ExtractionResult]:
+    row = await _lookup(db, document.content_sha256, EXTRACT, extractor.cache_version(document))
+    if row is None:
+        return None
+    return ExtractionResult(fields=row.extracted_fields, confidence=row.confidence_score)
+
+
+async def remember_extraction(
+    db: AsyncSession, document: Document, extractor: FieldExtractor, result: ExtractionResult
+) -> None:
+    await _store(
+        db, document.content_sha256, EXTRACT, extractor.cache_version(document),
+        extracted_fields=result.fields, confidence_score=result.confidence,
+    )
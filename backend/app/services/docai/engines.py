@@ -0,0 +1,88 @@
+"""
+Stage engines
+
+The pipeline drives documents through OCR (stage 1) and field extraction
+(stage 2); the services doing the work sit behind these two interfaces so
+AWS (Textract, Bedrock) and local stand-ins are interchangeable.
+
+OCR that runs as a remote job (Textract's asynchronous API) implements
+``AsyncOcrEngine``: the pipeline starts the job, frees the stage worker,
+and picks the document up again when the engine's shared poller sees the
+job finish.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from ...models.document import Document
+
+
+@dataclass
+class OcrResult:
+    text: str               # pages separated by form feeds
+    pages: int
+    job_id: Optional[str] = None   # Textract job, when the engine ran one
+
+
+@dataclass
+class PageRange:
+    """Part of a split document: its pages, stored as a PDF of their own."""
+    first_page: int         # 1-based, in the whole document
+    last_page: int
+    s3_key: str
+
+
+@dataclass
+class ExtractionResult:
+    fields: Dict[str, Dict[str, Any]] = field(default_factory=dict)   # field_name → {value, confidence}
+    confidence: float = 0.0
+
+
+class OcrEngine(ABC):
+    """Stage 1: raw text of a stored document, or of one page range of it."""
+
+    def cache_version(self, document: Document) -> Optional[str]:
+        """Results are cached per content hash under this version; None disables caching."""
+        return None
+
+    @abstractmethod
+    async def detect_text(self, document: Document, pages: Optional[PageRange] = None) -> OcrResult:
+        ...
+
+
+class FieldExtractor(ABC):
+    """Stage 2: CRM fields from a document's OCR text."""
+
+    def cache_version(self, document: Document) -> Optional[str]:
+        """Results are cached per content hash under this version (model and prompt); None disables caching."""
+        return None
+
+    @abstractmethod
+    async def extract(self, document: Document, text: str) -> ExtractionResult:
+        ...
+
+    async def close(self) -> None:
+        """Drop calls still waiting to be made (pipeline shutdown)."""
+
+
+class AsyncOcrEngine(OcrEngine):
+    """Stage 1 as a remote job: ``start_job``, then ``wait_job`` (shared polling, not a loop per document)."""
+
+    @abstractmethod
+    async def start_job(self, document: Document, pages: Optional[PageRange] = None) -> str:
+        ...
+
+    @abstractmethod
+    async def wait_job(self, job_id: str) -> OcrResult:
+        ...
+
+    @property
+    def jobs_in_flight(self) -> int:
+        return 0
+
+    async def detect_text(self, document: Document, pages: Optional[PageRange] = None) -> OcrResult:
+        return await self.wait_job(await self.start_job(document, pages))
+
+    async def close(self) -> None:
+        """Stop tracking jobs (pipeline shutdown)."""
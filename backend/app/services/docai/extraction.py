@@ -0,0 +1,281 @@
+"""
+Batched, rate-limited field extraction
+
+Stage 2 asks a language model for each document's fields. The extractor
+here sits between the pipeline's extraction workers and the model:
+
+- A document whose OCR text is shorter than ``docai_extract_batch_max_chars``
+  waits up to ``docai_extract_batch_wait_ms`` for others of the same type,
+  and up to ``docai_extract_batch_size`` of them share one prompt. Longer
+  documents are sent alone.
+- Every call first takes its estimated size (prompt plus output allowance)
+  from a token bucket refilled at ``docai_bedrock_tokens_per_minute``; the
+  estimate is corrected by the usage the model reports. A burst of uploads
+  queues here rather than running into the model's throttling.
+- A throttled call empties the bucket, so every queued call backs off with
+  it, and is retried after a doubling, jittered delay.
+
+A document the model left out of a batch reply, or every document of a
+batch whose reply cannot be parsed, is extracted again on its own.
+"""
+
+import asyncio
+import random
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Set
+
+import structlog
+
+from ...core.config import settings
+from ...core.metrics import concurrency_metric
+from ...models.document import Document
+from .engines import ExtractionResult, FieldExtractor
+from .prompts import (
+    MAX_PROMPT_CHARS,
+    PROMPT_VERSION,
+    build_batch_prompt,
+    build_prompt,
+    overall_confidence,
+    parse_batch_fields,
+    parse_fields,
+)
+from .ratelimit import TokenBucket
+
+logger = structlog.get_logger()
+
+# Rough English average; only used until the model reports actual usage
+CHARS_PER_TOKEN = 4
+MAX_OUTPUT_TOKENS = 1024
+# Per document of a batch: nine fields fit in well under this. Bedrock holds
+# max_tokens against the quota until the call returns, so keep it tight
+BATCH_OUTPUT_TOKENS_PER_DOCUMENT = 512
+
+
+@dataclass
+class ModelReply:
+    text: str
+    input_tokens: Optional[int] = None
+    output_tokens: Optional[int] = None
+
+
+class ModelThrottled(Exception):
+    """The model service refused the call for lack of quota or capacity; it may succeed later."""
+
+
+class ExtractionModel(ABC):
+    """A text model answering one prompt per call."""
+
+    model_id: str
+    # Results of a stand-in model are never stored in the result cache
+    cacheable: bool = True
+
+    @abstractmethod
+    async def invoke(self, prompt: str, max_tokens: int) -> ModelReply:
+        """Raises ``ModelThrottled`` when the call should be retried later."""
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds before retry number ``attempt`` of a throttled call: doubling, capped, jittered."""
+    delay = min(
+        settings.docai_bedrock_retry_max_seconds,
+        settings.docai_bedrock_retry_base_seconds * 2 ** (attempt - 1),
+    )
+    # Calls throttled together must not all come back together
+    return delay * random.uniform(0.5, 1.0)
+
+
+def _document_type(document: Document) -> str:
+    return getattr(document.document_type, "value", document.document_type)
+
+
+@dataclass
+class _Pending:
+    document: Document
+    text: str
+    future: "asyncio.Future[ExtractionResult]"
+
+
+class BatchingFieldExtractor(FieldExtractor):
+    """Field extraction on ``model``, batching small documents and pacing calls to a token budget."""
+
+    def __init__(
+        self,
+        model: ExtractionModel,
+        tokens_per_minute: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        batch_wait_seconds: Optional[float] = None,
+        batch_max_chars: Optional[int] = None,
+    ):
+        self.model = model
+        tokens_per_minute = tokens_per_minute or settings.docai_bedrock_tokens_per_minute
+        # Bursts of up to ten seconds' budget; the rest of the minute is paced
+        self.limit = TokenBucket(tokens_per_minute / 60, capacity=tokens_per_minute / 6)
+        self.batch_size = batch_size or settings.docai_extract_batch_size
+        self.batch_wait_seconds = (
+            settings.docai_extract_batch_wait_ms / 1000 if batch_wait_seconds is None else batch_wait_seconds
+        )
+        self.batch_max_chars = settings.docai_extract_batch_max_chars if batch_max_chars is None else batch_max_chars
+        self.metric = concurrency_metric("docai_model")
+        self._pending: Dict[str, List[_Pending]] = {}        # document type → documents waiting for a batch
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._batches: Set[asyncio.Task] = set()
+        self.calls = 0
+        self.documents = 0
+        self.throttled = 0
+
+    def cache_version(self, document: Document) -> Optional[str]:
+        if not self.model.cacheable:
+            return None
+        # The prompt is specialised per document type
+        return f"{self.model.model_id}:{PROMPT_VERSION}:{_document_type(document)}"
+
+    async def _call(self, prompt: str, max_tokens: int, documents: int) -> ModelReply:
+        """One model call within the token budget, retried while throttled."""
+        estimate = estimate_tokens(prompt) + max_tokens
+        attempt = 0
+        while True:
+            submitted_at = self.metric.submitted()
+            try:
+                await self.limit.acquire(estimate)
+            except asyncio.CancelledError:
+                self.metric.cancelled()
+                raise
+            try:
+                with self.metric.running(submitted_at):
+                    reply = await self.model.invoke(prompt, max_tokens)
+            except ModelThrottled as e:
+                self.throttled += 1
+                self.limit.refund(estimate)
+                self.limit.drain()
+                attempt += 1
+                if attempt > settings.docai_bedrock_max_retries:
+                    raise
+                delay = retry_delay(attempt)
+                logger.warning(
+                    "Extraction model throttled; retrying",
+                    model_id=self.model.model_id,
+                    attempt=attempt,
+                    retry_in_seconds=round(delay, 1),
+                    error=str(e),
+                )
+                await asyncio.sleep(delay)
+                continue
+            used = (reply.input_tokens or estimate_tokens(prompt)) + (reply.output_tokens or max_tokens)
+            self.limit.refund(estimate - used)
+            self.calls += 1
+            self.documents += documents
+            logger.info(
+                "Fields extracted",
+                model_id=self.model.model_id,
+                documents=documents,
+                input_tokens=reply.input_tokens,
+                output_tokens=reply.output_tokens,
+            )
+            return reply
+
+    async def _extract_one(self, document: Document, text: str) -> ExtractionResult:
+        reply = await self._call(build_prompt(document, text), MAX_OUTPUT_TOKENS, documents=1)
+        fields = parse_fields(reply.text)
+        return ExtractionResult(fields=fields, confidence=overall_confidence(fields))
+
+    async def extract(self, document: Document, text: str) -> ExtractionResult:
+        if self.batch_size < 2 or len(text) > self.batch_max_chars:
+            return await self._extract_one(document, text)
+
+        key = _document_type(document)
+        group = self._pending.setdefault(key, [])
+        if group and sum(len(pending.text) for pending in group) + len(text) > MAX_PROMPT_CHARS:
+            self._flush(key)
+            group = self._pending.setdefault(key, [])
+        pending = _Pending(document, text, asyncio.get_running_loop().create_future())
+        group.append(pending)
+        if len(group) >= self.batch_size:
+            self._flush(key)
+        elif len(group) == 1:
+            self._timers[key] = asyncio.get_running_loop().call_later(self.batch_wait_seconds, self._flush, key)
+        return await pending.future
+
+    def _flush(self, key: str) -> None:
+        timer = self._timers.pop(key, None)
+        if timer is not None:
+            timer.cancel()
+        group = self._pending.pop(key, [])
+        if group:
+            task = asyncio.create_task(self._run_batch(group))
+            self._batches.add(task)
+            task.add_done_callback(self._batches.discard)
+
+    @staticmethod
+    def _settle(pending: _Pending, result: Optional[ExtractionResult] = None, error: Optional[BaseException] = None) -> None:
+        # The waiting worker may have been cancelled (shutdown)
+        if pending.future.done():
+            return
+        if error is not None:
+            pending.future.set_exception(error)
+        else:
+            pending.future.set_result(result)
+
+    async def _run_alone(self, pending: _Pending) -> None:
+        try:
+            self._settle(pending, await self._extract_one(pending.document, pending.text))
+        except asyncio.CancelledError:
+            pending.future.cancel()
+            raise
+        except Exception as e:
+            self._settle(pending, error=e)
+
+    async def _run_batch(self, group: List[_Pending]) -> None:
+        live = [pending for pending in group if not pending.future.done()]
+        if len(live) < 2:
+            await asyncio.gather(*(self._run_alone(pending) for pending in live))
+            return
+        try:
+            reply = await self._call(
+                build_batch_prompt([(pending.document, pending.text) for pending in live]),
+                BATCH_OUTPUT_TOKENS_PER_DOCUMENT * len(live),
+                documents=len(live),
+            )
+        except asyncio.CancelledError:
+            for pending in live:
+                pending.future.cancel()
+            raise
+        except Exception as e:
+            for pending in live:
+                self._settle(pending, error=e)
+            return
+
+        try:
+            parsed = parse_batch_fields(reply.text, len(live))
+        except ValueError as e:
+            logger.warning("Batch extraction reply unreadable", model_id=self.model.model_id, error=str(e))
+            parsed = [None] * len(live)
+        missing: List[_Pending] = []
+        for pending, fields in zip(live, parsed):
+            if fields is None:
+                missing.append(pending)
+            else:
+                self._settle(pending, ExtractionResult(fields=fields, confidence=overall_confidence(fields)))
+        if missing:
+            logger.warning(
+                "Documents missing from batch reply; extracting alone",
+                document_ids=[pending.document.id for pending in missing],
+            )
+            await asyncio.gather(*(self._run_alone(pending) for pending in missing))
+
+    async def close(self) -> None:
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for group in self._pending.values():
+            for pending in group:
+                pending.future.cancel()
+        self._pending.clear()
+        batches = list(self._batches)
+        for task in batches:
+            task.cancel()
+        await asyncio.gather(*batches, return_exceptions=True)
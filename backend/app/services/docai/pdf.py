@@ -0,0 +1,50 @@
+"""
+PDF page ranges for parallel OCR
+
+pypdf is pure Python and CPU-bound: call these off the event loop.
+"""
+
+import io
+from typing import List, Tuple
+
+from pypdf import PdfReader, PdfWriter
+from pypdf.errors import PdfReadError
+
+PageBounds = Tuple[int, int]   # 1-based, inclusive
+
+
+class PdfSplitError(Exception):
+    pass
+
+
+def _reader(data: bytes) -> PdfReader:
+    try:
+        reader = PdfReader(io.BytesIO(data))
+        if reader.is_encrypted:
+            raise PdfSplitError("PDF is encrypted")
+        return reader
+    except PdfReadError as e:
+        raise PdfSplitError(str(e)) from e
+
+
+def page_count(data: bytes) -> int:
+    return len(_reader(data).pages)
+
+
+def page_ranges(pages: int, per_range: int) -> List[PageBounds]:
+    """Consecutive ranges of ``per_range`` pages covering the document."""
+    return [(first, min(first + per_range - 1, pages)) for first in range(1, pages + 1, per_range)]
+
+
+def split_pages(data: bytes, ranges: List[PageBounds]) -> List[bytes]:
+    """One PDF per range, in the order given."""
+    reader = _reader(data)
+    parts: List[bytes] = []
+    for first, last in ranges:
+        writer = PdfWriter()
+        for index in range(first - 1, last):
+            writer.add_page(reader.pages[index])
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        parts.append(buffer.getvalue())
+    return parts
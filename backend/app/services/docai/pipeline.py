@@ -0,0 +1,664 @@
+"""
+DocAI pipeline runner
+
+Documents move through the ``ExtractionStatus`` state machine
+
+    pending → ocr_running → extracting → review
+
+with one bounded worker pool per stage. The database is the queue: a stage
+claims the oldest waiting documents with a single UPDATE … WHERE id IN
+(SELECT … FOR UPDATE SKIP LOCKED), stamping ``claimed_by``; every later
+transition is conditional on still holding that claim. Any number of
+worker processes can therefore share the load, and a crashed worker's
+documents are taken over once their heartbeat is older than
+``docai_claim_timeout_seconds``.
+
+Backpressure:
+
+- A stage only claims as many documents as it has free slots (workers plus
+  ``docai_stage_queue_size``), so a burst stays in the table, not in memory.
+- OCR hands a finished document straight to extraction when this process
+  has a free extraction slot, and otherwise releases it for any worker.
+- OCR stops claiming while ``docai_max_extract_backlog`` documents already
+  wait for extraction, so a backfill cannot run ahead of the Bedrock quota.
+
+With an ``AsyncOcrEngine`` (Textract) an OCR worker only starts the job:
+the document stays claimed in ``ocr_running`` while the engine's shared
+poller tracks it, and is handed to extraction when the job finishes. Up to
+``docai_textract_max_jobs`` jobs are in flight per worker.
+
+A PDF longer than ``docai_ocr_pages_per_range`` pages is split into page
+ranges, stored as PDFs of their own and queued on the OCR stage as
+separate work items, so the ranges run in parallel across the stage's
+workers (or as parallel Textract jobs). Each finished range is saved in
+``document_ocr_ranges`` — visible as progress, and kept across a restart —
+and the texts are merged in page order once the last range is done.
+
+Failures put the document back in its waiting status; after
+``docai_max_attempts`` claims at one stage it is marked ``failed``.
+"""
+
+import asyncio
+import os
+import socket
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import and_, any_, case, delete, func, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+from ...core import database
+from ...core.config import settings
+from ...core.metrics import ConcurrencyMetric, concurrency_metric
+from ...models.document import Document, ExtractionStatus
+from ...models.document_ocr_range import DocumentOcrRange
+from ..storage import StorageBackend, get_storage
+from . import cache, pdf
+from .engines import AsyncOcrEngine, FieldExtractor, OcrEngine, OcrResult, PageRange
+
+logger = structlog.get_logger()
+
+# Stage statuses a claim may be held in
+CLAIMED_STATUSES = (ExtractionStatus.ocr_running, ExtractionStatus.extracting)
+
+# A stage work item: a document, or one page range of a split document
+WorkItem = Tuple[int, Optional[int]]
+
+
+def _is_pdf(document: Document) -> bool:
+    return document.mime_type == "application/pdf" or document.original_filename.lower().endswith(".pdf")
+
+
+def range_key(document: Document, first_page: int, last_page: int) -> str:
+    # Per document, not per stored file: deduplicated copies share s3_key and
+    # each removes its own range files once merged
+    return f"documents/ocr-ranges/{document.id}/{first_page:05d}-{last_page:05d}.pdf"
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+@dataclass
+class _Stage:
+    name: str
+    waiting: ExtractionStatus     # claimable, unclaimed
+    running: ExtractionStatus     # while claimed
+    concurrency: int
+    handler: Callable[[int], Awaitable[None]]
+    metric: ConcurrencyMetric
+    queue: "asyncio.Queue[Tuple[int, Optional[int], float]]" = field(default_factory=asyncio.Queue)
+    held: int = 0                 # claimed by this process: queued or running
+    wake: asyncio.Event = field(default_factory=asyncio.Event)
+
+    @property
+    def capacity(self) -> int:
+        return self.concurrency + settings.docai_stage_queue_size
+
+    @property
+    def free(self) -> int:
+        return max(0, self.capacity - self.held)
+
+    def hold(self, document_id: int, range_id: Optional[int] = None) -> None:
+        self.held += 1
+        self.enqueue(document_id, range_id)
+
+    def reserve(self) -> bool:
+        """Take a slot for a document about to be handed over from the previous stage."""
+        if not self.free:
+            return False
+        self.held += 1
+        return True
+
+    def enqueue(self, document_id: int, range_id: Optional[int] = None) -> None:
+        self.queue.put_nowait((document_id, range_id, self.metric.submitted()))
+
+    def release(self) -> None:
+        self.held -= 1
+        self.wake.set()
+
+
+class DocAIPipeline:
+    """Runs the OCR and extraction stages until stopped."""
+
+    def __init__(
+        self,
+        ocr: OcrEngine,
+        extractor: FieldExtractor,
+        worker_id: Optional[str] = None,
+        storage: Optional[StorageBackend] = None,
+    ):
+        self.ocr = ocr
+        self.extractor = extractor
+        self.storage = storage or get_storage()
+        self.worker_id = worker_id or default_worker_id()
+        self.ocr_stage = _Stage(
+            name="ocr",
+            waiting=ExtractionStatus.pending,
+            running=ExtractionStatus.ocr_running,
+            concurrency=settings.docai_ocr_concurrency,
+            handler=self._run_ocr,
+            metric=concurrency_metric("docai_ocr", limit=settings.docai_ocr_concurrency),
+        )
+        self.extract_stage = _Stage(
+            name="extract",
+            waiting=ExtractionStatus.extracting,
+            running=ExtractionStatus.extracting,
+            concurrency=settings.docai_extract_concurrency,
+            handler=self._run_extract,
+            metric=concurrency_metric("docai_extract", limit=settings.docai_extract_concurrency),
+        )
+        self.stages = (self.ocr_stage, self.extract_stage)
+        # OCR jobs running remotely (per document or page range), awaiting the poller
+        self._ocr_jobs: Dict[WorkItem, asyncio.Task] = {}
+        self._job_slots = asyncio.Semaphore(settings.docai_textract_max_jobs)
+        self.ocr_jobs_metric = concurrency_metric("docai_ocr_jobs", limit=settings.docai_textract_max_jobs)
+        self._stopping = asyncio.Event()
+        self._backlogged = False
+
+    # Claims
+
+    def _mine(self, document_id: int, stage: _Stage):
+        return and_(
+            Document.id == document_id,
+            Document.claimed_by == self.worker_id,
+            Document.extraction_status == stage.running,
+        )
+
+    async def _claim(self, stage: _Stage, limit: int) -> List[int]:
+        """Atomically claim up to ``limit`` waiting (or abandoned) documents for a stage."""
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=settings.docai_claim_timeout_seconds)
+        claimable = (
+            select(Document.id)
+            .where(or_(
+                and_(Document.extraction_status == stage.waiting, Document.claimed_by.is_(None)),
+                and_(Document.extraction_status == stage.running, Document.heartbeat_at < stale_before),
+            ))
+            .order_by(Document.uploaded_at, Document.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        async with database.AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Document)
+                # ARRAY(...) runs the locking subquery exactly once; as an IN
+                # semi-join the planner may rescan it, and every rescan skips
+                # the rows just updated and locks the next batch
+                .where(Document.id == any_(func.array(claimable.scalar_subquery())))
+                .values(
+                    extraction_status=stage.running,
+                    claimed_by=self.worker_id,
+                    heartbeat_at=now,
+                    attempts=Document.attempts + 1,
+                )
+                .returning(Document.id, Document.attempts)
+                .execution_options(synchronize_session=False)
+            )
+            rows = result.all()
+            exhausted = [document_id for document_id, attempts in rows if attempts > settings.docai_max_attempts]
+            if exhausted:
+                await db.execute(
+                    update(Document)
+                    .where(Document.id.in_(exhausted))
+                    .values(extraction_status=ExtractionStatus.failed, claimed_by=None)
+                )
+                logger.warning("DocAI documents failed", stage=stage.name, document_ids=exhausted)
+            await db.commit()
+        return [document_id for document_id, attempts in rows if attempts <= settings.docai_max_attempts]
+
+    def _room(self, stage: _Stage) -> int:
+        """Documents the stage may claim now."""
+        if stage is self.ocr_stage and isinstance(self.ocr, AsyncOcrEngine):
+            # Each claimed document becomes a remote job; stay under the job quota
+            return min(stage.free, max(0, settings.docai_textract_max_jobs - len(self._ocr_jobs) - stage.held))
+        return stage.free
+
+    async def _accepting(self, stage: _Stage) -> bool:
+        """OCR pauses while too many documents already wait for extraction."""
+        if stage is not self.ocr_stage:
+            return True
+        async with database.AsyncSessionLocal() as db:
+            backlog = (await db.execute(
+                select(func.count())
+                .select_from(Document)
+                .where(Document.extraction_status == ExtractionStatus.extracting, Document.claimed_by.is_(None))
+            )).scalar_one()
+        backlogged = backlog >= settings.docai_max_extract_backlog
+        if backlogged != self._backlogged:
+            log = logger.warning if backlogged else logger.info
+            log("DocAI OCR " + ("paused" if backlogged else "resumed"), extract_backlog=backlog)
+            self._backlogged = backlogged
+        return not backlogged
+
+    async def _release(self, document_id: int, stage: _Stage, error: Exception) -> None:
+        """Give a failed document back to its waiting status (or mark it failed when out of attempts)."""
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(
+                update(Document)
+                .where(self._mine(document_id, stage))
+                .values(
+                    extraction_status=case(
+                        (Document.attempts >= settings.docai_max_attempts, ExtractionStatus.failed.name),
+                        else_=stage.waiting.name,
+                    ).cast(Document.extraction_status.type),
+                    claimed_by=None,
+                    error_message=f"{stage.name}: {error}"[:2000],
+                )
+            )
+            await db.commit()
+
+    async def _release_all(self) -> None:
+        """Hand back every document this worker holds (shutdown)."""
+        async with database.AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(Document)
+                .where(Document.claimed_by == self.worker_id, Document.extraction_status.in_(CLAIMED_STATUSES))
+                .values(
+                    extraction_status=case(
+                        (
+                            Document.extraction_status == ExtractionStatus.ocr_running,
+                            literal(ExtractionStatus.pending, Document.extraction_status.type),
+                        ),
+                        else_=Document.extraction_status,
+                    ),
+                    claimed_by=None,
+                    attempts=func.greatest(Document.attempts - 1, 0),
+                )
+                .returning(Document.id)
+            )
+            released = result.scalars().all()
+            await db.commit()
+        if released:
+            logger.info("DocAI claims released", worker_id=self.worker_id, count=len(released))
+
+    async def _heartbeat(self) -> None:
+        """Keep this worker's claims (queued ones too) from being taken over."""
+        interval = settings.docai_claim_timeout_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                async with database.AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(Document)
+                        .where(Document.claimed_by == self.worker_id, Document.extraction_status.in_(CLAIMED_STATUSES))
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning("DocAI heartbeat failed", worker_id=self.worker_id, error=str(e))
+
+    # Stages
+
+    async def _run_ocr(self, document_id: int) -> None:
+        async with database.AsyncSessionLocal() as db:
+            document = await db.get(Document, document_id)
+            cached = await cache.cached_ocr(db, document, self.ocr)
+            await db.commit()
+            if cached is None:
+                ranges = await self._plan_ranges(db, document)
+        if cached is not None:
+            logger.info("DocAI OCR result reused", document_id=document_id, sha256=document.content_sha256)
+            await self._ocr_done(document_id, cached, cached=True)
+            return
+        if ranges:
+            pending = [part.id for part in ranges if part.text is None]
+            # The ranges go back on this stage's queue; the document stays claimed meanwhile
+            for range_id in pending:
+                self.ocr_stage.hold(document_id, range_id)
+            if not pending:
+                await self._merge_ranges(document_id)
+            return
+        await self._ocr(document_id, None, document, None)
+
+    async def _run_ocr_range(self, document_id: int, range_id: int) -> None:
+        async with database.AsyncSessionLocal() as db:
+            document = await db.get(Document, document_id)
+            part = await db.get(DocumentOcrRange, range_id)
+        if part is None or part.text is not None:
+            return
+        await self._ocr(document_id, range_id, document, PageRange(part.first_page, part.last_page, part.s3_key))
+
+    async def _plan_ranges(self, db, document: Document) -> List[DocumentOcrRange]:
+        """Page ranges of a long PDF (splitting and storing them the first time); empty to OCR it whole."""
+        query = (
+            select(DocumentOcrRange)
+            .where(DocumentOcrRange.document_id == document.id)
+            .order_by(DocumentOcrRange.first_page)
+        )
+        ranges = list((await db.execute(query)).scalars())
+        if ranges or not _is_pdf(document):
+            return ranges
+        if document.page_count is not None and document.page_count <= settings.docai_ocr_pages_per_range:
+            return []
+
+        data = await self.storage.download_file(document.s3_key)
+        try:
+            pages = await asyncio.to_thread(pdf.page_count, data)
+        except pdf.PdfSplitError as e:
+            logger.warning("PDF not split; OCR runs on the whole file", document_id=document.id, error=str(e))
+            return []
+        bounds = pdf.page_ranges(pages, settings.docai_ocr_pages_per_range)
+        if len(bounds) > 1:
+            parts = await asyncio.to_thread(pdf.split_pages, data, bounds)
+            del data
+            for (first, last), part in zip(bounds, parts):
+                await self.storage.upload_file(part, range_key(document, first, last), content_type="application/pdf")
+            await db.execute(
+                insert(DocumentOcrRange)
+                .values([
+                    dict(document_id=document.id, first_page=first, last_page=last, s3_key=range_key(document, first, last))
+                    for first, last in bounds
+                ])
+                .on_conflict_do_nothing()
+            )
+        await db.execute(
+            update(Document).where(self._mine(document.id, self.ocr_stage)).values(page_count=pages)
+        )
+        await db.commit()
+        if len(bounds) > 1:
+            logger.info("Document split for OCR", document_id=document.id, pages=pages, ranges=len(bounds))
+        return list((await db.execute(query)).scalars())
+
+    async def _ocr(self, document_id: int, range_id: Optional[int], document: Document, pages: Optional[PageRange]) -> None:
+        """OCR a document or one of its ranges: inline, or as a remote job the poller picks up."""
+        if not isinstance(self.ocr, AsyncOcrEngine):
+            result = await self.ocr.detect_text(document, pages)
+            await self._ocr_part_done(document_id, range_id, result)
+            return
+
+        # Ranges of one document may outnumber the free job slots; wait here rather than overrun the quota
+        await self._job_slots.acquire()
+        try:
+            job_id = await self.ocr.start_job(document, pages)
+            async with database.AsyncSessionLocal() as db:
+                started = await db.execute(
+                    update(Document)
+                    .where(self._mine(document_id, self.ocr_stage))
+                    .values(
+                        textract_job_id=job_id if range_id is None else Document.textract_job_id,
+                        heartbeat_at=datetime.now(timezone.utc),
+                    )
+                )
+                if range_id is not None:
+                    await db.execute(update(DocumentOcrRange).where(DocumentOcrRange.id == range_id).values(job_id=job_id))
+                await db.commit()
+        except BaseException:
+            self._job_slots.release()
+            raise
+        if started.rowcount == 0:
+            self._job_slots.release()
+            logger.warning("DocAI claim lost during OCR", document_id=document_id, worker_id=self.worker_id)
+            return
+        item = (document_id, range_id)
+        self._ocr_jobs[item] = asyncio.create_task(self._await_ocr_job(item, job_id))
+
+    async def _await_ocr_job(self, item: WorkItem, job_id: str) -> None:
+        document_id, range_id = item
+        try:
+            with self.ocr_jobs_metric.running():
+                result = await self.ocr.wait_job(job_id)
+            await self._ocr_part_done(document_id, range_id, result)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error("DocAI OCR job failed", document_id=document_id, range_id=range_id, job_id=job_id, error=str(e))
+            try:
+                await self._release(document_id, self.ocr_stage, e)
+            except Exception as release_error:
+                logger.error("DocAI release failed", document_id=document_id, error=str(release_error))
+        finally:
+            self._ocr_jobs.pop(item, None)
+            self._job_slots.release()
+            self.ocr_stage.wake.set()
+
+    async def _ocr_part_done(self, document_id: int, range_id: Optional[int], result: OcrResult) -> None:
+        if range_id is None:
+            await self._ocr_done(document_id, result)
+            return
+        async with database.AsyncSessionLocal() as db:
+            # The document row lock serialises finishing ranges: exactly one sees none left
+            locked = (await db.execute(
+                select(Document.id).where(self._mine(document_id, self.ocr_stage)).with_for_update()
+            )).scalar_one_or_none()
+            if locked is None:
+                await db.rollback()
+                logger.warning("DocAI claim lost during OCR", document_id=document_id, worker_id=self.worker_id)
+                return
+            await db.execute(
+                update(DocumentOcrRange)
+                .where(DocumentOcrRange.id == range_id)
+                .values(text=result.text, job_id=result.job_id, completed_at=datetime.now(timezone.utc))
+            )
+            await db.execute(
+                update(Document).where(Document.id == document_id).values(heartbeat_at=datetime.now(timezone.utc))
+            )
+            remaining = (await db.execute(
+                select(func.count())
+                .select_from(DocumentOcrRange)
+                .where(DocumentOcrRange.document_id == document_id, DocumentOcrRange.text.is_(None))
+            )).scalar_one()
+            await db.commit()
+        if remaining == 0:
+            await self._merge_ranges(document_id)
+
+    async def _merge_ranges(self, document_id: int) -> None:
+        """Join the ranges' text in page order and move the document on."""
+        async with database.AsyncSessionLocal() as db:
+            ranges = list((await db.execute(
+                select(DocumentOcrRange)
+                .where(DocumentOcrRange.document_id == document_id)
+                .order_by(DocumentOcrRange.first_page)
+            )).scalars())
+        result = OcrResult(text="\f".join(part.text for part in ranges), pages=sum(part.page_count for part in ranges))
+        if not await self._ocr_done(document_id, result):
+            return
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(delete(DocumentOcrRange).where(DocumentOcrRange.document_id == document_id))
+            await db.commit()
+        for part in ranges:
+            try:
+                await self.storage.delete_file(part.s3_key)
+            except Exception as e:
+                logger.warning("OCR range file not removed", document_id=document_id, s3_key=part.s3_key, error=str(e))
+
+    async def _ocr_done(self, document_id: int, result: OcrResult, cached: bool = False) -> bool:
+        """Store OCR text and move the document on to extraction; False if the claim was lost."""
+        stage = self.ocr_stage
+        async with database.AsyncSessionLocal() as db:
+            if not cached:
+                await cache.remember_ocr(db, await db.get(Document, document_id), self.ocr, result)
+            # Keep the claim and queue it here when this process has room; otherwise any worker may take it
+            handoff = not self._stopping.is_set() and self.extract_stage.reserve()
+            try:
+                advanced = await db.execute(
+                    update(Document)
+                    .where(self._mine(document_id, stage))
+                    .values(
+                        extraction_status=ExtractionStatus.extracting,
+                        ocr_text=result.text,
+                        page_count=result.pages,
+                        textract_job_id=result.job_id,
+                        claimed_by=self.worker_id if handoff else None,
+                        heartbeat_at=datetime.now(timezone.utc),
+                        attempts=1 if handoff else 0,
+                        error_message=None,
+                    )
+                )
+                await db.commit()
+            except BaseException:
+                if handoff:
+                    self.extract_stage.release()
+                raise
+
+        if advanced.rowcount == 0:
+            logger.warning("DocAI claim lost during OCR", document_id=document_id, worker_id=self.worker_id)
+        if handoff and advanced.rowcount:
+            self.extract_stage.enqueue(document_id)
+        elif handoff:
+            self.extract_stage.release()
+        else:
+            self.extract_stage.wake.set()
+        return advanced.rowcount > 0
+
+    async def _run_extract(self, document_id: int) -> None:
+        stage = self.extract_stage
+        async with database.AsyncSessionLocal() as db:
+            document = await db.get(Document, document_id)
+            result = await cache.cached_extraction(db, document, self.extractor)
+            await db.commit()
+            if result is None:
+                result = await self.extractor.extract(document, document.ocr_text or "")
+                await cache.remember_extraction(db, document, self.extractor, result)
+            else:
+                logger.info("DocAI extraction reused", document_id=document_id, sha256=document.content_sha256)
+            advanced = await db.execute(
+                update(Document)
+                .where(self._mine(document_id, stage))
+                .values(
+                    extraction_status=ExtractionStatus.review,
+                    extracted_fields=result.fields,
+                    confidence_score=result.confidence,
+                    extraction_completed_at=datetime.now(timezone.utc),
+                    claimed_by=None,
+                    attempts=0,
+                    error_message=None,
+                )
+            )
+            await db.commit()
+        if advanced.rowcount == 0:
+            logger.warning("DocAI claim lost during extraction", document_id=document_id, worker_id=self.worker_id)
+        else:
+            logger.info("Document ready for review", document_id=document_id, confidence=result.confidence)
+
+    # Loops
+
+    async def _feed(self, stage: _Stage) -> None:
+        while not self._stopping.is_set():
+            claimed: List[int] = []
+            try:
+                room = self._room(stage)
+                if room and await self._accepting(stage):
+                    claimed = await self._claim(stage, room)
+            except Exception as e:
+                logger.error("DocAI claim failed", stage=stage.name, error=str(e))
+            for document_id in claimed:
+                stage.hold(document_id)
+            if claimed and self._room(stage):
+                continue
+            stage.wake.clear()
+            try:
+                await asyncio.wait_for(stage.wake.wait(), settings.docai_poll_interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _work(self, stage: _Stage) -> None:
+        while True:
+            document_id, range_id, submitted_at = await stage.queue.get()
+            try:
+                with stage.metric.running(submitted_at):
+                    if range_id is None:
+                        await stage.handler(document_id)
+                    else:
+                        await self._run_ocr_range(document_id, range_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "DocAI stage failed",
+                    stage=stage.name,
+                    document_id=document_id,
+                    range_id=range_id,
+                    error=str(e),
+                    exc_info=True,
+                )
+                try:
+                    await self._release(document_id, stage, e)
+                except Exception as release_error:
+                    logger.error("DocAI release failed", document_id=document_id, error=str(release_error))
+            finally:
+                stage.release()
+
+    async def run(self) -> None:
+        """Run every stage until ``stop()``; held documents are released on the way out."""
+        logger.info(
+            "DocAI pipeline started",
+            worker_id=self.worker_id,
+            ocr_concurrency=self.ocr_stage.concurrency,
+            extract_concurrency=self.extract_stage.concurrency,
+        )
+        tasks: Set[asyncio.Task] = {asyncio.create_task(self._heartbeat())}
+        for stage in self.stages:
+            tasks.add(asyncio.create_task(self._feed(stage)))
+            tasks.update(asyncio.create_task(self._work(stage)) for _ in range(stage.concurrency))
+        try:
+            await self._stopping.wait()
+        finally:
+            tasks.update(self._ocr_jobs.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if isinstance(self.ocr, AsyncOcrEngine):
+                await self.ocr.close()
+            await self.extractor.close()
+            await self._release_all()
+            logger.info("DocAI pipeline stopped", worker_id=self.worker_id)
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        snapshot = {
+            stage.name: {"held": stage.held, "queued": stage.queue.qsize(), "capacity": stage.capacity}
+            for stage in self.stages
+        }
+        snapshot["ocr_jobs"] = {"in_flight": len(self._ocr_jobs), "capacity": settings.docai_textract_max_jobs}
+        return snapshot
+
+
+def default_extractor() -> FieldExtractor:
+    """Bedrock, or the stub model with DOCAI_EXTRACTOR=stub."""
+    if settings.docai_extractor == "stub":
+        from .stub import StubFieldExtractor
+        return StubFieldExtractor()
+    from .bedrock import BedrockFieldExtractor
+    return BedrockFieldExtractor()
+
+
+def default_ocr_engine() -> OcrEngine:
+    """Textract, or the stub engine with DOCAI_OCR_ENGINE=stub."""
+    if settings.docai_ocr_engine == "stub":
+        from .stub import StubOcrEngine
+        return StubOcrEngine()
+    from .textract import TextractOcrEngine
+    return TextractOcrEngine()
+
+
+def default_pipeline() -> DocAIPipeline:
+    """Pipeline on the configured OCR engine and extractor."""
+    return DocAIPipeline(default_ocr_engine(), default_extractor())
+
+
+_pipeline: Optional[DocAIPipeline] = None
+_pipeline_task: Optional[asyncio.Task] = None
+
+
+def start_docai_pipeline(pipeline: Optional[DocAIPipeline] = None) -> DocAIPipeline:
+    """Run a pipeline in the background of this process (API startup with DOCAI_WORKER_IN_API)."""
+    global _pipeline, _pipeline_task
+    if _pipeline_task is None or _pipeline_task.done():
+        _pipeline = pipeline or default_pipeline()
+        _pipeline_task = asyncio.create_task(_pipeline.run())
+    return _pipeline
+
+
+async def stop_docai_pipeline() -> None:
+    global _pipeline, _pipeline_task
+    pipeline, task = _pipeline, _pipeline_task
+    _pipeline = _pipeline_task = None
+    if pipeline is not None:
+        pipeline.stop()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,165 @@
+"""
+Shared poller for asynchronous OCR jobs
+
+A Textract job takes seconds to minutes. Rather than each document
+sleeping and polling its own job, every in-flight job is registered here
+and a single task checks the ones that are due, in rate-limited rounds.
+
+Intervals adapt per job: the first check waits for about as long as recent
+jobs have taken, and each check that finds the job still running backs
+off by ``BACKOFF`` up to ``docai_textract_max_poll_seconds``. A job that
+runs past ``docai_textract_timeout_seconds`` fails.
+"""
+
+import asyncio
+import heapq
+import itertools
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import structlog
+
+from ...core.config import settings
+from .engines import OcrResult
+
+logger = structlog.get_logger()
+
+# check(job_id) -> the result once finished, None while running; raises if the job failed
+JobCheck = Callable[[str], Awaitable[Optional[OcrResult]]]
+
+BACKOFF = 1.5
+# Weight of the latest job in the running average duration
+DURATION_SMOOTHING = 0.2
+
+
+class OcrJobTimeout(Exception):
+    pass
+
+
+@dataclass
+class _Job:
+    job_id: str
+    started_at: float
+    interval: float
+    futures: List["asyncio.Future[OcrResult]"] = field(default_factory=list)
+    checks: int = 0
+
+
+class OcrJobPoller:
+    """Tracks in-flight jobs and resolves a future per job when it finishes."""
+
+    def __init__(self, check: JobCheck, name: str = "ocr"):
+        self.check = check
+        self.name = name
+        self._jobs: Dict[str, _Job] = {}
+        self._due: List[Tuple[float, int, str]] = []     # (check at, tiebreak, job_id) heap
+        self._sequence = itertools.count()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.average_seconds: Optional[float] = None
+        self.checks = 0
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def _first_interval(self) -> float:
+        low, high = settings.docai_textract_poll_seconds, settings.docai_textract_max_poll_seconds
+        if self.average_seconds is None:
+            return low
+        # Most jobs are still running well before the typical duration
+        return min(high, max(low, 0.8 * self.average_seconds))
+
+    def _schedule(self, job: _Job, delay: float) -> None:
+        heapq.heappush(self._due, (time.monotonic() + delay, next(self._sequence), job.job_id))
+
+    def track(self, job_id: str) -> "asyncio.Future[OcrResult]":
+        """Future for a started job's result; tracking the same job twice shares one poll."""
+        future = asyncio.get_running_loop().create_future()
+        job = self._jobs.get(job_id)
+        if job is None:
+            job = self._jobs[job_id] = _Job(job_id=job_id, started_at=time.monotonic(), interval=self._first_interval())
+            self._schedule(job, job.interval)
+        job.futures.append(future)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        self._wake.set()
+        return future
+
+    def _finish(self, job: _Job, result: Optional[OcrResult] = None, error: Optional[BaseException] = None) -> None:
+        self._jobs.pop(job.job_id, None)
+        for future in job.futures:
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def _check(self, job: _Job) -> None:
+        job.checks += 1
+        self.checks += 1
+        try:
+            result = await self.check(job.job_id)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._finish(job, error=e)
+            return
+
+        elapsed = time.monotonic() - job.started_at
+        if result is not None:
+            self.average_seconds = elapsed if self.average_seconds is None else (
+                (1 - DURATION_SMOOTHING) * self.average_seconds + DURATION_SMOOTHING * elapsed
+            )
+            logger.info("OCR job finished", poller=self.name, job_id=job.job_id, seconds=round(elapsed, 1), checks=job.checks)
+            self._finish(job, result=result)
+        elif elapsed > settings.docai_textract_timeout_seconds:
+            self._finish(job, error=OcrJobTimeout(
+                f"OCR job {job.job_id} still running after {settings.docai_textract_timeout_seconds}s"
+            ))
+        else:
+            job.interval = min(settings.docai_textract_max_poll_seconds, job.interval * BACKOFF)
+            self._schedule(job, job.interval)
+
+    def _take_due(self) -> List[_Job]:
+        now = time.monotonic()
+        due: List[_Job] = []
+        while self._due and self._due[0][0] <= now:
+            _, _, job_id = heapq.heappop(self._due)
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            # Waiters gone (e.g. cancelled on shutdown): stop polling the job
+            if all(future.done() for future in job.futures):
+                self._jobs.pop(job_id)
+                continue
+            due.append(job)
+        return due
+
+    async def run(self) -> None:
+        """Check due jobs round by round until none are left (``track`` restarts it)."""
+        while self._jobs:
+            due = self._take_due()
+            if due:
+                # Checks pace themselves through the engine's rate limiter
+                await asyncio.gather(*(self._check(job) for job in due))
+                continue
+            self._wake.clear()
+            timeout = max(0.0, self._due[0][0] - time.monotonic()) if self._due else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def close(self) -> None:
+        """Stop polling and cancel every waiter."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        for job in list(self._jobs.values()):
+            for future in job.futures:
+                future.cancel()
+        self._jobs.clear()
+        self._due.clear()
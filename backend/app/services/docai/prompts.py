@@ -0,0 +1,132 @@
+"""
+Stage 2 prompt
+
+Bump PROMPT_VERSION whenever the template or field list changes: stored
+extractions are only comparable (and reusable) within one version.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from ...models.document import Document
+
+PROMPT_VERSION = "2026-10-18.1"
+
+# OCR text sent to the model; long SOWs keep their first pages, where the commercial terms are
+MAX_PROMPT_CHARS = 60_000
+
+# CRM fields the model is asked for: (name, description)
+EXTRACTION_FIELDS: List[Tuple[str, str]] = [
+    ("account_name", "Customer (buyer) company name"),
+    ("opportunity_name", "Project or engagement name"),
+    ("po_id", "Purchase order number"),
+    ("po_value", "Total order / contract value as a number, without currency symbols"),
+    ("currency_code", "ISO 4217 currency code of the value"),
+    ("po_date", "Purchase order or signature date, YYYY-MM-DD"),
+    ("start_date", "Service start date, YYYY-MM-DD"),
+    ("end_date", "Service end date, YYYY-MM-DD"),
+    ("payment_terms", "Payment terms, e.g. Net 30"),
+]
+FIELD_NAMES = {name for name, _ in EXTRACTION_FIELDS}
+
+_TEMPLATE = """You extract deal fields from a {document_type} document for a CRM.
+
+Fields:
+{fields}
+
+Reply with one JSON object only. Use each field name as a key, with value
+{{"value": <string, number or null>, "confidence": <0.0-1.0>}}. Use null
+when the document does not state the field; do not guess.
+
+<document filename="{filename}">
+{text}
+</document>"""
+
+_BATCH_TEMPLATE = """You extract deal fields from each of the {count} {document_type} documents below for a CRM.
+
+Fields:
+{fields}
+
+Reply with one JSON object only, keyed by each document's index ("1", "2", ...).
+Each value is an object that uses each field name as a key, with value
+{{"value": <string, number or null>, "confidence": <0.0-1.0>}}. Use null
+when a document does not state the field; do not guess, and never carry a
+value over from another document.
+
+{documents}"""
+
+_BATCH_DOCUMENT = """<document index="{index}" filename="{filename}">
+{text}
+</document>"""
+
+_JSON_OBJECT = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def build_prompt(document: Document, text: str) -> str:
+    fields = "\n".join(f"- {name}: {description}" for name, description in EXTRACTION_FIELDS)
+    return _TEMPLATE.format(
+        document_type=getattr(document.document_type, "value", document.document_type),
+        fields=fields,
+        filename=document.original_filename,
+        text=text[:MAX_PROMPT_CHARS],
+    )
+
+
+def build_batch_prompt(documents: List[Tuple[Document, str]]) -> str:
+    """One prompt for several documents of the same type; the reply is keyed by 1-based index."""
+    fields = "\n".join(f"- {name}: {description}" for name, description in EXTRACTION_FIELDS)
+    first = documents[0][0]
+    return _BATCH_TEMPLATE.format(
+        count=len(documents),
+        document_type=getattr(first.document_type, "value", first.document_type),
+        fields=fields,
+        documents="\n\n".join(
+            _BATCH_DOCUMENT.format(index=index, filename=document.original_filename, text=text)
+            for index, (document, text) in enumerate(documents, start=1)
+        ),
+    )
+
+
+def _reply_object(reply: str) -> Dict[str, Any]:
+    match = _JSON_OBJECT.search(reply)
+    if match is None:
+        raise ValueError("Model reply contains no JSON object")
+    raw = json.loads(match.group(0))
+    if not isinstance(raw, dict):
+        raise ValueError("Model reply is not a JSON object")
+    return raw
+
+
+def parse_fields(reply: str) -> Dict[str, Dict[str, Any]]:
+    """Known fields from the model's JSON reply, each as {value, confidence}; unknown keys are dropped."""
+    return _known_fields(_reply_object(reply))
+
+
+def parse_batch_fields(reply: str, count: int) -> List[Optional[Dict[str, Dict[str, Any]]]]:
+    """Fields per document of a batch reply, in prompt order; None where the reply skipped a document."""
+    raw = _reply_object(reply)
+    results: List[Optional[Dict[str, Dict[str, Any]]]] = []
+    for index in range(1, count + 1):
+        entry = raw.get(str(index))
+        results.append(_known_fields(entry) if isinstance(entry, dict) else None)
+    return results
+
+
+def _known_fields(raw: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    fields: Dict[str, Dict[str, Any]] = {}
+    for name, entry in raw.items():
+        if name not in FIELD_NAMES or not isinstance(entry, dict):
+            continue
+        try:
+            confidence = min(1.0, max(0.0, float(entry.get("confidence") or 0.0)))
+        except (TypeError, ValueError):
+            confidence = 0.0
+        fields[name] = {"value": entry.get("value"), "confidence": confidence}
+    return fields
+
+
+def overall_confidence(fields: Dict[str, Dict[str, Any]]) -> float:
+    """Mean confidence of the fields the model found a value for."""
+    found = [entry["confidence"] for entry in fields.values() if entry.get("value") is not None]
+    return round(sum(found) / len(found), 4) if found else 0.0
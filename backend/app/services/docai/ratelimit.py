@@ -0,0 +1,50 @@
+"""
+Client-side rate limiting for AWS quotas
+
+Textract and Bedrock throttle per account and region; pacing calls here
+keeps a worker under its share of the quota instead of spending retries on
+ThrottlingException.
+"""
+
+import asyncio
+import time
+from typing import Optional
+
+
+class TokenBucket:
+    """Async token bucket: ``rate`` tokens per second, bursts of up to ``capacity``.
+
+    Waiters are served in arrival order. A request larger than the capacity
+    waits for a full bucket and leaves it in debt, so it still goes through.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            needed = min(tokens, self.capacity)
+            self._refill()
+            while self._tokens < needed:
+                await asyncio.sleep((needed - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    def refund(self, tokens: float) -> None:
+        """Return tokens taken on an estimate (negative: take more once the actual cost is known)."""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + tokens)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the service throttled us: every waiter backs off together."""
+        self._refill()
+        self._tokens = min(self._tokens, 0.0)
@@ -0,0 +1,189 @@
+"""
+Stand-in OCR and extraction services for offline runs
+
+``StubOcrEngine`` runs Textract-like jobs: it reads the text layer of the
+stored PDF and reports the job finished after a delay per job and page,
+through the same shared poller as Textract. ``StubModel`` answers each
+extraction prompt (single or batched) with the fields a few patterns find
+in the document text, after a delay that grows with prompt and reply size
+the way a hosted model's does. Both can fail a share of their calls.
+
+With ``DOCAI_OCR_ENGINE=stub`` / ``DOCAI_EXTRACTOR=stub`` the pipeline's
+claims, page ranges, polling, batching, token budget and retries run as in
+production, so throughput can be measured without AWS. Stub results are
+never cached.
+"""
+
+import asyncio
+import io
+import json
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from pypdf import PdfReader
+
+from ...core.config import settings
+from ...models.document import Document
+from ..storage import StorageBackend, get_storage
+from .engines import AsyncOcrEngine, OcrResult, PageRange
+from .extraction import BatchingFieldExtractor, ExtractionModel, ModelReply, ModelThrottled, estimate_tokens
+from .poller import OcrJobPoller
+
+_DOCUMENT = re.compile(r'<document(?: index="(\d+)")? filename="[^"]*">\n(.*?)\n</document>', re.DOTALL)
+
+_PATTERNS = {
+    "account_name": re.compile(r'(?:Customer|Bill To|Buyer)\s*:\s*(.+)'),
+    "opportunity_name": re.compile(r'(?:Project|Engagement)\s*:\s*(.+)'),
+    "po_id": re.compile(r'(?:PO|Purchase Order)\s*(?:No\.?|Number|#)?\s*[:#]?\s*([A-Z0-9][A-Z0-9-]{2,})'),
+    "po_value": re.compile(r'(?:Total|Contract Value|Amount)\s*:?\s*(?:[A-Z]{3}\s*)?\$?\s*([\d,]+(?:\.\d+)?)'),
+    "currency_code": re.compile(r'\b(SGD|USD|EUR|GBP|AUD|MYR|HKD|JPY|CNY|INR)\b'),
+    "po_date": re.compile(r'(?:PO Date|Date)\s*:\s*(\d{4}-\d{2}-\d{2})'),
+    "start_date": re.compile(r'Start(?: Date)?\s*:\s*(\d{4}-\d{2}-\d{2})'),
+    "end_date": re.compile(r'End(?: Date)?\s*:\s*(\d{4}-\d{2}-\d{2})'),
+    "payment_terms": re.compile(r'\b(Net \d+)\b'),
+}
+
+
+class StubServiceError(Exception):
+    """A simulated service failure."""
+
+
+def pdf_text(data: bytes) -> Tuple[str, int]:
+    """Text layer of a PDF, pages separated by form feeds, and its page count."""
+    reader = PdfReader(io.BytesIO(data))
+    return "\f".join(page.extract_text() or "" for page in reader.pages), len(reader.pages)
+
+
+@dataclass
+class _StubJob:
+    task: "asyncio.Task[Tuple[str, int]]"
+    started_at: float
+    fails: bool
+
+
+class StubOcrEngine(AsyncOcrEngine):
+    """OCR jobs that read the PDF text layer and finish after a simulated delay."""
+
+    def __init__(
+        self,
+        storage: Optional[StorageBackend] = None,
+        job_seconds: Optional[float] = None,
+        seconds_per_page: Optional[float] = None,
+        failure_rate: float = 0.0,
+    ):
+        self.storage = storage or get_storage()
+        self.job_seconds = settings.docai_stub_ocr_job_seconds if job_seconds is None else job_seconds
+        self.seconds_per_page = (
+            settings.docai_stub_ocr_seconds_per_page if seconds_per_page is None else seconds_per_page
+        )
+        self.failure_rate = failure_rate     # share of jobs that end FAILED
+        self.poller = OcrJobPoller(self.check_job, name='stub')
+        self._jobs: Dict[str, _StubJob] = {}
+
+    @property
+    def jobs_in_flight(self) -> int:
+        return len(self.poller)
+
+    async def _read(self, key: str) -> Tuple[str, int]:
+        data = await self.storage.download_file(key)
+        if not data.startswith(b'%PDF'):
+            return data.decode('utf-8', errors='replace'), 1
+        return await asyncio.to_thread(pdf_text, data)
+
+    async def start_job(self, document: Document, pages: Optional[PageRange] = None) -> str:
+        job_id = uuid.uuid4().hex
+        self._jobs[job_id] = _StubJob(
+            task=asyncio.create_task(self._read(pages.s3_key if pages else document.s3_key)),
+            started_at=time.monotonic(),
+            fails=random.random() < self.failure_rate,
+        )
+        return job_id
+
+    async def check_job(self, job_id: str) -> Optional[OcrResult]:
+        job = self._jobs[job_id]
+        if not job.task.done():
+            return None
+        text, pages = job.task.result()
+        if time.monotonic() - job.started_at < self.job_seconds + self.seconds_per_page * pages:
+            return None
+        del self._jobs[job_id]
+        if job.fails:
+            raise StubServiceError(f"Stub OCR job {job_id} failed")
+        return OcrResult(text=text, pages=pages, job_id=job_id)
+
+    async def wait_job(self, job_id: str) -> OcrResult:
+        return await self.poller.track(job_id)
+
+    async def close(self) -> None:
+        await self.poller.close()
+        for job in self._jobs.values():
+            job.task.cancel()
+        self._jobs.clear()
+
+
+def stub_fields(text: str) -> Dict[str, Dict[str, Any]]:
+    fields: Dict[str, Dict[str, Any]] = {}
+    for name, pattern in _PATTERNS.items():
+        match = pattern.search(text)
+        value = match.group(1).strip() if match else None
+        if name == "po_value" and value is not None:
+            value = float(value.replace(",", ""))
+        fields[name] = {"value": value, "confidence": 0.95 if value is not None else 0.0}
+    return fields
+
+
+class StubModel(ExtractionModel):
+    """Pattern-matching model with simulated latency, throttling and failures."""
+
+    model_id = "stub"
+    cacheable = False
+
+    def __init__(
+        self,
+        latency_seconds: Optional[float] = None,
+        seconds_per_1k_tokens: Optional[float] = None,
+        throttle_rate: float = 0.0,
+        failure_rate: float = 0.0,
+    ):
+        self.latency_seconds = settings.docai_stub_latency_seconds if latency_seconds is None else latency_seconds
+        self.seconds_per_1k_tokens = (
+            settings.docai_stub_seconds_per_1k_tokens if seconds_per_1k_tokens is None else seconds_per_1k_tokens
+        )
+        self.throttle_rate = throttle_rate     # share of calls refused as throttled
+        self.failure_rate = failure_rate       # share of calls that fail outright
+        self.calls = 0
+
+    async def invoke(self, prompt: str, max_tokens: int) -> ModelReply:
+        self.calls += 1
+        if self.throttle_rate and random.random() < self.throttle_rate:
+            await asyncio.sleep(0.05)
+            raise ModelThrottled("Stub model throttled the call")
+        if self.failure_rate and random.random() < self.failure_rate:
+            await asyncio.sleep(self.latency_seconds)
+            raise StubServiceError("Stub model call failed")
+        documents = _DOCUMENT.findall(prompt)
+        if documents and documents[0][0]:
+            reply = json.dumps({index: stub_fields(text) for index, text in documents})
+        else:
+            reply = json.dumps(stub_fields(documents[0][1] if documents else prompt))
+        input_tokens, output_tokens = estimate_tokens(prompt), estimate_tokens(reply)
+        await asyncio.sleep(self.latency_seconds + self.seconds_per_1k_tokens * (input_tokens + output_tokens) / 1000)
+        return ModelReply(text=reply, input_tokens=input_tokens, output_tokens=output_tokens)
+
+
+class StubFieldExtractor(BatchingFieldExtractor):
+    """Batching extractor on the stub model."""
+
+    def __init__(
+        self,
+        latency_seconds: Optional[float] = None,
+        seconds_per_1k_tokens: Optional[float] = None,
+        throttle_rate: float = 0.0,
+        failure_rate: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(StubModel(latency_seconds, seconds_per_1k_tokens, throttle_rate, failure_rate), **kwargs)
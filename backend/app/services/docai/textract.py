@@ -0,0 +1,112 @@
+"""
+Stage 1 on Amazon Textract
+
+Multi-page PDFs need the asynchronous API: start a text detection job on
+the S3 object, then poll it until it finishes and page through the blocks.
+Polling is shared by every in-flight job (``OcrJobPoller``), and all
+GetDocumentTextDetection calls go through one rate limiter.
+"""
+
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import structlog
+
+from ...core.config import settings
+from ...models.document import Document
+from . import aws
+from .engines import AsyncOcrEngine, OcrResult, PageRange
+from .poller import OcrJobPoller
+from .ratelimit import TokenBucket
+
+logger = structlog.get_logger()
+
+
+class TextractError(Exception):
+    pass
+
+
+def blocks_to_pages(blocks: List[Dict]) -> Dict[int, List[str]]:
+    """LINE blocks grouped by page, in reading order."""
+    pages: Dict[int, List[str]] = defaultdict(list)
+    for block in blocks:
+        if block.get('BlockType') == 'LINE':
+            pages[block.get('Page', 1)].append(block.get('Text', ''))
+    return pages
+
+
+def pages_to_result(pages: Dict[int, List[str]], page_count: int, job_id: str) -> OcrResult:
+    text = '\f'.join('\n'.join(pages.get(page, [])) for page in range(1, page_count + 1))
+    return OcrResult(text=text, pages=page_count, job_id=job_id)
+
+
+class TextractOcrEngine(AsyncOcrEngine):
+    """OCR with Textract asynchronous text detection (requires the S3 storage backend)."""
+
+    def __init__(self):
+        self.client = aws.get_client('textract', settings.aws_textract_region)
+        self.poller = OcrJobPoller(self.check_job, name='textract')
+        self._get_limit = TokenBucket(settings.docai_textract_polls_per_second)
+
+    @property
+    def jobs_in_flight(self) -> int:
+        return len(self.poller)
+
+    def cache_version(self, document: Document) -> Optional[str]:
+        return 'textract:detect-text'
+
+    async def start_job(self, document: Document, pages: Optional[PageRange] = None) -> str:
+        if settings.storage_backend != 's3':
+            raise TextractError("Textract reads documents from S3; STORAGE_BACKEND is not s3")
+        token = f"document-{document.id}-{document.attempts}"
+        if pages is not None:
+            token += f"-p{pages.first_page}"
+        response = await aws.call(
+            self.client,
+            'start_document_text_detection',
+            DocumentLocation={'S3Object': {
+                'Bucket': settings.aws_s3_bucket_name,
+                'Name': pages.s3_key if pages else document.s3_key,
+            }},
+            # Same token for a released and re-claimed attempt: Textract returns the job already running
+            ClientRequestToken=token,
+        )
+        logger.info(
+            "Textract job started",
+            document_id=document.id,
+            job_id=response['JobId'],
+            pages=f"{pages.first_page}-{pages.last_page}" if pages else None,
+        )
+        return response['JobId']
+
+    async def _get(self, job_id: str, next_token: Optional[str] = None) -> Dict:
+        await self._get_limit.acquire()
+        kwargs = {'NextToken': next_token} if next_token else {}
+        return await aws.call(self.client, 'get_document_text_detection', JobId=job_id, MaxResults=1000, **kwargs)
+
+    async def fetch_result(self, job_id: str, first_page: Dict) -> OcrResult:
+        """Collect every block of a finished job, starting from an already fetched first page."""
+        blocks = list(first_page.get('Blocks', []))
+        next_token = first_page.get('NextToken')
+        while next_token:
+            response = await self._get(job_id, next_token)
+            blocks.extend(response.get('Blocks', []))
+            next_token = response.get('NextToken')
+        page_count = first_page.get('DocumentMetadata', {}).get('Pages', 1)
+        return pages_to_result(blocks_to_pages(blocks), page_count, job_id)
+
+    async def check_job(self, job_id: str) -> Optional[OcrResult]:
+        """One poll: the result if the job has finished, None while it runs."""
+        response = await self._get(job_id)
+        status = response['JobStatus']
+        if status in ('SUCCEEDED', 'PARTIAL_SUCCESS'):
+            return await self.fetch_result(job_id, response)
+        if status == 'FAILED':
+            raise TextractError(f"Textract job {job_id} failed: {response.get('StatusMessage', '')}")
+        return None
+
+    async def wait_job(self, job_id: str) -> OcrResult:
+        return await self.poller.track(job_id)
+
+    async def close(self) -> None:
+        await self.poller.close()
@@ -0,0 +1,302 @@
+from sqlalchemy import Float, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import insert
+from dataclasses import dataclass
+from typing import IO, Any, AsyncIterator, List, Optional
+import asyncio
+import hashlib
+import math
+import re
+import structlog
+from ..core.config import settings
+from ..models.document import IN_REVIEW, Document, DocumentType, ExtractionStatus
+from ..models.document_blob import DocumentBlob
+from ..models.document_ocr_range import DocumentOcrRange
+from ..models.user import User
+from .storage import ObjectStream, StorageBackend, get_storage, parse_byte_range
+
+logger = structlog.get_logger()
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def blob_key(sha256: str) -> str:
+    """Content-addressed storage key for a blob (fanned out by hash prefix)."""
+    return f"documents/sha256/{sha256[:2]}/{sha256}"
+
+
+def _hash_file(fileobj: IO[bytes]) -> tuple:
+    digest = hashlib.sha256()
+    size = 0
+    fileobj.seek(0)
+    while chunk := fileobj.read(HASH_CHUNK_BYTES):
+        digest.update(chunk)
+        size += len(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest(), size
+
+
+def min_field_confidence(fields):
+    """SQL: lowest confidence among the fields with a value (indexed for documents in review)."""
+    return func.docai_min_field_confidence(fields, type_=Float)
+
+
+_PLAIN_NUMBER = re.compile(r"\d[\d,]*(\.\d+)?")
+
+
+def low_confidence_fields(document: Document, threshold: float) -> List[str]:
+    """Fields the model found a value for with confidence under ``threshold``."""
+    return sorted(
+        name for name, entry in (document.extracted_fields or {}).items()
+        if isinstance(entry, dict) and entry.get("value") is not None
+        and (entry.get("confidence") or 0.0) < threshold
+    )
+
+
+def _field_values(value: str) -> List[Any]:
+    """A searched value as the model may have returned it: as text, and as a number when numeric."""
+    values: List[Any] = [value]
+    # Plain amounts only: float() would also take "nan", "inf" or "1_000"
+    if not _PLAIN_NUMBER.fullmatch(value):
+        return values
+    number = float(value.replace(",", ""))
+    if not math.isfinite(number):
+        return values
+    values.append(int(number) if number.is_integer() else number)
+    return values
+
+
+async def _read_chunks(fileobj: IO[bytes]) -> AsyncIterator[bytes]:
+    while chunk := await asyncio.to_thread(fileobj.read, HASH_CHUNK_BYTES):
+        yield chunk
+
+
+@dataclass
+class StoredDocument:
+    document: Document
+    deduplicated: bool   # content was already stored; nothing was uploaded
+
+
+class DocumentService:
+    """Service for deal documents (SOW, PO, handover) in file storage.
+
+    Files are stored once per content: each document points at a
+    ``DocumentBlob`` keyed by the SHA-256 of its bytes.
+    """
+
+    def __init__(self, db: AsyncSession, storage: Optional[StorageBackend] = None):
+        self.db = db
+        self.storage = storage or get_storage()
+
+    async def get_document(self, document_id: int) -> Optional[Document]:
+        """Get a document by ID."""
+        return await self.db.get(Document, document_id)
+
+    async def ocr_pages_done(self, document: Document) -> Optional[int]:
+        """Pages OCR'd so far; None until the page count is known."""
+        if document.page_count is None:
+            return None
+        if document.extraction_status not in (ExtractionStatus.pending, ExtractionStatus.ocr_running):
+            return document.page_count if document.ocr_text is not None else 0
+        done = await self.db.execute(
+            select(func.coalesce(func.sum(DocumentOcrRange.last_page - DocumentOcrRange.first_page + 1), 0))
+            .where(DocumentOcrRange.document_id == document.id, DocumentOcrRange.text.isnot(None))
+        )
+        return done.scalar_one()
+
+    async def review_queue(
+        self,
+        low_confidence: bool = False,
+        threshold: Optional[float] = None,
+        opportunity_id: Optional[int] = None,
+        page: int = 1,
+        page_size: int = 50,
+    ) -> List[Document]:
+        """Documents awaiting review, oldest extraction first.
+
+        With ``low_confidence``, only those with a field under ``threshold``
+        (default docai_min_confidence_threshold): a range scan of the review
+        index on each document's weakest field.
+        """
+        query = select(Document).where(text(IN_REVIEW))
+        if low_confidence:
+            threshold = settings.docai_min_confidence_threshold if threshold is None else threshold
+            query = query.where(min_field_confidence(Document.extracted_fields) < threshold)
+        if opportunity_id is not None:
+            query = query.where(Document.opportunity_id == opportunity_id)
+        query = (
+            query.order_by(Document.extraction_completed_at, Document.id)
+            .offset((page - 1) * page_size)
+            .limit(page_size)
+        )
+        return list((await self.db.execute(query)).scalars().all())
+
+    async def find_by_field(self, field_name: str, value: str, limit: int = 50) -> List[Document]:
+        """Documents whose extraction found ``value`` for ``field_name``, newest first.
+
+        Matches by JSONB containment, which the GIN index on
+        ``extracted_fields`` answers without reading other documents.
+        """
+        matches = [
+            Document.extracted_fields.contains({field_name: {"value": candidate}})
+            for candidate in _field_values(value.strip())
+        ]
+        result = await self.db.execute(
+            select(Document)
+            .where(or_(*matches))
+            .order_by(Document.uploaded_at.desc(), Document.id.desc())
+            .limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def _lock_blob(self, sha256: str) -> Optional[DocumentBlob]:
+        # FOR NO KEY UPDATE keeps a concurrent purge from deleting the blob
+        # (and its stored object) between this lookup and the referencing
+        # insert. It is the lock the insert's ref_count trigger takes anyway:
+        # a share lock here would let two uploads of the same content each
+        # hold one and then deadlock upgrading it
+        result = await self.db.execute(
+            select(DocumentBlob)
+            .where(DocumentBlob.sha256 == sha256)
+            .with_for_update(key_share=True)
+            .execution_options(populate_existing=True)
+        )
+        return result.scalar_one_or_none()
+
+    async def store_document(
+        self,
+        opportunity_id: int,
+        document_type: DocumentType,
+        fileobj: IO[bytes],
+        filename: str,
+        mime_type: Optional[str],
+        user: User,
+    ) -> StoredDocument:
+        """Store an uploaded file for a deal, skipping the upload when its content is already stored.
+
+        The spooled upload is hashed locally first so that a duplicate costs
+        one disk read and no network transfer.
+        """
+        # Read before the rollback below expires objects loaded on this session (the request's user)
+        user_id = user.id
+        sha256, size = await asyncio.to_thread(_hash_file, fileobj)
+        try:
+            blob = await self._lock_blob(sha256)
+            deduplicated = blob is not None and blob.ref_count > 0
+            if blob is None:
+                # Don't hold a transaction open for the upload
+                await self.db.rollback()
+            if not deduplicated:
+                # An unreferenced blob's object may already be purged; the
+                # row lock keeps a purge off it while the object is put back
+                await self.storage.upload_stream(
+                    _read_chunks(fileobj),
+                    blob_key(sha256),
+                    content_type=mime_type or "application/octet-stream",
+                    metadata={"sha256": sha256},
+                )
+                await self.db.execute(
+                    insert(DocumentBlob)
+                    .values(sha256=sha256, s3_key=blob_key(sha256), size_bytes=size, mime_type=mime_type)
+                    .on_conflict_do_nothing(index_elements=[DocumentBlob.sha256])
+                )
+                blob = await self._lock_blob(sha256)
+
+            document = Document(
+                opportunity_id=opportunity_id,
+                document_type=document_type,
+                original_filename=filename,
+                s3_key=blob.s3_key,
+                content_sha256=sha256,
+                file_size_bytes=size,
+                mime_type=mime_type,
+                uploaded_by_id=user_id,
+            )
+            self.db.add(document)
+            await self.db.commit()
+            await self.db.refresh(document)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error storing document", opportunity_id=opportunity_id, filename=filename, error=str(e))
+            raise
+
+        logger.info(
+            "Document stored",
+            document_id=document.id,
+            opportunity_id=opportunity_id,
+            sha256=sha256,
+            bytes=size,
+            deduplicated=deduplicated,
+        )
+        return StoredDocument(document=document, deduplicated=deduplicated)
+
+    async def delete_document(self, document: Document) -> None:
+        """Delete a document, and its file once no other document shares it."""
+        document_id, sha256, s3_key = document.id, document.content_sha256, document.s3_key
+        try:
+            await self.db.delete(document)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error deleting document", document_id=document_id, error=str(e))
+            raise
+
+        try:
+            if sha256 is None:
+                # Uploaded before content addressing: the key is the document's own
+                await self.storage.delete_file(s3_key)
+            else:
+                await self.purge_blob(sha256)
+        except Exception as e:
+            # The document is gone either way; an unpurged blob is retried by purge_unreferenced_blobs
+            logger.warning("Document file not removed", document_id=document_id, s3_key=s3_key, error=str(e))
+        logger.info("Document deleted", document_id=document_id, sha256=sha256)
+
+    async def purge_blob(self, sha256: str) -> bool:
+        """Delete a blob and its stored object if nothing references it any more."""
+        try:
+            result = await self.db.execute(
+                select(DocumentBlob)
+                .where(DocumentBlob.sha256 == sha256, DocumentBlob.ref_count == 0)
+                .with_for_update(skip_locked=True)
+                .execution_options(populate_existing=True)
+            )
+            blob = result.scalar_one_or_none()
+            if blob is None:
+                await self.db.rollback()
+                return False
+            # The row lock is held until the object is gone, so an upload
+            # of the same content waits and then stores it afresh
+            await self.storage.delete_file(blob.s3_key)
+            await self.db.delete(blob)
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error purging document blob", sha256=sha256, error=str(e))
+            raise
+
+        logger.info("Document blob purged", sha256=sha256)
+        return True
+
+    async def purge_unreferenced_blobs(self, limit: int = 100) -> int:
+        """Purge blobs left unreferenced, e.g. by opportunity deletes cascading to documents."""
+        result = await self.db.execute(
+            select(DocumentBlob.sha256).where(DocumentBlob.ref_count == 0).limit(limit)
+        )
+        candidates: List[str] = list(result.scalars())
+        await self.db.rollback()
+        purged = 0
+        for sha256 in candidates:
+            purged += await self.purge_blob(sha256)
+        return purged
+
+    async def open_content(self, document: Document, range_header: Optional[str] = None) -> ObjectStream:
+        """Open a document's file for streaming, honouring a single-range Range header."""
+        stream = await self.storage.stream_file(document.s3_key, parse_byte_range(range_header))
+        logger.info(
+            "Document content opened",
+            document_id=document.id,
+            bytes=stream.content_length,
+            range=stream.content_range,
+        )
+        return stream
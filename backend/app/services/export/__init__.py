@@ -0,0 +1,9 @@
+from .columns import COLUMNS, DEFAULT_COLUMNS, ExportRequestError
+from .service import PipelineExport
+
+__all__ = [
+    "COLUMNS",
+    "DEFAULT_COLUMNS",
+    "ExportRequestError",
+    "PipelineExport",
+]
@@ -0,0 +1,109 @@
+"""
+Exportable pipeline columns.
+
+Keys follow the pipeline grid's field names so the grid's column state and
+filter model can be sent to the export unchanged.
+"""
+
+import enum
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple, Type
+
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.elements import ColumnElement
+
+from ...models.account import Account
+from ...models.opportunity import (
+    DealStage,
+    FundingType,
+    GtmMotion,
+    HealthStatus,
+    Opportunity,
+    Program,
+    SolutionArea,
+)
+from ...models.territory import Territory
+from ...models.user import User
+
+TEXT = "text"
+NUMBER = "number"
+DATE = "date"
+DATETIME = "datetime"
+BOOLEAN = "boolean"
+ENUM = "enum"
+
+Owner = aliased(User, name="owner")
+
+
+@dataclass(frozen=True)
+class ExportColumn:
+    key: str
+    header: str
+    expression: ColumnElement
+    kind: str
+    width: int = 14                                  # XLSX column width, in characters
+    enum_type: Optional[Type[enum.Enum]] = None
+
+
+def _enum(key: str, header: str, column, enum_type: Type[enum.Enum], width: int = 14) -> ExportColumn:
+    return ExportColumn(key, header, column, ENUM, width, enum_type)
+
+
+COLUMNS: Tuple[ExportColumn, ...] = (
+    ExportColumn("deal_id", "Deal ID", Opportunity.id, NUMBER, 10),
+    ExportColumn("account_name", "Account Name", Account.name, TEXT, 30),
+    ExportColumn("opportunity_name", "Opportunity", Opportunity.name, TEXT, 36),
+    _enum("sales_stage", "Stage", Opportunity.stage, DealStage),
+    ExportColumn(
+        "days_in_stage",
+        "Days",
+        cast(func.floor(func.extract("epoch", func.now() - Opportunity.stage_entered_at) / 86400), Integer),
+        NUMBER,
+        8,
+    ),
+    ExportColumn("seller", "Seller", func.concat(Owner.first_name, " ", Owner.last_name), TEXT, 20),
+    ExportColumn("territory", "Territory", Territory.name, TEXT, 16),
+    ExportColumn("deal_value", "Deal Value", Opportunity.deal_value, NUMBER),
+    ExportColumn("currency_code", "Currency", Opportunity.currency_code, TEXT, 9),
+    ExportColumn("deal_value_sgd", "Deal Value (SGD)", Opportunity.deal_value_sgd, NUMBER, 16),
+    _enum("funding_type", "Funding Type", Opportunity.funding_type, FundingType),
+    _enum("program", "Program", Opportunity.program, Program, 10),
+    _enum("gtm_motion", "GTM Motion", Opportunity.gtm_motion, GtmMotion, 16),
+    _enum("solution_area", "Solution Area", Opportunity.solution_area, SolutionArea),
+    _enum("health_status", "Health", Opportunity.health_status, HealthStatus, 10),
+    ExportColumn("ace_id", "ACE ID", Opportunity.ace_id, TEXT, 18),
+    ExportColumn("map_status", "MAP Status", Opportunity.map_status, TEXT),
+    ExportColumn("po_id", "PO ID", Opportunity.po_id, TEXT, 18),
+    ExportColumn("po_value_sgd", "PO Value (SGD)", Opportunity.po_value_sgd, NUMBER, 16),
+    ExportColumn("expected_close_date", "Expected Close", Opportunity.expected_close_date, DATE),
+    ExportColumn("po_received_date", "PO Received", Opportunity.po_received_date, DATE),
+    ExportColumn("next_action", "Next Action", Opportunity.next_action, TEXT, 40),
+    ExportColumn("notes", "Notes", Opportunity.notes, TEXT, 40),
+    ExportColumn("is_active", "Active", Opportunity.is_active, BOOLEAN, 8),
+    ExportColumn("created_at", "Created", Opportunity.created_at, DATETIME, 18),
+    ExportColumn("updated_at", "Last Updated", Opportunity.updated_at, DATETIME, 18),
+)
+
+COLUMNS_BY_KEY: Dict[str, ExportColumn] = {column.key: column for column in COLUMNS}
+
+DEFAULT_COLUMNS: Tuple[str, ...] = (
+    "deal_id", "account_name", "opportunity_name", "sales_stage", "days_in_stage",
+    "seller", "territory", "deal_value", "currency_code", "deal_value_sgd",
+    "funding_type", "program", "ace_id", "po_id", "expected_close_date", "next_action",
+)
+
+
+class ExportRequestError(ValueError):
+    """The requested columns, filters or sort cannot be applied."""
+    pass
+
+
+def resolve_columns(keys: Optional[List[str]]) -> List[ExportColumn]:
+    """Column projection in the requested order (the default set when none is given)."""
+    if not keys:
+        return [COLUMNS_BY_KEY[key] for key in DEFAULT_COLUMNS]
+    unknown = [key for key in keys if key not in COLUMNS_BY_KEY]
+    if unknown:
+        raise ExportRequestError(f"Unknown export columns: {', '.join(unknown)}")
+    return [COLUMNS_BY_KEY[key] for key in dict.fromkeys(keys)]
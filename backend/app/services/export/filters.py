@@ -0,0 +1,180 @@
+"""
+Translate the pipeline grid's filter and sort models into SQL.
+
+The filter model is the AG Grid shape, keyed by column:
+
+    {"deal_value_sgd": {"filterType": "number", "type": "greaterThan", "filter": 100000},
+     "sales_stage": {"filterType": "set", "values": ["proposal", "negotiation"]},
+     "account_name": {"filterType": "text", "operator": "OR", "conditions": [...]}}
+
+Values are always bound parameters; column keys are checked against the
+export column registry.
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import and_, false, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from .columns import (
+    BOOLEAN,
+    COLUMNS_BY_KEY,
+    DATE,
+    DATETIME,
+    ENUM,
+    NUMBER,
+    TEXT,
+    ExportColumn,
+    ExportRequestError,
+)
+
+MAX_SET_VALUES = 1000
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _blank(column: ExportColumn) -> ColumnElement:
+    if column.kind == TEXT:
+        return or_(column.expression.is_(None), column.expression == "")
+    return column.expression.is_(None)
+
+
+def _enum_member(column: ExportColumn, value: Any):
+    # Accept the member value shown in the grid ("MAP") or its name ("map")
+    for member in column.enum_type:
+        if value == member.value or value == member.name:
+            return member
+    raise ExportRequestError(f"Invalid value for {column.key}: {value!r}")
+
+
+def _operand(column: ExportColumn, value: Any) -> Any:
+    if value is None:
+        raise ExportRequestError(f"Missing filter value for {column.key}")
+    try:
+        if column.kind == NUMBER:
+            return float(value)
+        if column.kind in (DATE, DATETIME):
+            # Grid date filters send "YYYY-MM-DD HH:MM:SS"
+            parsed = datetime.fromisoformat(str(value))
+            if column.kind == DATE:
+                return parsed.date()
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+        if column.kind == BOOLEAN:
+            if isinstance(value, bool):
+                return value
+            return {"true": True, "false": False}[str(value).lower()]
+        if column.kind == ENUM:
+            return _enum_member(column, value)
+    except (TypeError, ValueError, KeyError):
+        raise ExportRequestError(f"Invalid value for {column.key}: {value!r}")
+    return str(value)
+
+
+def _text_condition(column: ExportColumn, kind: str, value: Any) -> ColumnElement:
+    expression = column.expression
+    term = _escape_like(str(_operand(column, value)))
+    if kind == "equals":
+        return expression.ilike(term, escape="\\")
+    if kind == "notEqual":
+        return or_(expression.is_(None), expression.not_ilike(term, escape="\\"))
+    if kind == "contains":
+        return expression.ilike(f"%{term}%", escape="\\")
+    if kind == "notContains":
+        return or_(expression.is_(None), expression.not_ilike(f"%{term}%", escape="\\"))
+    if kind == "startsWith":
+        return expression.ilike(f"{term}%", escape="\\")
+    if kind == "endsWith":
+        return expression.ilike(f"%{term}", escape="\\")
+    raise ExportRequestError(f"Unsupported text filter for {column.key}: {kind}")
+
+
+def _range_condition(column: ExportColumn, kind: str, model: Dict[str, Any]) -> ColumnElement:
+    expression = column.expression
+    if column.kind in (DATE, DATETIME):
+        value, value_to = model.get("dateFrom"), model.get("dateTo")
+    else:
+        value, value_to = model.get("filter"), model.get("filterTo")
+
+    if kind == "inRange":
+        return expression.between(_operand(column, value), _operand(column, value_to))
+    operand = _operand(column, value)
+    if kind == "equals":
+        return expression == operand
+    if kind == "notEqual":
+        return or_(expression.is_(None), expression != operand)
+    if kind == "lessThan":
+        return expression < operand
+    if kind == "lessThanOrEqual":
+        return expression <= operand
+    if kind == "greaterThan":
+        return expression > operand
+    if kind == "greaterThanOrEqual":
+        return expression >= operand
+    raise ExportRequestError(f"Unsupported filter for {column.key}: {kind}")
+
+
+def _condition(column: ExportColumn, model: Dict[str, Any]) -> ColumnElement:
+    if not isinstance(model, dict):
+        raise ExportRequestError(f"Invalid filter for {column.key}")
+
+    conditions = model.get("conditions")
+    if conditions is not None:
+        operator = str(model.get("operator", "AND")).upper()
+        if operator not in ("AND", "OR") or not isinstance(conditions, list):
+            raise ExportRequestError(f"Invalid combined filter for {column.key}")
+        parts = [_condition(column, condition) for condition in conditions]
+        return (and_ if operator == "AND" else or_)(*parts)
+
+    if model.get("filterType") == "set":
+        values = model.get("values")
+        if not isinstance(values, list) or len(values) > MAX_SET_VALUES:
+            raise ExportRequestError(f"Invalid set filter for {column.key}")
+        present = [value for value in values if value is not None]
+        # An empty selection matches nothing, as in the grid
+        condition = column.expression.in_([_operand(column, value) for value in present]) if present else false()
+        return or_(condition, column.expression.is_(None)) if len(present) < len(values) else condition
+
+    kind = model.get("type") or "equals"
+    if kind == "blank":
+        return _blank(column)
+    if kind == "notBlank":
+        return ~_blank(column)
+    if column.kind == TEXT:
+        return _text_condition(column, kind, model.get("filter"))
+    if column.kind in (ENUM, BOOLEAN):
+        operand = _operand(column, model.get("filter"))
+        if kind == "equals":
+            return column.expression == operand
+        if kind == "notEqual":
+            return or_(column.expression.is_(None), column.expression != operand)
+        raise ExportRequestError(f"Unsupported filter for {column.key}: {kind}")
+    return _range_condition(column, kind, model)
+
+
+def filter_conditions(filter_model: Optional[Dict[str, Any]]) -> List[ColumnElement]:
+    """WHERE conditions for a grid filter model (filters on any export column, shown or not)."""
+    conditions: List[ColumnElement] = []
+    for key, model in (filter_model or {}).items():
+        column = COLUMNS_BY_KEY.get(key)
+        if column is None:
+            raise ExportRequestError(f"Cannot filter on unknown column: {key}")
+        conditions.append(_condition(column, model))
+    return conditions
+
+
+def sort_clauses(sort_model: Optional[List[Dict[str, Any]]]) -> List[ColumnElement]:
+    """ORDER BY clauses for a grid sort model; the deal id always breaks ties."""
+    clauses: List[ColumnElement] = []
+    for entry in sort_model or []:
+        column = COLUMNS_BY_KEY.get(entry.get("colId"))
+        direction = entry.get("sort")
+        if column is None or direction not in ("asc", "desc"):
+            raise ExportRequestError(f"Invalid sort: {entry!r}")
+        expression = column.expression
+        clauses.append(expression.asc().nulls_last() if direction == "asc" else expression.desc().nulls_last())
+    clauses.append(COLUMNS_BY_KEY["deal_id"].expression.asc())
+    return clauses
+
@@ -0,0 +1,131 @@
+import uuid
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import structlog
+from sqlalchemy import Select, select
+
+from ...core import database
+from ...core.config import settings
+from ...models.account import Account
+from ...models.opportunity import Opportunity
+from ...models.territory import Territory
+from ...models.user import User
+from ...schemas.export_schemas import ExportUploadSchema
+from ..storage import StorageBackend
+from .columns import ExportColumn, ExportRequestError, Owner, resolve_columns
+from .filters import filter_conditions, sort_clauses
+from .writers import WRITERS
+
+logger = structlog.get_logger()
+
+
+class PipelineExport:
+    """
+    One streaming pipeline export.
+
+    The query is built (and the request validated) up front, so a bad
+    filter is reported before any bytes are sent. ``stream()`` then reads
+    the rows through a server-side cursor on its own session — the
+    response outlives the request's session — and hands each batch to the
+    writer as it arrives.
+    """
+
+    def __init__(
+        self,
+        user: User,
+        export_format: str = "xlsx",
+        columns: Optional[List[str]] = None,
+        filter_model: Optional[Dict[str, Any]] = None,
+        sort_model: Optional[List[Dict[str, Any]]] = None,
+        include_inactive: bool = False,
+    ):
+        writer_class = WRITERS.get(export_format)
+        if writer_class is None:
+            raise ExportRequestError(f"Unsupported export format: {export_format}")
+        self.user = user
+        self.writer_class = writer_class
+        self.columns: List[ExportColumn] = resolve_columns(columns)
+        self.query = self._build_query(filter_model, sort_model, include_inactive)
+        self.filename = self._filename()
+        self.rows_written = 0
+
+    def _build_query(
+        self,
+        filter_model: Optional[Dict[str, Any]],
+        sort_model: Optional[List[Dict[str, Any]]],
+        include_inactive: bool,
+    ) -> Select:
+        query = (
+            select(*(column.expression.label(column.key) for column in self.columns))
+            .select_from(Opportunity)
+            .join(Account, Account.id == Opportunity.account_id)
+            .join(Owner, Owner.id == Opportunity.owner_id)
+            .outerjoin(Territory, Territory.id == Opportunity.territory_id)
+            .where(*filter_conditions(filter_model))
+            .order_by(*sort_clauses(sort_model))
+        )
+        if not include_inactive:
+            query = query.where(Opportunity.is_active.is_(True))
+        return query
+
+    @property
+    def media_type(self) -> str:
+        return self.writer_class.media_type
+
+    def _filename(self) -> str:
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M")
+        return f"pipeline-{stamp}.{self.writer_class.extension}"
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """Yield the file as it is written; memory is bounded by one fetch batch."""
+        writer = self.writer_class(self.columns)
+        started = datetime.now(timezone.utc)
+        sent = 0
+
+        chunk = writer.begin()
+        sent += len(chunk)
+        yield chunk
+        async with database.AsyncSessionLocal() as db:
+            result = await db.stream(
+                self.query.execution_options(yield_per=settings.export_batch_rows)
+            )
+            async for batch in result.partitions():
+                self.rows_written += len(batch)
+                chunk = writer.write_rows(batch)
+                if chunk:
+                    sent += len(chunk)
+                    yield chunk
+        chunk = writer.finish()
+        sent += len(chunk)
+        yield chunk
+
+        logger.info(
+            "Pipeline export streamed",
+            user_id=self.user.id,
+            format=self.writer_class.extension,
+            columns=len(self.columns),
+            rows=self.rows_written,
+            bytes=sent,
+            duration_seconds=round((datetime.now(timezone.utc) - started).total_seconds(), 3),
+        )
+
+    async def upload(self, storage: StorageBackend) -> ExportUploadSchema:
+        """Stream the file straight into storage (S3 multipart) and return a presigned download link."""
+        s3_key = f"exports/{self.user.id}/{uuid.uuid4()}/{self.filename}"
+        result = await storage.upload_stream(
+            self.stream(),
+            s3_key,
+            content_type=self.media_type,
+            metadata={"exported-by": str(self.user.id)},
+        )
+        expires_in = settings.aws_s3_presigned_url_expiry
+        url = await storage.generate_presigned_url(s3_key, expiration=expires_in)
+        return ExportUploadSchema(
+            filename=self.filename,
+            s3_key=s3_key,
+            download_url=url,
+            expires_in_seconds=expires_in,
+            rows=self.rows_written,
+            size_bytes=result["size_bytes"],
+        )
@@ -0,0 +1,271 @@
+"""
+Incremental XLSX and CSV writers.
+
+Each writer turns batches of rows into bytes that can be sent immediately:
+``begin()``, ``write_rows()`` per batch, then ``finish()``. Nothing but the
+current batch is held in memory.
+
+The XLSX writer emits the SpreadsheetML package itself: the worksheet is
+deflated straight into a ZIP stream (data descriptors, no seeking) with
+inline strings, so no shared-string table or workbook object has to be kept
+until the end. openpyxl's write-only mode still assembles the package in a
+temporary file at save time, which delays the first byte until every row is
+written.
+"""
+
+import csv
+import enum
+import io
+import re
+import zipfile
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Sequence
+from xml.sax.saxutils import escape
+
+from .columns import BOOLEAN, DATE, DATETIME, ENUM, NUMBER, ExportColumn
+
+# Characters XML 1.0 does not allow, even escaped
+_ILLEGAL_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+# Spreadsheet apps evaluate cells starting with these as formulas
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+_EXCEL_EPOCH = datetime(1899, 12, 30)
+
+# Cell style indexes in styles.xml
+_STYLE_HEADER = 1
+_STYLE_DATE = 2
+_STYLE_DATETIME = 3
+_STYLE_NUMBER = 4
+
+
+def _plain(value) -> object:
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+class _Sink(io.RawIOBase):
+    """Unseekable byte sink that hands back whatever was written since the last take()."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._buffer += data
+        return len(data)
+
+    def take(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+
+class CsvExportWriter:
+    media_type = "text/csv; charset=utf-8"
+    extension = "csv"
+
+    def __init__(self, columns: Sequence[ExportColumn]):
+        self.columns = columns
+        self._text = io.StringIO()
+        self._csv = csv.writer(self._text)
+
+    def _drain(self) -> bytes:
+        data = self._text.getvalue().encode("utf-8")
+        self._text.seek(0)
+        self._text.truncate()
+        return data
+
+    def _cell(self, column: ExportColumn, value) -> object:
+        value = _plain(value)
+        if value is None:
+            return ""
+        if column.kind == BOOLEAN:
+            return "TRUE" if value else "FALSE"
+        if column.kind in (DATE, DATETIME):
+            return value.isoformat()
+        if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES):
+            return "'" + value
+        return value
+
+    def begin(self) -> bytes:
+        # BOM so Excel opens the file as UTF-8
+        self._text.write("\ufeff")
+        self._csv.writerow([column.header for column in self.columns])
+        return self._drain()
+
+    def write_rows(self, rows: Iterable[Sequence]) -> bytes:
+        columns = self.columns
+        self._csv.writerows(
+            [self._cell(column, value) for column, value in zip(columns, row)]
+            for row in rows
+        )
+        return self._drain()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    'Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" '
+    'Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="yyyy-mm-dd"/>'
+    '<numFmt numFmtId="165" formatCode="yyyy-mm-dd hh:mm"/>'
+    '</numFmts>'
+    '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+    '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="5">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="4" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+
+def _workbook(sheet_name: str) -> str:
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        f'<sheets><sheet name="{escape(sheet_name)}" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    )
+
+
+def _text_cell(value: str) -> str:
+    value = _ILLEGAL_XML.sub("", value)
+    return f'<c t="inlineStr"><is><t xml:space="preserve">{escape(value)}</t></is></c>'
+
+
+def _serial(value: datetime) -> float:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    delta = value - _EXCEL_EPOCH
+    return delta.days + delta.seconds / 86400
+
+
+class XlsxExportWriter:
+    media_type = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    extension = "xlsx"
+
+    def __init__(self, columns: Sequence[ExportColumn], sheet_name: str = "Pipeline"):
+        self.columns = columns
+        self.sheet_name = sheet_name
+        self._sink = _Sink()
+        self._zip = zipfile.ZipFile(self._sink, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=6)
+        self._sheet = None
+
+    def _cell(self, column: ExportColumn, value) -> str:
+        if value is None:
+            return "<c/>"
+        kind = column.kind
+        if kind == NUMBER:
+            if isinstance(value, float):
+                return f'<c s="{_STYLE_NUMBER}"><v>{value!r}</v></c>'
+            return f"<c><v>{value}</v></c>"
+        if kind == BOOLEAN:
+            return f'<c t="b"><v>{int(bool(value))}</v></c>'
+        if kind == DATE and isinstance(value, date):
+            return f'<c s="{_STYLE_DATE}"><v>{(value - _EXCEL_EPOCH.date()).days}</v></c>'
+        if kind == DATETIME and isinstance(value, datetime):
+            return f'<c s="{_STYLE_DATETIME}"><v>{_serial(value)!r}</v></c>'
+        if kind == ENUM:
+            value = _plain(value)
+        return _text_cell(str(value))
+
+    def begin(self) -> bytes:
+        for name, content in (
+            ("[Content_Types].xml", _CONTENT_TYPES),
+            ("_rels/.rels", _ROOT_RELS),
+            ("xl/workbook.xml", _workbook(self.sheet_name)),
+            ("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS),
+            ("xl/styles.xml", _STYLES),
+        ):
+            self._zip.writestr(name, content)
+
+        self._sheet = self._zip.open("xl/worksheets/sheet1.xml", "w", force_zip64=True)
+        widths = "".join(
+            f'<col min="{index}" max="{index}" width="{column.width}" customWidth="1"/>'
+            for index, column in enumerate(self.columns, start=1)
+        )
+        header = "".join(
+            f'<c s="{_STYLE_HEADER}" t="inlineStr"><is><t>{escape(column.header)}</t></is></c>'
+            for column in self.columns
+        )
+        self._sheet.write((
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+            '<sheetViews><sheetView workbookViewId="0">'
+            '<pane ySplit="1" topLeftCell="A2" activePane="bottomLeft" state="frozen"/>'
+            '</sheetView></sheetViews>'
+            f'<cols>{widths}</cols>'
+            f'<sheetData><row>{header}</row>'
+        ).encode("utf-8"))
+        return self._sink.take()
+
+    def write_rows(self, rows: Iterable[Sequence]) -> bytes:
+        columns = self.columns
+        cell = self._cell
+        parts: List[str] = []
+        for row in rows:
+            parts.append("<row>")
+            parts.extend(cell(column, value) for column, value in zip(columns, row))
+            parts.append("</row>")
+        self._sheet.write("".join(parts).encode("utf-8"))
+        return self._sink.take()
+
+    def finish(self) -> bytes:
+        self._sheet.write(b"</sheetData></worksheet>")
+        self._sheet.close()
+        self._zip.close()
+        return self._sink.take()
+
+
+WRITERS = {
+    CsvExportWriter.extension: CsvExportWriter,
+    XlsxExportWriter.extension: XlsxExportWriter,
+}
@@ -0,0 +1,19 @@
+from .reader import ImportFileError
+from .service import (
+    ImportWizardService,
+    ImportJobRunner,
+    discard_expired_import_jobs,
+    job_to_schema,
+    start_import_job,
+    resume_interrupted_import_jobs,
+)
+
+__all__ = [
+    "ImportFileError",
+    "ImportWizardService",
+    "ImportJobRunner",
+    "discard_expired_import_jobs",
+    "job_to_schema",
+    "start_import_job",
+    "resume_interrupted_import_jobs",
+]
@@ -0,0 +1,224 @@
+"""
+Fuzzy account resolution for imports.
+
+Names are normalised (case, punctuation, accents and legal suffixes such as
+"Pte. Ltd." / "Sdn Bhd" removed), then compared only against accounts that
+share enough character trigrams — an inverted trigram index keeps this
+near-linear instead of comparing every row with every account. Very common
+trigrams are ignored for blocking so they do not pull in half the table.
+
+Each distinct import name gets a decision:
+
+    match      close enough to exactly one existing account
+    new        nothing similar — create an account
+    ambiguous  similar to one or more accounts but not decisively; held back
+
+Names that resolve to ``new`` are added to the index as provisional entries,
+so "NewCo" and "NewCo Pte Ltd" in the same file create a single account.
+"""
+
+import heapq
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+MATCH = "match"
+NEW = "new"
+AMBIGUOUS = "ambiguous"
+
+MATCH_THRESHOLD = 0.90
+AMBIGUOUS_THRESHOLD = 0.70
+# Runner-up must trail the best candidate by this much for a confident match
+MATCH_MARGIN = 0.05
+
+# Blocking: candidates must share this fraction of the query's trigrams
+MIN_SHARED_GRAMS = 0.3
+MAX_CANDIDATES = 20
+# Only the best few candidates by trigram overlap get the (slower) full score
+SCORED_CANDIDATES = 3
+# Trigrams present in more than this share of entries are not used for blocking
+STOP_GRAM_RATIO = 0.05
+STOP_GRAM_MIN_POSTINGS = 50
+# Words in more than this share of names ("solutions", "bank", "asia") are
+# generic: two names must also be similar once generic words are dropped
+GENERIC_TOKEN_RATIO = 0.01
+GENERIC_TOKEN_MIN_COUNT = 20
+
+LEGAL_SUFFIXES = {
+    "pte", "ltd", "limited", "private", "inc", "incorporated", "corp", "corporation",
+    "co", "company", "llc", "llp", "plc", "pty", "sdn", "bhd", "berhad", "gmbh",
+    "ag", "sa", "bv", "kk", "tbk", "pt", "the",
+}
+
+
+def normalize_account_name(name: str) -> str:
+    """Canonical comparison key: 'ACME Pte. Ltd.' -> 'acme'."""
+    folded = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode("ascii")
+    folded = folded.lower().replace("&", " and ")
+    # Join dotted initials ("A.C.M.E.") before punctuation becomes whitespace
+    folded = re.sub(r"\b([a-z])\.(?=[a-z]\b)", r"\1", folded)
+    tokens = re.sub(r"[^a-z0-9]+", " ", folded).split()
+    significant = [token for token in tokens if token not in LEGAL_SUFFIXES]
+    return " ".join(significant or tokens)
+
+
+def _trigrams(key: str) -> Set[str]:
+    padded = f"#{key.replace(' ', '')}#"
+    if len(padded) < 3:
+        return {padded}
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _dice(grams: Set[str], other: Set[str]) -> float:
+    return 2 * len(grams & other) / (len(grams) + len(other))
+
+
+@dataclass
+class AccountDecision:
+    name: str
+    decision: str
+    score: float
+    account_id: Optional[int] = None        # set for existing-account matches
+    new_group: Optional[int] = None         # set when the name maps to an account to create
+    candidates: List[Tuple[str, float]] = field(default_factory=list)
+
+
+@dataclass
+class _Entry:
+    key: str
+    grams: Set[str]
+    display_name: str
+    account_id: Optional[int] = None
+    new_group: Optional[int] = None
+
+
+class AccountMatcher:
+    """Trigram-blocked fuzzy matcher over existing (and provisional new) accounts."""
+
+    def __init__(self, accounts: Iterable[Tuple[int, str]], incoming: Iterable[str] = ()):
+        self._entries: List[_Entry] = []
+        self._by_key: Dict[str, int] = {}
+        self._postings: Dict[str, List[int]] = {}
+        self._new_groups = 0
+        accounts = list(accounts)
+        # Word frequencies over existing and incoming names decide what is generic,
+        # independent of the order names are resolved in
+        keys = [normalize_account_name(name) for _, name in accounts]
+        keys.extend(normalize_account_name(name) for name in incoming)
+        self._token_counts: Counter = Counter(token for key in keys for token in set(key.split()))
+        self._generic_limit = max(GENERIC_TOKEN_MIN_COUNT, int(len(keys) * GENERIC_TOKEN_RATIO))
+        # Lowest id wins when existing accounts already collide on the same key
+        for account_id, name in sorted(accounts):
+            self._add(_Entry(
+                key=normalize_account_name(name),
+                grams=set(),
+                display_name=name,
+                account_id=account_id,
+            ))
+
+    def _add(self, entry: _Entry) -> None:
+        if entry.key in self._by_key:
+            return
+        entry.grams = _trigrams(entry.key)
+        idx = len(self._entries)
+        self._entries.append(entry)
+        self._by_key[entry.key] = idx
+        for gram in entry.grams:
+            self._postings.setdefault(gram, []).append(idx)
+
+    def _stop_gram_limit(self) -> int:
+        return max(STOP_GRAM_MIN_POSTINGS, int(len(self._entries) * STOP_GRAM_RATIO))
+
+    def _candidates(self, grams: Set[str]) -> List[int]:
+        limit = self._stop_gram_limit()
+        hits: Counter = Counter()
+        usable = 0
+        for gram in grams:
+            postings = self._postings.get(gram)
+            if not postings or len(postings) > limit:
+                continue
+            usable += 1
+            hits.update(postings)
+        if not hits:
+            return []
+        needed = max(1, int(usable * MIN_SHARED_GRAMS))
+        # Ties break on entry order, not set iteration order (string hashing differs per
+        # process), so a dry run and the commit that follows resolve names identically
+        top = heapq.nsmallest(MAX_CANDIDATES, hits.items(), key=lambda hit: (-hit[1], hit[0]))
+        return [idx for idx, count in top if count >= needed]
+
+    def _core(self, key: str) -> str:
+        return " ".join(token for token in key.split() if self._token_counts[token] <= self._generic_limit)
+
+    @staticmethod
+    def _similarity(key: str, grams: Set[str], other_key: str, other_grams: Set[str]) -> float:
+        ratio = SequenceMatcher(None, key, other_key, autojunk=False).ratio()
+        return (_dice(grams, other_grams) + ratio) / 2
+
+    def _score(self, key: str, grams: Set[str], entry: _Entry) -> float:
+        # "Branch 1" vs "Branch 2": differing numbers mean different entities
+        if set(re.findall(r"\d+", key)) != set(re.findall(r"\d+", entry.key)):
+            return 0.0
+        score = self._similarity(key, grams, entry.key, entry.grams)
+        core, entry_core = self._core(key), self._core(entry.key)
+        if core and entry_core and (core != key or entry_core != entry.key):
+            score = min(score, self._similarity(core, _trigrams(core), entry_core, _trigrams(entry_core)))
+        return round(score, 4)
+
+    def resolve(self, name: str) -> AccountDecision:
+        """Decide match / new / ambiguous for one import name."""
+        key = normalize_account_name(name)
+        exact = self._by_key.get(key)
+        if exact is not None:
+            entry = self._entries[exact]
+            return AccountDecision(
+                name=name,
+                decision=MATCH if entry.account_id is not None else NEW,
+                score=1.0,
+                account_id=entry.account_id,
+                new_group=entry.new_group,
+            )
+
+        grams = _trigrams(key)
+        # score <= (dice + 1) / 2, so lower overlap can never reach AMBIGUOUS_THRESHOLD
+        overlaps = [(_dice(grams, self._entries[idx].grams), idx) for idx in self._candidates(grams)]
+        shortlist = sorted(
+            (overlap, idx) for overlap, idx in overlaps if overlap >= 2 * AMBIGUOUS_THRESHOLD - 1
+        )[-SCORED_CANDIDATES:]
+        scored = sorted(
+            ((self._score(key, grams, self._entries[idx]), idx) for _, idx in shortlist),
+            reverse=True,
+        )
+        candidates = [(self._entries[idx].display_name, score) for score, idx in scored if score > 0]
+        best_score, best_idx = scored[0] if scored else (0.0, -1)
+        runner_up = scored[1][0] if len(scored) > 1 else 0.0
+
+        if best_score >= MATCH_THRESHOLD and best_score - runner_up >= MATCH_MARGIN:
+            entry = self._entries[best_idx]
+            return AccountDecision(
+                name=name,
+                decision=MATCH if entry.account_id is not None else NEW,
+                score=best_score,
+                account_id=entry.account_id,
+                new_group=entry.new_group,
+                candidates=candidates,
+            )
+        if best_score >= AMBIGUOUS_THRESHOLD:
+            return AccountDecision(name=name, decision=AMBIGUOUS, score=best_score, candidates=candidates)
+
+        group = self._new_groups
+        self._new_groups += 1
+        self._add(_Entry(key=key, grams=grams, display_name=name, new_group=group))
+        return AccountDecision(name=name, decision=NEW, score=best_score, new_group=group, candidates=candidates)
+
+
+def resolve_account_names(
+    accounts: List[Tuple[int, str]],
+    names: List[str],
+) -> List[AccountDecision]:
+    """Resolve import names (in file order) against existing accounts — picklable for the process pool."""
+    matcher = AccountMatcher(accounts, names)
+    return [matcher.resolve(name) for name in names]
@@ -0,0 +1,67 @@
+"""
+Column mapping for 1CH_Unified_Deal_Tracker.xlsx (and CSV exports of it).
+
+Headers are matched case-insensitively after collapsing whitespace, so
+"Deal Value (SGD)" and "deal value  (sgd)" map to the same field.
+"""
+
+import re
+from typing import Dict, Iterable, Optional
+
+# Canonical import field -> accepted header labels
+FIELD_HEADERS: Dict[str, tuple] = {
+    "account_name": ("Account Name", "Account", "Customer", "Customer Name"),
+    "name": ("Opportunity", "Opportunity Name", "Deal Name", "Deal"),
+    "stage": ("Sales Stage", "Stage"),
+    "deal_value": ("Deal Value", "Deal Value (SGD)", "Amount", "Value"),
+    "currency_code": ("Currency", "Currency Code", "CCY"),
+    "funding_flag": ("Funding", "Funding Flag"),
+    "program": ("Funding Type", "Program", "AWS Program"),
+    "expected_close_date": ("Close Date", "Expected Close Date", "Expected Close"),
+    "ace_id": ("ACE ID", "ACE Opportunity ID"),
+    "po_id": ("PO ID", "PO Number", "PO No"),
+    "map_status": ("MAP Status",),
+    "owner_ref": ("Seller", "Owner", "Owner Email", "Account Executive"),
+    "territory_name": ("Territory", "Market"),
+    "notes": ("Notes", "Deal Notes"),
+    "next_action": ("Sales Action", "Next Action", "Weekly Sales Action"),
+}
+
+REQUIRED_FIELDS = ("account_name", "name")
+
+# The tracker has section headers on row 1 and column headers on row 2; scan a
+# few rows and take the one that maps the most known columns.
+HEADER_SCAN_ROWS = 5
+
+
+def _normalise_header(value: object) -> str:
+    return re.sub(r"\s+", " ", str(value)).strip().lower()
+
+
+_HEADER_LOOKUP: Dict[str, str] = {
+    _normalise_header(label): field
+    for field, labels in FIELD_HEADERS.items()
+    for label in labels
+}
+
+
+def map_header_row(cells: Iterable[object]) -> Dict[int, str]:
+    """Map column index -> canonical field for one candidate header row."""
+    mapping: Dict[int, str] = {}
+    for idx, cell in enumerate(cells):
+        if cell is None:
+            continue
+        field = _HEADER_LOOKUP.get(_normalise_header(cell))
+        # First occurrence wins (e.g. "Deal Value (SGD)" before "Deal Value (USD)")
+        if field and field not in mapping.values():
+            mapping[idx] = field
+    return mapping
+
+
+def missing_required(mapping: Dict[int, str]) -> Optional[str]:
+    """Return the first required field with no mapped column, if any."""
+    mapped = set(mapping.values())
+    for field in REQUIRED_FIELDS:
+        if field not in mapped:
+            return field
+    return None
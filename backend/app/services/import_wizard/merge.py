@@ -0,0 +1,430 @@
+"""
+Set-based merge of a staged batch into ``accounts`` and ``opportunities``.
+
+Every step is a single statement over the whole batch — there is no per-row
+round trip, so a 20k-row import costs a handful of joins. Account names are
+the exception: they are fuzzy-matched in Python (see ``account_matcher``) and
+the decisions written back in one UPDATE. Existing deals are
+matched by ACE ID, then PO ID, then account + name (case-insensitive); when a
+key occurs more than once in the file the last row wins. Matched rows whose
+content hash equals the existing deal's are marked ``unchanged`` and skipped. Lost deals arrive
+inactive and keep their current stage.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+from sqlalchemy import insert, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.account import Account
+from .account_matcher import AMBIGUOUS, MATCH, NEW, resolve_account_names
+from .pool import run_in_pool
+from .validation import RowError
+
+BATCH = "s.batch_id = :batch_id"
+
+CONVERT_TO_SGD = f"""
+    UPDATE import_staging_rows s
+    SET deal_value_sgd = CASE
+            WHEN s.currency_code = :base_currency THEN s.deal_value
+            ELSE s.deal_value / nullif(
+                (SELECT r.sgd_rate FROM currency_rates r WHERE r.currency_code = s.currency_code), 0)
+        END
+    WHERE {BATCH}
+"""
+
+FLAG_MISSING_FX_RATE = f"""
+    UPDATE import_staging_rows s
+    SET merge_action = 'error', error = 'missing_fx_rate'
+    WHERE {BATCH} AND s.deal_value_sgd IS NULL
+"""
+
+RESOLVE_OWNERS = f"""
+    UPDATE import_staging_rows s
+    SET owner_id = m.user_id
+    FROM (
+        SELECT DISTINCT ON (refs.ref) refs.ref, u.id AS user_id
+        FROM (
+            SELECT DISTINCT lower(owner_ref) AS ref
+            FROM import_staging_rows s
+            WHERE {BATCH} AND s.owner_ref IS NOT NULL
+        ) refs
+        JOIN users u
+          ON refs.ref IN (lower(u.email), lower(u.first_name || ' ' || u.last_name))
+        ORDER BY refs.ref, u.is_active DESC, u.id
+    ) m
+    WHERE {BATCH} AND lower(s.owner_ref) = m.ref
+"""
+
+RESOLVE_TERRITORIES = f"""
+    UPDATE import_staging_rows s
+    SET territory_id = t.id
+    FROM territories t
+    WHERE {BATCH} AND lower(t.name) = lower(s.territory_name)
+"""
+
+SELECT_ACCOUNT_NAMES = f"""
+    SELECT s.account_name
+    FROM import_staging_rows s
+    WHERE {BATCH} AND s.merge_action IS NULL
+    GROUP BY s.account_name
+    ORDER BY min(s.row_number)
+"""
+
+APPLY_ACCOUNT_DECISIONS = f"""
+    UPDATE import_staging_rows s
+    SET account_id = d.account_id,
+        account_decision = d.decision,
+        account_score = d.score,
+        merge_action = CASE WHEN d.decision = 'ambiguous' THEN 'error' END,
+        error = CASE WHEN d.decision = 'ambiguous' THEN 'ambiguous_account' END,
+        error_detail = d.detail
+    FROM unnest(
+        CAST(:names AS text[]),
+        CAST(:account_ids AS integer[]),
+        CAST(:decisions AS text[]),
+        CAST(:scores AS float8[]),
+        CAST(:details AS text[])
+    ) AS d(name, account_id, decision, score, detail)
+    WHERE {BATCH} AND s.merge_action IS NULL AND s.account_name = d.name
+"""
+
+# Keep the last row per match key within the file
+MARK_DUPLICATES_IN_FILE = f"""
+    UPDATE import_staging_rows s
+    SET merge_action = 'duplicate'
+    FROM (
+        SELECT id, row_number() OVER (
+            PARTITION BY CASE
+                WHEN ace_id IS NOT NULL THEN 'ace:' || lower(ace_id)
+                WHEN po_id IS NOT NULL THEN 'po:' || lower(po_id)
+                ELSE 'name:' || account_id || ':' || lower(name)
+            END
+            ORDER BY row_number DESC
+        ) AS rank
+        FROM import_staging_rows s
+        WHERE {BATCH} AND s.merge_action IS NULL
+    ) d
+    WHERE s.id = d.id AND d.rank > 1
+"""
+
+MATCH_BY_ACE_ID = f"""
+    UPDATE import_staging_rows s
+    SET opportunity_id = o.id
+    FROM (
+        SELECT DISTINCT ON (lower(ace_id)) id, lower(ace_id) AS key
+        FROM opportunities WHERE ace_id IS NOT NULL
+        ORDER BY lower(ace_id), id
+    ) o
+    WHERE {BATCH} AND s.merge_action IS NULL AND s.opportunity_id IS NULL
+      AND lower(s.ace_id) = o.key
+"""
+
+MATCH_BY_PO_ID = f"""
+    UPDATE import_staging_rows s
+    SET opportunity_id = o.id
+    FROM (
+        SELECT DISTINCT ON (lower(po_id)) id, lower(po_id) AS key
+        FROM opportunities WHERE po_id IS NOT NULL
+        ORDER BY lower(po_id), id
+    ) o
+    WHERE {BATCH} AND s.merge_action IS NULL AND s.opportunity_id IS NULL
+      AND lower(s.po_id) = o.key
+"""
+
+MATCH_BY_NAME = f"""
+    UPDATE import_staging_rows s
+    SET opportunity_id = o.id
+    FROM (
+        SELECT DISTINCT ON (account_id, lower(name)) id, account_id, lower(name) AS key
+        FROM opportunities
+        ORDER BY account_id, lower(name), id
+    ) o
+    WHERE {BATCH} AND s.merge_action IS NULL AND s.opportunity_id IS NULL
+      AND s.account_id = o.account_id AND lower(s.name) = o.key
+"""
+
+# Different keys in the file can still land on the same deal
+MARK_DUPLICATE_MATCHES = f"""
+    UPDATE import_staging_rows s
+    SET merge_action = 'duplicate'
+    FROM (
+        SELECT id, row_number() OVER (PARTITION BY opportunity_id ORDER BY row_number DESC) AS rank
+        FROM import_staging_rows s
+        WHERE {BATCH} AND s.merge_action IS NULL AND s.opportunity_id IS NOT NULL
+    ) d
+    WHERE s.id = d.id AND d.rank > 1
+"""
+
+CLASSIFY = f"""
+    UPDATE import_staging_rows s
+    SET merge_action = CASE WHEN s.opportunity_id IS NULL THEN 'insert' ELSE 'update' END
+    WHERE {BATCH} AND s.merge_action IS NULL
+"""
+
+RECORD_STAGE_CHANGES = f"""
+    INSERT INTO stage_events (opportunity_id, event_type, from_stage, to_stage, notes, created_by_id)
+    SELECT o.id, 'stage_change', o.stage, s.stage::dealstage, 'Spreadsheet import', :user_id
+    FROM import_staging_rows s
+    JOIN opportunities o ON o.id = s.opportunity_id
+    WHERE {BATCH} AND s.merge_action = 'update' AND s.is_active AND o.stage <> s.stage::dealstage
+"""
+
+# Business fields an update writes, with the value it writes. Where the
+# spreadsheet cell is blank the current value is kept (coalesce), and lost
+# deals keep their stage — the content hash below compares exactly these.
+WRITTEN_FIELDS = (
+    ("name", "s.name"),
+    ("account_id", "s.account_id"),
+    ("owner_id", "coalesce(s.owner_id, o.owner_id)"),
+    ("stage", "CASE WHEN s.is_active THEN s.stage::dealstage ELSE o.stage END"),
+    ("deal_value", "s.deal_value"),
+    ("currency_code", "s.currency_code"),
+    ("funding_type", "s.funding_type::fundingtype"),
+    ("program", "s.program::program"),
+    ("territory_id", "coalesce(s.territory_id, o.territory_id)"),
+    ("expected_close_date", "s.expected_close_date"),
+    ("ace_id", "coalesce(s.ace_id, o.ace_id)"),
+    ("po_id", "coalesce(s.po_id, o.po_id)"),
+    ("map_status", "coalesce(s.map_status, o.map_status)"),
+    ("notes", "coalesce(s.notes, o.notes)"),
+    ("next_action", "coalesce(s.next_action, o.next_action)"),
+    ("is_active", "s.is_active"),
+)
+
+
+def _comparable(column: str, expr: str) -> str:
+    # Float amounts compare at cent precision
+    return f"round(({expr})::numeric, 2)" if column == "deal_value" else expr
+
+
+def _row_hash(exprs) -> str:
+    return "md5(ROW(" + ", ".join(exprs) + ")::text)"
+
+
+INCOMING_HASH = _row_hash(_comparable(column, expr) for column, expr in WRITTEN_FIELDS)
+EXISTING_HASH = _row_hash(_comparable(column, f"o.{column}") for column, _ in WRITTEN_FIELDS)
+
+# Re-imports are mostly unchanged rows: skip them entirely
+MARK_UNCHANGED = f"""
+    UPDATE import_staging_rows s
+    SET merge_action = 'unchanged'
+    FROM opportunities o
+    WHERE {BATCH} AND s.merge_action = 'update' AND o.id = s.opportunity_id
+      AND {INCOMING_HASH} = {EXISTING_HASH}
+"""
+
+COUNT_ACTIONS = f"""
+    SELECT s.merge_action, count(*)
+    FROM import_staging_rows s
+    WHERE {BATCH}
+    GROUP BY s.merge_action
+"""
+
+FIELD_CHANGE_COUNTS = f"""
+    SELECT {", ".join(
+        f"count(*) FILTER (WHERE {_comparable(column, expr)} IS DISTINCT FROM {_comparable(column, 'o.' + column)}) AS {column}"
+        for column, expr in WRITTEN_FIELDS
+    )}
+    FROM import_staging_rows s
+    JOIN opportunities o ON o.id = s.opportunity_id
+    WHERE {BATCH} AND s.merge_action = 'update'
+"""
+
+SAMPLE_CHANGES = f"""
+    SELECT s.row_number, o.id, o.name, jsonb_strip_nulls(jsonb_build_object({", ".join(
+        f"'{column}', CASE WHEN {_comparable(column, expr)} IS DISTINCT FROM {_comparable(column, 'o.' + column)}"
+        f" THEN jsonb_build_array(o.{column}, {expr}) END"
+        for column, expr in WRITTEN_FIELDS
+    )}))
+    FROM import_staging_rows s
+    JOIN opportunities o ON o.id = s.opportunity_id
+    WHERE {BATCH} AND s.merge_action = 'update'
+    ORDER BY s.row_number
+    LIMIT :limit
+"""
+
+UPDATE_OPPORTUNITIES = f"""
+    UPDATE opportunities o
+    SET {", ".join(f"{column} = {expr}" for column, expr in WRITTEN_FIELDS)},
+        stage_entered_at = CASE
+            WHEN s.is_active AND o.stage <> s.stage::dealstage THEN now()
+            ELSE o.stage_entered_at
+        END,
+        deal_value_sgd = s.deal_value_sgd,
+        updated_at = now()
+    FROM import_staging_rows s
+    WHERE {BATCH} AND s.merge_action = 'update' AND o.id = s.opportunity_id
+"""
+
+INSERT_OPPORTUNITIES = f"""
+    INSERT INTO opportunities (
+        name, account_id, owner_id, stage, deal_value, deal_value_sgd, currency_code,
+        funding_type, program, territory_id, expected_close_date, ace_id, po_id,
+        map_status, notes, next_action, fit_status, proposal_unlocked,
+        cro_approval_required, is_active
+    )
+    SELECT s.name, s.account_id, coalesce(s.owner_id, :default_owner_id), s.stage::dealstage,
+           s.deal_value, s.deal_value_sgd, s.currency_code,
+           s.funding_type::fundingtype, s.program::program, s.territory_id,
+           s.expected_close_date, s.ace_id, s.po_id, s.map_status, s.notes, s.next_action,
+           'not_evaluated', false, false, s.is_active
+    FROM import_staging_rows s
+    WHERE {BATCH} AND s.merge_action = 'insert'
+    ORDER BY s.row_number
+"""
+
+COUNT_MERGE_ERRORS = f"""
+    SELECT count(*) FROM import_staging_rows s
+    WHERE {BATCH} AND s.merge_action = 'error'
+"""
+
+SELECT_MERGE_ERRORS = f"""
+    SELECT s.row_number, s.error, s.account_name, s.error_detail
+    FROM import_staging_rows s
+    WHERE {BATCH} AND s.merge_action = 'error'
+    ORDER BY s.row_number
+    LIMIT :limit
+"""
+
+
+# Staged column each merge-time error code refers to
+ERROR_FIELDS = {
+    "missing_fx_rate": "currency_code",
+    "ambiguous_account": "account_name",
+}
+
+
+@dataclass
+class MergeCounts:
+    accounts_matched: int = 0
+    accounts_created: int = 0
+    accounts_ambiguous: int = 0
+    inserted: int = 0
+    updated: int = 0
+    duplicates: int = 0
+    unchanged: int = 0
+    failed: int = 0
+
+
+async def _run(db: AsyncSession, sql: str, **params) -> int:
+    result = await db.execute(text(sql), params)
+    return result.rowcount or 0
+
+
+async def prepare_batch(
+    db: AsyncSession,
+    batch_id: str,
+    base_currency: str,
+) -> MergeCounts:
+    """Resolve FX, owners, territories, accounts and deal matches for a staged batch."""
+    counts = MergeCounts()
+    await _run(db, CONVERT_TO_SGD, batch_id=batch_id, base_currency=base_currency)
+    await _run(db, FLAG_MISSING_FX_RATE, batch_id=batch_id)
+    await _run(db, RESOLVE_OWNERS, batch_id=batch_id)
+    await _run(db, RESOLVE_TERRITORIES, batch_id=batch_id)
+    await resolve_accounts(db, batch_id, counts)
+    counts.duplicates = await _run(db, MARK_DUPLICATES_IN_FILE, batch_id=batch_id)
+    for match_sql in (MATCH_BY_ACE_ID, MATCH_BY_PO_ID, MATCH_BY_NAME):
+        await _run(db, match_sql, batch_id=batch_id)
+    counts.duplicates += await _run(db, MARK_DUPLICATE_MATCHES, batch_id=batch_id)
+    await _run(db, CLASSIFY, batch_id=batch_id)
+    counts.unchanged = await _run(db, MARK_UNCHANGED, batch_id=batch_id)
+    counts.failed = (await db.execute(text(COUNT_MERGE_ERRORS), {"batch_id": batch_id})).scalar_one()
+    return counts
+
+
+async def preview_batch(
+    db: AsyncSession,
+    batch_id: str,
+    counts: MergeCounts,
+    sample_limit: int,
+) -> Tuple[MergeCounts, Dict[str, int], List[tuple]]:
+    """
+    Dry-run view of a prepared batch: planned inserts / updates, how many
+    updates touch each field, and the first changed rows as
+    (row_number, opportunity_id, name, {field: [old, new]}).
+    """
+    actions = dict((await db.execute(text(COUNT_ACTIONS), {"batch_id": batch_id})).all())
+    counts.inserted = actions.get("insert", 0)
+    counts.updated = actions.get("update", 0)
+
+    changes = (await db.execute(text(FIELD_CHANGE_COUNTS), {"batch_id": batch_id})).mappings().one()
+    field_changes = {column: count for column, count in changes.items() if count}
+    samples = (await db.execute(text(SAMPLE_CHANGES), {"batch_id": batch_id, "limit": sample_limit})).all()
+    return counts, field_changes, [tuple(row) for row in samples]
+
+
+async def resolve_accounts(db: AsyncSession, batch_id: str, counts: MergeCounts) -> None:
+    """
+    Fuzzy-match the batch's distinct account names and write the decisions back.
+
+    Matching runs in the process pool; accounts for ``new`` names are created
+    in one multi-row INSERT and rows with ``ambiguous`` names are held back as
+    errors listing the closest candidates.
+    """
+    names = list((await db.execute(text(SELECT_ACCOUNT_NAMES), {"batch_id": batch_id})).scalars().all())
+    if not names:
+        return
+    accounts = [tuple(row) for row in (await db.execute(select(Account.id, Account.name))).all()]
+    decisions = await run_in_pool(resolve_account_names, accounts, names)
+
+    new_groups: Dict[int, str] = {}
+    for decision in decisions:
+        if decision.decision == NEW and decision.new_group not in new_groups:
+            new_groups[decision.new_group] = decision.name
+    group_account_ids: Dict[int, int] = {}
+    if new_groups:
+        result = await db.execute(
+            insert(Account).returning(Account.id, sort_by_parameter_order=True),
+            [{"name": name} for name in new_groups.values()],
+        )
+        group_account_ids = dict(zip(new_groups.keys(), result.scalars().all()))
+
+    await db.execute(text(APPLY_ACCOUNT_DECISIONS), {
+        "batch_id": batch_id,
+        "names": [d.name for d in decisions],
+        "account_ids": [
+            group_account_ids[d.new_group] if d.decision == NEW else d.account_id
+            for d in decisions
+        ],
+        "decisions": [d.decision for d in decisions],
+        "scores": [d.score for d in decisions],
+        "details": [
+            ", ".join(f"{name} ({score:.2f})" for name, score in d.candidates)[:255] or None
+            if d.decision == AMBIGUOUS else None
+            for d in decisions
+        ],
+    })
+
+    counts.accounts_matched = sum(1 for d in decisions if d.decision == MATCH)
+    counts.accounts_created = len(new_groups)
+    counts.accounts_ambiguous = sum(1 for d in decisions if d.decision == AMBIGUOUS)
+
+
+async def apply_batch(
+    db: AsyncSession,
+    batch_id: str,
+    user_id: int,
+    counts: MergeCounts,
+) -> MergeCounts:
+    """Write a prepared batch into ``opportunities`` (stage changes are logged as stage events)."""
+    await _run(db, RECORD_STAGE_CHANGES, batch_id=batch_id, user_id=user_id)
+    counts.updated = await _run(db, UPDATE_OPPORTUNITIES, batch_id=batch_id)
+    counts.inserted = await _run(db, INSERT_OPPORTUNITIES, batch_id=batch_id, default_owner_id=user_id)
+    return counts
+
+
+async def merge_errors(db: AsyncSession, batch_id: str, limit: int) -> List[RowError]:
+    """Row-level errors raised during the merge (no FX rate, ambiguous account)."""
+    result = await db.execute(text(SELECT_MERGE_ERRORS), {"batch_id": batch_id, "limit": limit})
+    return [
+        RowError(
+            row_number=row_number,
+            field=ERROR_FIELDS.get(error, "row"),
+            code=error,
+            value=f"{account_name} ~ {detail}" if detail else None,
+        )
+        for row_number, error, account_name, detail in result.all()
+    ]
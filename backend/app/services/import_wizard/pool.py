@@ -0,0 +1,87 @@
+"""
+Process pool for import row validation.
+
+Parsing and normalising tens of thousands of rows is pure CPU work; done on
+the event-loop thread (or a GIL-bound thread) it stalls every other request.
+Chunks (and the fuzzy account resolution) are shipped to a small, lazily
+started pool of worker processes instead. Workers use the ``spawn`` start
+method — forking a process that already runs an event loop and DB pool
+threads is unsafe.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+import structlog
+
+from ...core.config import settings
+from .reader import Row
+from .validation import ChunkResult, validate_chunk
+
+logger = structlog.get_logger()
+
+T = TypeVar("T")
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def get_validation_pool() -> Optional[ProcessPoolExecutor]:
+    """Return the shared validation pool, or None when validation runs in-process."""
+    global _pool
+    if settings.import_validation_workers <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.import_validation_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info("Import validation pool started", workers=settings.import_validation_workers)
+        return _pool
+
+
+def shutdown_validation_pool() -> None:
+    """Stop the worker processes (application shutdown)."""
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def max_in_flight_chunks() -> int:
+    """Chunks validated concurrently per import — bounds memory to a few chunks."""
+    return max(2, settings.import_validation_workers * 2)
+
+
+async def run_in_pool(func: Callable[..., T], *args) -> T:
+    """Run a picklable CPU-bound function in the process pool (or a thread when the pool is disabled)."""
+    global _pool
+    pool = get_validation_pool()
+    if pool is None:
+        return await asyncio.to_thread(func, *args)
+
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(pool, func, *args)
+    except BrokenProcessPool:
+        # A worker died (e.g. OOM-killed); drop the pool so the next import starts a fresh one
+        logger.error("Import validation pool broken, restarting on next use")
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
+
+
+async def run_validation(
+    chunk: List[Tuple[int, Row]],
+    header_map: Dict[int, str],
+    base_currency: str,
+) -> ChunkResult:
+    """Validate one chunk in the process pool."""
+    return await run_in_pool(validate_chunk, chunk, header_map, base_currency)
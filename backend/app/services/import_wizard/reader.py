@@ -0,0 +1,115 @@
+"""
+Streaming row readers for XLSX and CSV uploads.
+
+XLSX is opened with openpyxl in read-only mode, which parses the sheet XML
+lazily as rows are iterated — memory stays flat regardless of workbook size.
+Everything here is blocking and is driven from a worker thread.
+"""
+
+import codecs
+import csv
+from dataclasses import dataclass
+from typing import IO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from .columns import HEADER_SCAN_ROWS, map_header_row, missing_required
+
+# Preferred sheet names in the tracker workbook, in order
+PREFERRED_SHEETS = ("Master Deal Tracker", "Pipeline", "Deals")
+
+Row = Tuple[object, ...]
+
+
+class ImportFileError(Exception):
+    """The uploaded file cannot be read as a deal tracker."""
+    pass
+
+
+@dataclass
+class SheetRows:
+    """Row stream positioned just after the header row."""
+    header_map: Dict[int, str]
+    header_row_number: int
+    total_rows: Optional[int]           # from the sheet dimension; None if unknown
+    rows: Iterator[Tuple[int, Row]]     # (1-based row number, cell values)
+    close: Callable[[], None]
+
+
+def _iter_xlsx(fileobj: IO[bytes]) -> Tuple[Iterator[Row], Optional[int], Callable[[], None]]:
+    from openpyxl import load_workbook
+
+    try:
+        workbook = load_workbook(fileobj, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFileError(f"Could not open workbook: {e}") from e
+
+    sheet_name = next((name for name in PREFERRED_SHEETS if name in workbook.sheetnames), None)
+    sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+    total_rows = sheet.max_row if sheet.max_row and sheet.max_row > 1 else None
+    return sheet.iter_rows(values_only=True), total_rows, workbook.close
+
+
+def _iter_csv(fileobj: IO[bytes]) -> Tuple[Iterator[Row], Optional[int], Callable[[], None]]:
+    text_stream = codecs.getreader("utf-8-sig")(fileobj, errors="replace")
+    rows = (tuple(cell if cell != "" else None for cell in row) for row in csv.reader(text_stream))
+    return rows, None, lambda: None
+
+
+def open_sheet_rows(fileobj: IO[bytes], filename: str) -> SheetRows:
+    """Open an upload, locate the header row and return the remaining row stream."""
+    lowered = filename.lower()
+    if lowered.endswith((".xlsx", ".xlsm")):
+        raw_rows, total_rows, close = _iter_xlsx(fileobj)
+    elif lowered.endswith(".csv"):
+        raw_rows, total_rows, close = _iter_csv(fileobj)
+    else:
+        raise ImportFileError("Unsupported file type — upload .xlsx or .csv")
+
+    # Scan the first few rows for the best header candidate
+    scanned: List[Row] = []
+    best_idx, best_map = -1, {}
+    for idx, row in enumerate(raw_rows):
+        scanned.append(row)
+        mapping = map_header_row(row)
+        if len(mapping) > len(best_map):
+            best_idx, best_map = idx, mapping
+        if idx + 1 >= HEADER_SCAN_ROWS:
+            break
+
+    if not best_map:
+        close()
+        raise ImportFileError("Could not find a header row with known tracker columns")
+    missing = missing_required(best_map)
+    if missing:
+        close()
+        raise ImportFileError(f"Required column missing: {missing}")
+
+    def numbered_rows() -> Iterator[Tuple[int, Row]]:
+        row_number = best_idx + 1
+        for row in scanned[best_idx + 1:]:
+            row_number += 1
+            yield row_number, row
+        for row in raw_rows:
+            row_number += 1
+            yield row_number, row
+
+    return SheetRows(
+        header_map=best_map,
+        header_row_number=best_idx + 1,
+        total_rows=(total_rows - best_idx - 1) if total_rows else None,
+        rows=numbered_rows(),
+        close=close,
+    )
+
+
+def iter_chunks(rows: Iterator[Tuple[int, Row]], size: int) -> Iterator[List[Tuple[int, Row]]]:
+    """Group a row stream into lists of at most ``size`` non-blank rows."""
+    chunk: List[Tuple[int, Row]] = []
+    for row_number, row in rows:
+        if row is None or all(cell is None or (isinstance(cell, str) and not cell.strip()) for cell in row):
+            continue
+        chunk.append((row_number, row))
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
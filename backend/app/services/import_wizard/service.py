@@ -0,0 +1,509 @@
+import asyncio
+import os
+import shutil
+import uuid
+from collections import deque
+from dataclasses import asdict
+from datetime import datetime, timedelta, timezone
+from itertools import dropwhile
+from typing import IO, Deque, List, Optional, Set, Tuple
+
+import structlog
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core import database
+from ...core.config import settings
+from ...models.import_job import ImportJob, ImportJobStatus
+from ...models.import_staging_row import ImportStagingRow
+from ...models.user import User
+from ...schemas.import_schemas import (
+    ImportErrorSummarySchema,
+    ImportJobSchema,
+    ImportPreviewSchema,
+    ImportResultSchema,
+    ImportRowDiffSchema,
+    ImportRowErrorSchema,
+)
+from .merge import MergeCounts, apply_batch, merge_errors, prepare_batch, preview_batch
+from .pool import max_in_flight_chunks, run_validation
+from .reader import ImportFileError, iter_chunks, open_sheet_rows
+from .staging import clear_batch, copy_records
+from .validation import ChunkResult, ErrorReport
+
+logger = structlog.get_logger()
+
+# Background job tasks, kept referenced until they finish
+_running_jobs: Set[asyncio.Task] = set()
+
+# Changed rows listed in a dry-run preview
+PREVIEW_SAMPLE_ROWS = 50
+
+# Jobs that keep staged rows and a spooled upload but will not run again
+# unless someone commits or resumes them
+DISCARDABLE_STATUSES = (ImportJobStatus.previewed, ImportJobStatus.failed)
+
+
+def _spool_upload(fileobj: IO[bytes], path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as spool:
+        shutil.copyfileobj(fileobj, spool, length=1024 * 1024)
+
+
+def _remove_spool(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _report_schemas(report: ErrorReport) -> Tuple[List[ImportErrorSummarySchema], List[ImportRowErrorSchema]]:
+    return (
+        [ImportErrorSummarySchema(**vars(group)) for group in report.sorted_groups()],
+        [ImportRowErrorSchema(**vars(error)) for error in report.sorted_rows()],
+    )
+
+
+def job_to_schema(job: ImportJob) -> ImportJobSchema:
+    """Job progress with percent complete and an ETA from the current attempt's throughput."""
+    percent_complete: Optional[float] = None
+    eta_seconds: Optional[float] = None
+    if job.status == ImportJobStatus.completed:
+        percent_complete = 100.0
+    elif job.total_rows:
+        percent_complete = round(min(100.0, 100.0 * job.rows_processed / job.total_rows), 1)
+        if job.status == ImportJobStatus.staging and job.attempt_started_at:
+            elapsed = (datetime.now(timezone.utc) - job.attempt_started_at).total_seconds()
+            rows_this_attempt = job.rows_processed - job.attempt_start_rows
+            if elapsed > 0 and rows_this_attempt > 0:
+                remaining = max(0, job.total_rows - job.rows_processed)
+                eta_seconds = round(remaining / (rows_this_attempt / elapsed), 1)
+
+    error_summary: List[ImportErrorSummarySchema] = []
+    if job.error_report:
+        error_summary, _ = _report_schemas(ErrorReport.from_dict(job.error_report))
+
+    return ImportJobSchema(
+        id=job.id,
+        status=job.status,
+        filename=job.filename,
+        dry_run=job.dry_run,
+        total_rows=job.total_rows,
+        rows_processed=job.rows_processed,
+        rows_staged=job.rows_staged,
+        error_count=job.error_count,
+        chunks_committed=job.chunks_committed,
+        percent_complete=percent_complete,
+        eta_seconds=eta_seconds,
+        attempts=job.attempts,
+        error_summary=error_summary,
+        error_message=job.error_message,
+        preview=ImportPreviewSchema(**job.preview) if job.preview else None,
+        result=ImportResultSchema(**job.result) if job.result else None,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def discard_import_job(db: AsyncSession, job_id: str) -> bool:
+    """Drop a previewed or failed job's staged rows and spooled upload; False if the job is not (or no longer) discardable."""
+    file_path = (await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status.in_(DISCARDABLE_STATUSES))
+        .values(status=ImportJobStatus.discarded, finished_at=datetime.now(timezone.utc))
+        .returning(ImportJob.file_path)
+        .execution_options(synchronize_session=False)
+    )).scalar_one_or_none()
+    if file_path is None:
+        await db.rollback()
+        return False
+    await clear_batch(db, job_id)
+    await db.commit()
+    await asyncio.to_thread(_remove_spool, file_path)
+    return True
+
+
+async def discard_expired_import_jobs(db: AsyncSession, older_than_hours: int) -> int:
+    """Discard previewed and failed jobs not touched for ``older_than_hours``."""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=older_than_hours)
+    job_ids = (await db.execute(
+        select(ImportJob.id).where(ImportJob.status.in_(DISCARDABLE_STATUSES), ImportJob.updated_at < cutoff)
+    )).scalars().all()
+    await db.rollback()
+    discarded = 0
+    for job_id in job_ids:
+        if await discard_import_job(db, job_id):
+            discarded += 1
+    if discarded:
+        logger.info("Expired import jobs discarded", count=discarded, older_than_hours=older_than_hours)
+    return discarded
+
+
+class ImportWizardService:
+    """Creates and looks up durable deal tracker import jobs."""
+
+    def __init__(self, db: AsyncSession, user: User):
+        self.db = db
+        self.user = user
+
+    async def create_job(self, fileobj: IO[bytes], filename: str, dry_run: bool = False) -> ImportJob:
+        """Spool the upload to disk and queue an import job for it (a preview-only job when ``dry_run``)."""
+        extension = os.path.splitext(filename)[1].lower()
+        if extension not in (".xlsx", ".xlsm", ".csv"):
+            raise ImportFileError("Unsupported file type — upload .xlsx or .csv")
+
+        job_id = str(uuid.uuid4())
+        path = os.path.join(settings.import_spool_dir, f"{job_id}{extension}")
+        await asyncio.to_thread(_spool_upload, fileobj, path)
+
+        try:
+            job = ImportJob(
+                id=job_id,
+                status=ImportJobStatus.queued,
+                filename=filename,
+                file_path=path,
+                created_by_id=self.user.id,
+                dry_run=dry_run,
+            )
+            self.db.add(job)
+            await self.db.commit()
+            await self.db.refresh(job)
+        except Exception as e:
+            await self.db.rollback()
+            await asyncio.to_thread(_remove_spool, path)
+            logger.error("Error creating import job", filename=filename, error=str(e))
+            raise
+
+        logger.info("Import job queued", job_id=job_id, filename=filename, user_id=self.user.id, dry_run=dry_run)
+        return job
+
+    async def get_job(self, job_id: str) -> Optional[ImportJob]:
+        """Return a job if it exists and the user may see it (own jobs, or any for superusers)."""
+        job = await self.db.get(ImportJob, job_id)
+        if job is None or (job.created_by_id != self.user.id and not self.user.is_superuser):
+            return None
+        return job
+
+    async def commit_preview(self, job: ImportJob) -> ImportJob:
+        """Queue a previewed dry-run job to merge its already staged rows."""
+        job.dry_run = False
+        job.status = ImportJobStatus.queued
+        await self.db.commit()
+        logger.info("Import preview committed", job_id=job.id, user_id=self.user.id)
+        return job
+
+    async def discard_job(self, job: ImportJob) -> bool:
+        """Drop a previewed or failed job instead of committing or resuming it."""
+        if not await discard_import_job(self.db, job.id):
+            return False
+        await self.db.refresh(job)
+        logger.info("Import job discarded", job_id=job.id, user_id=self.user.id)
+        return True
+
+
+class ImportJobRunner:
+    """
+    Runs — or resumes — one import job on a dedicated session.
+
+    Staging commits after every chunk together with the job checkpoint
+    (``last_row_number``, counters, error report). A resumed job re-opens
+    the spooled file, skips rows up to the checkpoint without validating
+    them, and carries on; the merge runs once, in a single transaction,
+    after every chunk is staged. Dry-run jobs run the same preparation,
+    record the diff and roll it back, keeping the staged rows for commit.
+    """
+
+    def __init__(self, db: AsyncSession, job_id: str):
+        self.db = db
+        self.job_id = job_id
+
+    async def _claim(self) -> Optional[ImportJob]:
+        """
+        Atomically move a runnable job (queued, failed or stale) into its next phase.
+
+        A merge or preview holds the job row locked for its whole transaction
+        instead of heartbeating, so a locked row is skipped however old its
+        heartbeat is.
+        """
+        now = datetime.now(timezone.utc)
+        stale_before = now - timedelta(seconds=settings.import_job_stale_seconds)
+        runnable = (
+            select(ImportJob.id)
+            .where(
+                ImportJob.id == self.job_id,
+                or_(
+                    ImportJob.status.in_([ImportJobStatus.queued, ImportJobStatus.failed]),
+                    and_(
+                        ImportJob.status.in_([ImportJobStatus.staging, ImportJobStatus.merging]),
+                        ImportJob.heartbeat_at < stale_before,
+                    ),
+                ),
+            )
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == runnable)
+            .values(
+                status=case(
+                    (ImportJob.staged_at.is_(None), ImportJobStatus.staging.name),
+                    else_=ImportJobStatus.merging.name,
+                ).cast(ImportJob.status.type),
+                attempts=ImportJob.attempts + 1,
+                attempt_started_at=now,
+                attempt_start_rows=ImportJob.rows_processed,
+                heartbeat_at=now,
+                error_message=None,
+            )
+            .returning(ImportJob.id)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = result.scalar_one_or_none()
+        await self.db.commit()
+        if claimed is None:
+            return None
+        return await self.db.get(ImportJob, self.job_id, populate_existing=True)
+
+    async def run(self) -> None:
+        job = await self._claim()
+        if job is None:
+            logger.info("Import job not runnable", job_id=self.job_id)
+            return
+
+        logger.info(
+            "Import job started",
+            job_id=job.id,
+            status=job.status,
+            attempt=job.attempts,
+            resume_after_row=job.last_row_number,
+        )
+        try:
+            await self._verify_checkpoint(job)
+            if job.status == ImportJobStatus.staging:
+                await self._stage(job)
+            if job.dry_run:
+                await self._preview(job)
+            else:
+                await self._merge(job)
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Import job failed", job_id=self.job_id, error=str(e), exc_info=True)
+            await self.db.execute(
+                update(ImportJob)
+                .where(ImportJob.id == self.job_id)
+                .values(status=ImportJobStatus.failed, error_message=str(e)[:2000])
+            )
+            await self.db.commit()
+
+    async def _verify_checkpoint(self, job: ImportJob) -> None:
+        """
+        Restart staging if the staged rows no longer match the checkpoint.
+
+        ``import_staging_rows`` is UNLOGGED, so a Postgres crash truncates it.
+        Checked before staging resumes and before a staged batch is merged or
+        previewed (a job claimed back into ``merging``, a committed preview):
+        merging a truncated batch would complete the job with no rows.
+        """
+        staged = (await self.db.execute(
+            select(func.count()).select_from(ImportStagingRow).where(ImportStagingRow.batch_id == job.id)
+        )).scalar_one()
+        if staged == job.rows_staged:
+            return
+        logger.warning("Import checkpoint lost, restaging", job_id=job.id, expected=job.rows_staged, found=staged)
+        await clear_batch(self.db, job.id)
+        job.rows_processed = job.rows_staged = job.error_count = 0
+        job.last_row_number = job.chunks_committed = job.attempt_start_rows = 0
+        job.error_report = None
+        job.staged_at = None
+        job.status = ImportJobStatus.staging
+        await self.db.commit()
+
+    async def _checkpoint(
+        self,
+        job: ImportJob,
+        chunk_rows: int,
+        last_row_number: int,
+        result: ChunkResult,
+        report: ErrorReport,
+    ) -> None:
+        """Stage one validated chunk and advance the checkpoint in the same transaction."""
+        report.add(result.errors)
+        job.rows_processed += chunk_rows
+        job.rows_staged += len(result.records)
+        job.error_count = report.total
+        job.last_row_number = last_row_number
+        job.chunks_committed += 1
+        job.error_report = report.to_dict()
+        job.heartbeat_at = datetime.now(timezone.utc)
+        # Flushing the checkpoint UPDATE opens the transaction the COPY joins
+        await self.db.flush()
+        await copy_records(self.db, job.id, result.records)
+        await self.db.commit()
+
+    async def _stage(self, job: ImportJob) -> None:
+        report = ErrorReport.from_dict(job.error_report) if job.error_report else ErrorReport()
+        base_currency = settings.base_currency
+
+        fileobj = await asyncio.to_thread(open, job.file_path, "rb")
+        sheet = None
+        in_flight: Deque[Tuple[int, int, asyncio.Future]] = deque()
+        try:
+            sheet = await asyncio.to_thread(open_sheet_rows, fileobj, job.filename)
+            if job.total_rows is None and sheet.total_rows:
+                job.total_rows = sheet.total_rows
+                await self.db.commit()
+
+            # Rows up to the checkpoint are still parsed (XLSX has no random access) but not revalidated
+            resume_after = job.last_row_number
+            rows = dropwhile(lambda numbered: numbered[0] <= resume_after, sheet.rows)
+            chunks = iter_chunks(rows, settings.import_chunk_size)
+            max_in_flight = max_in_flight_chunks()
+
+            while True:
+                chunk = await asyncio.to_thread(next, chunks, None)
+                if chunk is None:
+                    break
+                future = asyncio.ensure_future(run_validation(chunk, sheet.header_map, base_currency))
+                in_flight.append((len(chunk), chunk[-1][0], future))
+                if len(in_flight) >= max_in_flight:
+                    chunk_rows, last_row, oldest = in_flight.popleft()
+                    await self._checkpoint(job, chunk_rows, last_row, await oldest, report)
+            while in_flight:
+                chunk_rows, last_row, oldest = in_flight.popleft()
+                await self._checkpoint(job, chunk_rows, last_row, await oldest, report)
+        finally:
+            for _, _, future in in_flight:
+                future.cancel()
+            await asyncio.gather(*(future for _, _, future in in_flight), return_exceptions=True)
+            if sheet is not None:
+                await asyncio.to_thread(sheet.close)
+            await asyncio.to_thread(fileobj.close)
+
+        job.status = ImportJobStatus.merging
+        job.staged_at = datetime.now(timezone.utc)
+        job.heartbeat_at = job.staged_at
+        await self.db.commit()
+
+    async def _preview(self, job: ImportJob) -> None:
+        """Resolve and diff the staged batch, then roll back so nothing is written."""
+        await self.db.refresh(job, with_for_update=True)
+        report = ErrorReport.from_dict(job.error_report) if job.error_report else ErrorReport()
+
+        counts: MergeCounts = await prepare_batch(self.db, job.id, settings.base_currency)
+        counts, field_changes, samples = await preview_batch(self.db, job.id, counts, PREVIEW_SAMPLE_ROWS)
+        if counts.failed:
+            report.add(await merge_errors(self.db, job.id, counts.failed))
+        # Accounts created by the fuzzy matcher and staging resolutions go too
+        await self.db.rollback()
+        await self.db.refresh(job, with_for_update=True)
+
+        error_summary, _ = _report_schemas(report)
+        preview = ImportPreviewSchema(
+            to_insert=counts.inserted,
+            to_update=counts.updated,
+            unchanged=counts.unchanged,
+            duplicates=counts.duplicates,
+            accounts_matched=counts.accounts_matched,
+            accounts_created=counts.accounts_created,
+            accounts_ambiguous=counts.accounts_ambiguous,
+            error_count=report.total,
+            error_summary=error_summary,
+            field_changes=field_changes,
+            sample_changes=[
+                ImportRowDiffSchema(row_number=row_number, opportunity_id=opportunity_id, name=name, changes=changes)
+                for row_number, opportunity_id, name, changes in samples
+            ],
+        )
+        job.status = ImportJobStatus.previewed
+        job.preview = preview.model_dump(mode="json")
+        job.finished_at = datetime.now(timezone.utc)
+        await self.db.commit()
+
+        logger.info(
+            "Import job previewed",
+            job_id=job.id,
+            filename=job.filename,
+            to_insert=counts.inserted,
+            to_update=counts.updated,
+            unchanged=counts.unchanged,
+            errors=report.total,
+        )
+
+    async def _merge(self, job: ImportJob) -> None:
+        # Held until the merge commits: _claim skips the job meanwhile
+        await self.db.refresh(job, with_for_update=True)
+        report = ErrorReport.from_dict(job.error_report) if job.error_report else ErrorReport()
+
+        counts: MergeCounts = await prepare_batch(self.db, job.id, settings.base_currency)
+        counts = await apply_batch(self.db, job.id, job.created_by_id, counts)
+        if counts.failed:
+            report.add(await merge_errors(self.db, job.id, counts.failed))
+        await clear_batch(self.db, job.id)
+
+        finished_at = datetime.now(timezone.utc)
+        error_summary, errors = _report_schemas(report)
+        merged = asdict(counts)
+        merged.pop("failed")
+        result = ImportResultSchema(
+            batch_id=job.id,
+            filename=job.filename,
+            rows_read=job.rows_processed,
+            rows_staged=job.rows_staged,
+            error_count=report.total,
+            error_summary=error_summary,
+            errors=errors,
+            errors_truncated=report.truncated,
+            duration_seconds=round((finished_at - job.created_at).total_seconds(), 3),
+            **merged,
+        )
+        job.status = ImportJobStatus.completed
+        job.error_count = report.total
+        job.error_report = report.to_dict()
+        job.result = result.model_dump(mode="json")
+        job.finished_at = finished_at
+        await self.db.commit()
+
+        await asyncio.to_thread(_remove_spool, job.file_path)
+        logger.info(
+            "Import job completed",
+            job_id=job.id,
+            filename=job.filename,
+            rows_read=job.rows_processed,
+            inserted=counts.inserted,
+            updated=counts.updated,
+            unchanged=counts.unchanged,
+            errors=report.total,
+            attempts=job.attempts,
+        )
+
+
+async def run_import_job(job_id: str) -> None:
+    """Background entry point: run one job on its own session."""
+    async with database.AsyncSessionLocal() as db:
+        await ImportJobRunner(db, job_id).run()
+
+
+def start_import_job(job_id: str) -> asyncio.Task:
+    """Schedule a job on the running event loop."""
+    task = asyncio.create_task(run_import_job(job_id))
+    _running_jobs.add(task)
+    task.add_done_callback(_running_jobs.discard)
+    return task
+
+
+async def resume_interrupted_import_jobs() -> int:
+    """Schedule every unfinished job (application startup); claiming skips jobs still live elsewhere."""
+    async with database.AsyncSessionLocal() as db:
+        job_ids = (await db.execute(
+            select(ImportJob.id).where(ImportJob.status.in_([
+                ImportJobStatus.queued,
+                ImportJobStatus.staging,
+                ImportJobStatus.merging,
+            ]))
+        )).scalars().all()
+    for job_id in job_ids:
+        start_import_job(job_id)
+    if job_ids:
+        logger.info("Resuming interrupted import jobs", count=len(job_ids))
+    return len(job_ids)
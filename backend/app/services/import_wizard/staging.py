@@ -0,0 +1,42 @@
+"""
+Bulk load of validated rows into ``import_staging_rows`` via asyncpg COPY.
+"""
+
+from typing import List
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...models.import_staging_row import ImportStagingRow
+from .validation import STAGED_FIELDS
+
+STAGING_COLUMNS = ("batch_id",) + STAGED_FIELDS
+
+
+async def copy_records(db: AsyncSession, batch_id: str, records: List[tuple]) -> int:
+    """
+    COPY staged records into the staging table on the session's own connection.
+
+    Must run inside the session's open transaction (any statement issued
+    earlier in it, such as ``clear_batch``, starts one) so the rows commit or
+    roll back together with the rest of the import.
+    """
+    if not records:
+        return 0
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    driver_connection = raw_connection.driver_connection
+    if not driver_connection.is_in_transaction():
+        raise RuntimeError("copy_records() requires an open transaction on the session")
+
+    await driver_connection.copy_records_to_table(
+        ImportStagingRow.__tablename__,
+        records=[(batch_id,) + record for record in records],
+        columns=STAGING_COLUMNS,
+    )
+    return len(records)
+
+
+async def clear_batch(db: AsyncSession, batch_id: str) -> None:
+    """Remove every staged row of a batch."""
+    await db.execute(delete(ImportStagingRow).where(ImportStagingRow.batch_id == batch_id))
@@ -0,0 +1,418 @@
+"""
+Row validation and normalisation for spreadsheet imports.
+
+Pure functions over plain, picklable tuples so chunks can be validated in
+worker processes. ``validate_chunk`` turns raw cells into records in
+``STAGED_FIELDS`` order (ready for COPY into ``import_staging_rows``) plus
+per-row errors. Tracker labels ("Qualified", "FR Raised", "MAP 2.0 — Assess",
+"S$ 1,200") are mapped onto the model enums and ISO currency codes here.
+"""
+
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ...models.opportunity import DealStage, FundingType, Program
+from ...schemas.opportunity_schemas import SUPPORTED_CURRENCIES
+
+# Column order of a staged record (batch_id is prepended at COPY time)
+STAGED_FIELDS = (
+    "row_number",
+    "account_name",
+    "name",
+    "stage",
+    "deal_value",
+    "currency_code",
+    "funding_type",
+    "program",
+    "expected_close_date",
+    "ace_id",
+    "po_id",
+    "map_status",
+    "owner_ref",
+    "territory_name",
+    "notes",
+    "next_action",
+    "is_active",
+)
+
+TEXT_LIMITS = {
+    "account_name": 255,
+    "name": 255,
+    "ace_id": 100,
+    "po_id": 100,
+    "map_status": 50,
+    "owner_ref": 255,
+    "territory_name": 100,
+}
+
+
+# Tracker "Sales Stage" labels -> DealStage (keys are lower-cased, whitespace collapsed)
+STAGE_LABELS: Dict[str, DealStage] = {
+    "new hunt": DealStage.new_hunt,
+    "prospect": DealStage.new_hunt,
+    "lead": DealStage.new_hunt,
+    "qualified": DealStage.discovery,
+    "discovery": DealStage.discovery,
+    "proposal": DealStage.proposal,
+    "proposal submitted": DealStage.proposal,
+    "proposal sent": DealStage.proposal,
+    "negotiation": DealStage.negotiation,
+    "fr raised": DealStage.negotiation,
+    "funding request raised": DealStage.negotiation,
+    "commit": DealStage.negotiation,
+    "order book": DealStage.order_book,
+    "closed won": DealStage.order_book,
+    "won": DealStage.order_book,
+    "po received": DealStage.order_book,
+}
+
+# Lost deals are imported inactive; an existing deal keeps its last stage
+LOST_STAGE_LABELS = {"lost", "closed lost", "dropped", "disqualified"}
+
+# Tracker "Funding" labels -> FundingType
+FUNDING_LABELS: Dict[str, FundingType] = {
+    "aws funded": FundingType.aws,
+    "aws": FundingType.aws,
+    "customer funded": FundingType.customer,
+    "customer": FundingType.customer,
+    "self funded": FundingType.customer,
+    "dual": FundingType.dual,
+    "dual funded": FundingType.dual,
+    "co-funded": FundingType.dual,
+}
+
+# Tracker "Funding Type" labels carry the AWS program as a keyword
+# ("MAP 2.0 — Assess", "MAP Lite", "SCA POC Funding", "Gen AI 20% POC")
+PROGRAM_KEYWORDS = (
+    ("mmp", Program.mmp),
+    ("map", Program.map),
+    ("poc", Program.poc),
+)
+NO_PROGRAM_LABELS = {"none", "n/a", "na", "customer funded", "self funded"}
+
+# Currency symbols / aliases seen in the tracker -> ISO code
+CURRENCY_ALIASES = {
+    "S$": "SGD",
+    "SGD$": "SGD",
+    "US$": "USD",
+    "USD$": "USD",
+    "€": "EUR",
+    "£": "GBP",
+    "A$": "AUD",
+    "AU$": "AUD",
+    "C$": "CAD",
+    "CA$": "CAD",
+    "¥": "JPY",
+    "RMB": "CNY",
+    "HK$": "HKD",
+    "RM": "MYR",
+    "฿": "THB",
+    "₹": "INR",
+}
+_CURRENCY_PREFIX = re.compile(
+    "^(" + "|".join(re.escape(alias) for alias in sorted(CURRENCY_ALIASES, key=len, reverse=True)) + ")"
+)
+# An ISO code written before or after the amount ("USD 1.5k", "1.5k USD")
+_CURRENCY_CODE = re.compile(r"^([A-Z]{3})(?![A-Z])|(?<![A-Z])([A-Z]{3})$")
+
+DATE_FORMATS = ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y", "%d %b %Y", "%d-%b-%Y", "%d %B %Y", "%Y-%m-%d %H:%M:%S")
+
+# Excel stores dates as days since 1899-12-30; accept serials between 1980 and 2100
+EXCEL_EPOCH = date(1899, 12, 30)
+EXCEL_SERIAL_RANGE = (29221, 73051)
+
+AMOUNT_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+# What is left of an amount once its currency is stripped: optional sign and
+# bare "$", digits with optional thousands commas and decimals, optional suffix
+_AMOUNT = re.compile(r"([-+]?)\s*\$?\s*((?:\d{1,3}(?:,\d{3})+|\d+)(?:\.\d+)?|\.\d+)\s*([km]?)")
+BLANK_AMOUNTS = {"", "-", "—"}
+
+# Row-level errors listed in full in the report; the rest are only counted
+MAX_REPORTED_ERRORS = 200
+ERROR_SAMPLE_ROWS = 10
+
+
+class RowValidationError(ValueError):
+    """A single cell failed validation."""
+
+    def __init__(self, field: str, code: str, value: object = None):
+        super().__init__(f"{field}: {code}")
+        self.field = field
+        self.code = code
+        self.value = value
+
+
+@dataclass
+class RowError:
+    row_number: int
+    field: str
+    code: str
+    value: Optional[str] = None
+
+
+@dataclass
+class ChunkResult:
+    records: List[tuple] = field(default_factory=list)
+    errors: List[RowError] = field(default_factory=list)
+
+
+@dataclass
+class ErrorGroup:
+    field: str
+    code: str
+    count: int = 0
+    sample_rows: List[int] = field(default_factory=list)
+
+
+class ErrorReport:
+    """
+    Compact error report for an import.
+
+    Errors are grouped by (field, code) with a count and the first few row
+    numbers of each group; only the first ``max_rows`` errors are kept in
+    full, so a file with 20k bad rows still yields a small response.
+    """
+
+    def __init__(self, max_rows: int = MAX_REPORTED_ERRORS):
+        self.max_rows = max_rows
+        self.total = 0
+        self.rows: List[RowError] = []
+        self.groups: Dict[Tuple[str, str], ErrorGroup] = {}
+
+    @property
+    def remaining(self) -> int:
+        return self.max_rows - len(self.rows)
+
+    @property
+    def truncated(self) -> bool:
+        return self.total > len(self.rows)
+
+    def add(self, errors: Iterable[RowError]) -> None:
+        for error in errors:
+            self.total += 1
+            if len(self.rows) < self.max_rows:
+                self.rows.append(error)
+            group = self.groups.get((error.field, error.code))
+            if group is None:
+                group = self.groups[(error.field, error.code)] = ErrorGroup(error.field, error.code)
+            group.count += 1
+            if len(group.sample_rows) < ERROR_SAMPLE_ROWS:
+                group.sample_rows.append(error.row_number)
+
+    def to_dict(self) -> dict:
+        """JSON-safe state, checkpointed with each staged chunk."""
+        return {
+            "max_rows": self.max_rows,
+            "total": self.total,
+            "rows": [vars(error) for error in self.rows],
+            "groups": [vars(group) for group in self.groups.values()],
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ErrorReport":
+        report = cls(max_rows=data["max_rows"])
+        report.total = data["total"]
+        report.rows = [RowError(**error) for error in data["rows"]]
+        for group in data["groups"]:
+            report.groups[(group["field"], group["code"])] = ErrorGroup(**group)
+        return report
+
+    def sorted_rows(self) -> List[RowError]:
+        return sorted(self.rows, key=lambda error: error.row_number)
+
+    def sorted_groups(self) -> List[ErrorGroup]:
+        return sorted(self.groups.values(), key=lambda group: group.count, reverse=True)
+
+
+def _label_key(value: str) -> str:
+    return re.sub(r"\s+", " ", value.replace("—", "-").replace("–", "-")).strip().lower()
+
+
+def _text(value: object, field_name: str) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)   # IDs typed into numeric cells
+    text = re.sub(r"\s+", " ", str(value)).strip()
+    if not text or text in ("-", "—"):
+        return None
+    limit = TEXT_LIMITS.get(field_name)
+    if limit and len(text) > limit:
+        raise RowValidationError(field_name, "too_long", text[:50])
+    return text
+
+
+def _amount(value: object) -> float:
+    if value is None:
+        return 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip().upper()
+    if text in BLANK_AMOUNTS:
+        return 0.0
+    negative = False
+    if text.startswith("(") and text.endswith(")"):
+        # Accounting negative: "(1,500)"
+        negative, text = True, text[1:-1].strip()
+    if text[:1] in ("-", "+"):
+        # Sign written before the currency: "-S$ 1,500"
+        negative, text = negative or text[0] == "-", text[1:].strip()
+    text = _CURRENCY_PREFIX.sub("", text).strip()
+    text = _CURRENCY_CODE.sub("", text).strip().lower()
+    match = _AMOUNT.fullmatch(text)
+    if match is None:
+        raise RowValidationError("deal_value", "invalid_number", str(value)[:50])
+    sign, number, suffix = match.groups()
+    amount = float(number.replace(",", "")) * AMOUNT_SUFFIXES.get(suffix, 1)
+    return -amount if negative or sign == "-" else amount
+
+
+def _date(value: object) -> Optional[date]:
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        if EXCEL_SERIAL_RANGE[0] <= value <= EXCEL_SERIAL_RANGE[1]:
+            return EXCEL_EPOCH + timedelta(days=int(value))
+        raise RowValidationError("expected_close_date", "invalid_date", str(value))
+    text = str(value).strip()
+    if not text or text in ("-", "—"):
+        return None
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    raise RowValidationError("expected_close_date", "invalid_date", text[:50])
+
+
+def _stage(value: object) -> Tuple[DealStage, bool]:
+    """Return (stage, is_active); lost deals come back inactive."""
+    text = _text(value, "stage")
+    if text is None:
+        return DealStage.new_hunt, True
+    key = _label_key(text)
+    # "Stage 3 - Proposal", "3. Proposal"
+    unnumbered = re.sub(r"^(stage\s*)?\d+\s*[-.:)]?\s*", "", key)
+    for candidate in (key, unnumbered):
+        if candidate in LOST_STAGE_LABELS:
+            return DealStage.new_hunt, False
+        stage = STAGE_LABELS.get(candidate)
+        if stage is None:
+            stage = next((s for s in DealStage if candidate.replace(" ", "_") == s.name), None)
+        if stage is not None:
+            return stage, True
+    raise RowValidationError("stage", "unknown_stage", text[:50])
+
+
+def _program(value: object) -> Program:
+    text = _text(value, "program")
+    if text is None:
+        return Program.none
+    key = _label_key(text)
+    if key in NO_PROGRAM_LABELS:
+        return Program.none
+    words = set(re.findall(r"[a-z]+", key))
+    for keyword, program in PROGRAM_KEYWORDS:
+        if keyword in words:
+            return program
+    raise RowValidationError("program", "unknown_program", text[:50])
+
+
+def _funding_type(value: object, program: Program) -> FundingType:
+    text = _text(value, "funding_type")
+    if text is None:
+        # A program label on its own implies AWS funding
+        return FundingType.customer if program == Program.none else FundingType.aws
+    key = _label_key(text)
+    funding_type = FUNDING_LABELS.get(key)
+    if funding_type is None:
+        funding_type = next((f for f in FundingType if key.replace(" ", "_") == f.name), None)
+    if funding_type is None:
+        raise RowValidationError("funding_type", "unknown_funding_type", text[:50])
+    return funding_type
+
+
+def _currency(value: object, deal_value: object, base_currency: str) -> str:
+    text = _text(value, "currency_code")
+    if text is None:
+        # Fall back to a symbol or code on the amount ("S$ 1,200", "1.5k USD")
+        if not isinstance(deal_value, str):
+            return base_currency
+        amount = deal_value.strip().upper()
+        match = _CURRENCY_PREFIX.match(amount)
+        if match:
+            return CURRENCY_ALIASES[match.group(1)]
+        codes = [code for match in _CURRENCY_CODE.finditer(amount) for code in match.groups() if code]
+        return next((code for code in codes if code in SUPPORTED_CURRENCIES), base_currency)
+    code = CURRENCY_ALIASES.get(text.upper(), text.upper())
+    if code not in SUPPORTED_CURRENCIES:
+        raise RowValidationError("currency_code", "unsupported_currency", text[:50])
+    return code
+
+
+def validate_row(
+    row_number: int,
+    cells: Dict[str, object],
+    base_currency: str,
+) -> tuple:
+    """Validate one row (field -> raw cell) into a staged record; raises RowValidationError."""
+    account_name = _text(cells.get("account_name"), "account_name")
+    if account_name is None:
+        raise RowValidationError("account_name", "required")
+    name = _text(cells.get("name"), "name")
+    if name is None:
+        raise RowValidationError("name", "required")
+
+    raw_value = cells.get("deal_value")
+    deal_value = _amount(raw_value)
+    if deal_value < 0:
+        raise RowValidationError("deal_value", "negative_value", str(deal_value))
+    stage, is_active = _stage(cells.get("stage"))
+    program = _program(cells.get("program"))
+
+    return (
+        row_number,
+        account_name,
+        name,
+        stage.name,
+        deal_value,
+        _currency(cells.get("currency_code"), raw_value, base_currency),
+        _funding_type(cells.get("funding_flag"), program).name,
+        program.name,
+        _date(cells.get("expected_close_date")),
+        _text(cells.get("ace_id"), "ace_id"),
+        _text(cells.get("po_id"), "po_id"),
+        _text(cells.get("map_status"), "map_status"),
+        _text(cells.get("owner_ref"), "owner_ref"),
+        _text(cells.get("territory_name"), "territory_name"),
+        _text(cells.get("notes"), "notes"),
+        _text(cells.get("next_action"), "next_action"),
+        is_active,
+    )
+
+
+def validate_chunk(
+    chunk: List[Tuple[int, tuple]],
+    header_map: Dict[int, str],
+    base_currency: str,
+) -> ChunkResult:
+    """Validate a chunk of (row_number, cells) into staged records and row errors."""
+    result = ChunkResult()
+    for row_number, row in chunk:
+        cells = {field_name: row[idx] for idx, field_name in header_map.items() if idx < len(row)}
+        try:
+            result.records.append(validate_row(row_number, cells, base_currency))
+        except RowValidationError as e:
+            result.errors.append(RowError(
+                row_number=row_number,
+                field=e.field,
+                code=e.code,
+                value=None if e.value is None else str(e.value),
+            ))
+    return result
@@ -0,0 +1,18 @@
+from .registry import PermanentJobError, TaskSpec, UnknownTaskError, get_task, registered_tasks, task
+from .queue import JobQueue
+from .worker import JobWorker, retry_delay, start_job_worker, stop_job_worker
+from . import tasks as _builtin_tasks  # noqa: F401  (registers the built-in tasks)
+
+__all__ = [
+    "PermanentJobError",
+    "TaskSpec",
+    "UnknownTaskError",
+    "get_task",
+    "registered_tasks",
+    "task",
+    "JobQueue",
+    "JobWorker",
+    "retry_delay",
+    "start_job_worker",
+    "stop_job_worker",
+]
@@ -0,0 +1,93 @@
+"""
+Job queue CLI
+
+    cd backend
+    python -m app.services.jobs worker [--concurrency 4] [--task risk.refresh_all ...]
+    python -m app.services.jobs enqueue risk.refresh_all [--payload '{}'] [--priority 5]
+                                        [--delay 0] [--dedupe-key KEY]
+    python -m app.services.jobs stats
+    python -m app.services.jobs tasks
+
+``worker`` runs jobs until SIGINT / SIGTERM; start as many processes as
+needed — they share the queue through row claims. ``enqueue`` is what a
+cron entry calls for periodic tasks; pass ``--dedupe-key`` so a slow run
+is not queued twice.
+"""
+
+import argparse
+import asyncio
+import json
+import signal
+
+import structlog
+
+from ...core import database
+from ...core.config import settings
+from ...core.database import init_db
+from . import JobQueue, JobWorker, registered_tasks
+
+logger = structlog.get_logger()
+
+
+async def run_worker(args: argparse.Namespace) -> None:
+    worker = JobWorker(concurrency=args.concurrency, tasks=args.task)
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, worker.stop)
+    await worker.run()
+
+
+async def enqueue(args: argparse.Namespace) -> None:
+    async with database.AsyncSessionLocal() as db:
+        job = await JobQueue(db).enqueue(
+            args.task,
+            json.loads(args.payload),
+            priority=args.priority,
+            delay_seconds=args.delay,
+            dedupe_key=args.dedupe_key,
+        )
+        print(json.dumps({"id": job.id, "task": job.task, "status": job.status.value}))
+
+
+async def stats(args: argparse.Namespace) -> None:
+    async with database.AsyncSessionLocal() as db:
+        print(json.dumps(await JobQueue(db).stats()))
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.command == "tasks":
+        print("\n".join(registered_tasks()))
+        return
+    concurrency = getattr(args, "concurrency", None) or settings.jobs_worker_concurrency
+    init_db(
+        database_url=settings.database_url,
+        pool_size=concurrency + 2,
+        max_overflow=settings.database_max_overflow,
+        echo=settings.debug,
+    )
+    commands = {"worker": run_worker, "enqueue": enqueue, "stats": stats}
+    await commands[args.command](args)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    worker = commands.add_parser("worker", help="run jobs until interrupted")
+    worker.add_argument("--concurrency", type=int, help="jobs run at once (JOBS_WORKER_CONCURRENCY)")
+    worker.add_argument("--task", action="append", help="only run this task (repeatable)")
+
+    enqueue_parser = commands.add_parser("enqueue", help="queue a job")
+    enqueue_parser.add_argument("task", choices=registered_tasks())
+    enqueue_parser.add_argument("--payload", default="{}", help="JSON object passed to the task")
+    enqueue_parser.add_argument("--priority", type=int, help="higher runs first")
+    enqueue_parser.add_argument("--delay", type=float, default=0, help="seconds before the job may run")
+    enqueue_parser.add_argument("--dedupe-key", help="skip if a job with this key is queued or running")
+
+    commands.add_parser("stats", help="print queue depth per status")
+    commands.add_parser("tasks", help="list registered tasks")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
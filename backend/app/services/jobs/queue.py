@@ -0,0 +1,107 @@
+from datetime import timedelta
+from typing import Any, Dict, Optional
+
+import structlog
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.config import settings
+from ...models.background_job import LIVE_STATUSES, BackgroundJob, JobStatus
+from .registry import get_task
+
+logger = structlog.get_logger()
+
+
+class JobQueue:
+    """Enqueues and inspects jobs in the Postgres job queue."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def enqueue(
+        self,
+        task: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        priority: Optional[int] = None,
+        delay_seconds: float = 0,
+        max_attempts: Optional[int] = None,
+        dedupe_key: Optional[str] = None,
+    ) -> BackgroundJob:
+        """Queue a job for ``task``; with a ``dedupe_key`` that is already queued or running, return that job instead."""
+        spec = get_task(task)
+        values = dict(
+            task=task,
+            payload=payload or {},
+            priority=spec.priority if priority is None else priority,
+            status=JobStatus.queued,
+            dedupe_key=dedupe_key,
+            run_after=func.now() + timedelta(seconds=delay_seconds),
+            attempts=0,
+            max_attempts=max_attempts or spec.max_attempts or settings.jobs_max_attempts,
+        )
+        statement = insert(BackgroundJob).values(**values).returning(BackgroundJob)
+        if dedupe_key is not None:
+            statement = statement.on_conflict_do_nothing(
+                index_elements=[BackgroundJob.dedupe_key],
+                index_where=text(f"dedupe_key IS NOT NULL AND {LIVE_STATUSES}"),
+            )
+        try:
+            job = (await self.db.execute(statement)).scalar_one_or_none()
+            deduplicated = job is None
+            if deduplicated:
+                job = (await self.db.execute(
+                    select(BackgroundJob).where(BackgroundJob.dedupe_key == dedupe_key, text(LIVE_STATUSES))
+                )).scalar_one_or_none()
+                if job is None:
+                    # The live job finished between the insert and the lookup
+                    job = (await self.db.execute(statement)).scalar_one()
+                    deduplicated = False
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error enqueuing job", task=task, error=str(e))
+            raise
+
+        logger.info(
+            "Job queued",
+            job_id=job.id,
+            task=task,
+            priority=job.priority,
+            delay_seconds=delay_seconds,
+            dedupe_key=dedupe_key,
+            deduplicated=deduplicated,
+        )
+        return job
+
+    async def get_job(self, job_id: int) -> Optional[BackgroundJob]:
+        return await self.db.get(BackgroundJob, job_id)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Jobs per status, plus how many are ready now and how long the oldest ready one has waited."""
+        by_status = dict((await self.db.execute(
+            select(BackgroundJob.status, func.count()).group_by(BackgroundJob.status)
+        )).all())
+        ready, oldest = (await self.db.execute(
+            select(func.count(), func.min(BackgroundJob.run_after))
+            .where(BackgroundJob.status == JobStatus.queued, BackgroundJob.run_after <= func.now())
+        )).one()
+        now = (await self.db.execute(select(func.now()))).scalar_one()
+        return {
+            **{status.value: by_status.get(status, 0) for status in JobStatus},
+            "ready": ready,
+            "oldest_ready_seconds": round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        }
+
+    async def purge_finished(self, older_than_days: int = 7) -> int:
+        """Delete succeeded and failed jobs that finished more than ``older_than_days`` ago."""
+        result = await self.db.execute(
+            delete(BackgroundJob).where(
+                BackgroundJob.status.in_([JobStatus.succeeded, JobStatus.failed]),
+                BackgroundJob.finished_at < func.now() - timedelta(days=older_than_days),
+            )
+        )
+        await self.db.commit()
+        logger.info("Finished jobs purged", count=result.rowcount, older_than_days=older_than_days)
+        return result.rowcount
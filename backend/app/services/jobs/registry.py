@@ -0,0 +1,57 @@
+"""
+Job task registry
+
+A task is an async handler registered under a stable name; jobs store the
+name and a JSON payload, so a handler can move or be renamed in code as
+long as its registered name stays.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# handler(db, payload) -> JSON-serialisable result (or None)
+JobHandler = Callable[[AsyncSession, Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler for a failure that retrying cannot fix; the job fails at once."""
+    pass
+
+
+class UnknownTaskError(PermanentJobError):
+    """No handler is registered under the job's task name."""
+    pass
+
+
+@dataclass(frozen=True)
+class TaskSpec:
+    name: str
+    handler: JobHandler
+    max_attempts: Optional[int] = None   # None: settings.jobs_max_attempts
+    priority: int = 0                    # default for enqueue()
+
+
+_tasks: Dict[str, TaskSpec] = {}
+
+
+def task(name: str, *, max_attempts: Optional[int] = None, priority: int = 0) -> Callable[[JobHandler], JobHandler]:
+    """Register a handler under ``name``."""
+    def register(handler: JobHandler) -> JobHandler:
+        if name in _tasks and _tasks[name].handler is not handler:
+            raise ValueError(f"Job task already registered: {name}")
+        _tasks[name] = TaskSpec(name=name, handler=handler, max_attempts=max_attempts, priority=priority)
+        return handler
+    return register
+
+
+def get_task(name: str) -> TaskSpec:
+    try:
+        return _tasks[name]
+    except KeyError:
+        raise UnknownTaskError(f"Unknown job task: {name}")
+
+
+def registered_tasks() -> List[str]:
+    return sorted(_tasks)
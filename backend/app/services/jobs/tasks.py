@@ -0,0 +1,83 @@
+"""
+Built-in job tasks
+
+Periodic maintenance that otherwise needs an admin to call an endpoint.
+Schedule with cron (or any scheduler) through the CLI, e.g.
+
+    python -m app.services.jobs enqueue risk.refresh_all --dedupe-key risk-refresh
+"""
+
+from datetime import date
+from typing import Any, Dict, Optional
+
+from sqlalchemy import Date, and_, cast, exists, func, insert, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ...core.config import settings
+from ...models.opportunity import Opportunity
+from ...models.opportunity_snapshot import OpportunitySnapshot
+from ..document_service import DocumentService
+from ..import_wizard import discard_expired_import_jobs
+from ..pipeline_counter_service import PipelineCounterService
+from ..risk_scoring_service import RiskScoringService
+from .queue import JobQueue
+from .registry import task
+
+
+@task("risk.refresh_all")
+async def refresh_risk(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Stall detection: re-score open deals for stall age and overdue close dates."""
+    return {"deals_at_risk": await RiskScoringService(db).refresh_all()}
+
+
+@task("pipeline_counters.reconcile")
+async def reconcile_pipeline_counters(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    report = await PipelineCounterService(db).reconcile(repair=bool(payload.get("repair", False)))
+    return report.model_dump(mode="json", exclude={"drift"})
+
+
+@task("opportunities.snapshot")
+async def snapshot_opportunities(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Record a point-in-time snapshot of every active deal; deals already snapshotted that day are skipped."""
+    snapshot_date: Optional[str] = payload.get("snapshot_date")
+    day = date.fromisoformat(snapshot_date) if snapshot_date else (await db.execute(select(cast(func.now(), Date)))).scalar_one()
+    already = exists().where(and_(
+        OpportunitySnapshot.opportunity_id == Opportunity.id,
+        OpportunitySnapshot.snapshot_date == day,
+    ))
+    rows = (
+        select(
+            Opportunity.id,
+            literal(day, Date),
+            Opportunity.stage,
+            Opportunity.deal_value_sgd,
+            func.date_part("day", func.now() - Opportunity.stage_entered_at).cast(OpportunitySnapshot.days_in_current_stage.type),
+            Opportunity.iat_score,
+        )
+        .where(Opportunity.is_active.is_(True), ~already)
+    )
+    result = await db.execute(
+        insert(OpportunitySnapshot).from_select(
+            ["opportunity_id", "snapshot_date", "stage", "deal_value_sgd", "days_in_current_stage", "iat_score"],
+            rows,
+        )
+    )
+    await db.commit()
+    return {"snapshot_date": day.isoformat(), "snapshots": result.rowcount}
+
+
+@task("documents.purge_unreferenced_blobs")
+async def purge_unreferenced_blobs(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {"purged": await DocumentService(db).purge_unreferenced_blobs(limit=int(payload.get("limit", 100)))}
+
+
+@task("jobs.purge_finished")
+async def purge_finished_jobs(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    return {"purged": await JobQueue(db).purge_finished(older_than_days=int(payload.get("older_than_days", 7)))}
+
+
+@task("imports.discard_expired")
+async def discard_expired_imports(db: AsyncSession, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Release the staged rows and spooled uploads of dry runs never committed and jobs left failed."""
+    older_than_hours = int(payload.get("older_than_hours", settings.import_job_expiry_hours))
+    return {"discarded": await discard_expired_import_jobs(db, older_than_hours)}
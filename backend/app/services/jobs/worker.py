@@ -0,0 +1,301 @@
+"""
+Job queue worker
+
+Claims ready jobs from ``background_jobs`` with a single UPDATE … WHERE
+id = ANY(ARRAY(SELECT … FOR UPDATE SKIP LOCKED)), highest priority first,
+and runs each on its own session. A claim holds the job until
+``locked_until`` — the visibility timeout, pushed forward by a heartbeat
+while the worker is alive — so a crashed worker's jobs run again elsewhere
+once it lapses. Every later transition is conditional on still holding the
+claim (same ``locked_by`` and attempt), so a worker that lost its job to a
+takeover cannot overwrite the new attempt's outcome.
+
+A failed job is queued again after an exponential backoff with jitter;
+after ``max_attempts`` attempts, or on ``PermanentJobError``, it is
+marked failed.
+"""
+
+import asyncio
+import os
+import random
+import socket
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+import structlog
+from sqlalchemy import and_, any_, func, or_, select, update
+
+from ...core import database
+from ...core.config import settings
+from ...core.metrics import concurrency_metric
+from ...models.background_job import BackgroundJob, JobStatus
+from .registry import PermanentJobError, get_task
+
+logger = structlog.get_logger()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds before retrying a job that has failed ``attempts`` times: doubling, capped, jittered."""
+    delay = min(settings.jobs_retry_max_seconds, settings.jobs_retry_base_seconds * 2 ** (attempts - 1))
+    # Jitter spreads out jobs that failed together (e.g. during an outage)
+    return delay * random.uniform(0.5, 1.0)
+
+
+@dataclass
+class _Claim:
+    id: int
+    task: str
+    payload: Dict[str, Any]
+    attempts: int
+    max_attempts: int
+
+
+class JobWorker:
+    """Runs queued jobs, up to ``concurrency`` at a time, until stopped."""
+
+    def __init__(
+        self,
+        worker_id: Optional[str] = None,
+        concurrency: Optional[int] = None,
+        tasks: Optional[Sequence[str]] = None,
+    ):
+        self.worker_id = worker_id or default_worker_id()
+        self.concurrency = concurrency or settings.jobs_worker_concurrency
+        self.tasks = list(tasks) if tasks else None     # None: every task
+        self.metric = concurrency_metric("jobs", limit=self.concurrency)
+        self._running: Dict[int, asyncio.Task] = {}
+        self._stopping = asyncio.Event()
+        self._wake = asyncio.Event()
+
+    def _visibility(self):
+        return func.now() + timedelta(seconds=settings.jobs_visibility_timeout_seconds)
+
+    def _mine(self, claim: _Claim):
+        return and_(
+            BackgroundJob.id == claim.id,
+            BackgroundJob.status == JobStatus.running,
+            BackgroundJob.locked_by == self.worker_id,
+            BackgroundJob.attempts == claim.attempts,
+        )
+
+    async def _claim(self, limit: int) -> List[_Claim]:
+        """Atomically claim up to ``limit`` ready (or abandoned) jobs."""
+        claimable = (
+            select(BackgroundJob.id)
+            .where(or_(
+                and_(BackgroundJob.status == JobStatus.queued, BackgroundJob.run_after <= func.now()),
+                and_(BackgroundJob.status == JobStatus.running, BackgroundJob.locked_until < func.now()),
+            ))
+            .order_by(BackgroundJob.priority.desc(), BackgroundJob.run_after, BackgroundJob.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        if self.tasks:
+            claimable = claimable.where(BackgroundJob.task.in_(self.tasks))
+        async with database.AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.id == any_(func.array(claimable.scalar_subquery())))
+                .values(
+                    status=JobStatus.running,
+                    locked_by=self.worker_id,
+                    locked_until=self._visibility(),
+                    attempts=BackgroundJob.attempts + 1,
+                    started_at=func.now(),
+                )
+                .returning(
+                    BackgroundJob.id,
+                    BackgroundJob.task,
+                    BackgroundJob.payload,
+                    BackgroundJob.attempts,
+                    BackgroundJob.max_attempts,
+                )
+                .execution_options(synchronize_session=False)
+            )
+            claims = [_Claim(*row) for row in result.all()]
+            # Only a job whose previous worker died on its last attempt gets here
+            exhausted = [claim.id for claim in claims if claim.attempts > claim.max_attempts]
+            if exhausted:
+                await db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.id.in_(exhausted))
+                    .values(
+                        status=JobStatus.failed,
+                        attempts=BackgroundJob.attempts - 1,
+                        locked_by=None,
+                        locked_until=None,
+                        finished_at=func.now(),
+                        last_error="Visibility timeout expired on the last attempt",
+                    )
+                )
+                logger.warning("Jobs failed after visibility timeout", job_ids=exhausted)
+            await db.commit()
+        return [claim for claim in claims if claim.attempts <= claim.max_attempts]
+
+    async def _succeed(self, claim: _Claim, result: Optional[Dict[str, Any]]) -> bool:
+        async with database.AsyncSessionLocal() as db:
+            updated = await db.execute(
+                update(BackgroundJob)
+                .where(self._mine(claim))
+                .values(
+                    status=JobStatus.succeeded,
+                    result=result,
+                    locked_by=None,
+                    locked_until=None,
+                    finished_at=func.now(),
+                    last_error=None,
+                )
+            )
+            await db.commit()
+        return updated.rowcount > 0
+
+    async def _fail(self, claim: _Claim, error: Exception) -> Optional[float]:
+        """Queue the job again after a backoff, or mark it failed; returns the delay when retried."""
+        final = isinstance(error, PermanentJobError) or claim.attempts >= claim.max_attempts
+        delay = None if final else retry_delay(claim.attempts)
+        values: Dict[str, Any] = dict(
+            locked_by=None,
+            locked_until=None,
+            last_error=f"{type(error).__name__}: {error}"[:2000],
+        )
+        if final:
+            values.update(status=JobStatus.failed, finished_at=func.now())
+        else:
+            values.update(status=JobStatus.queued, run_after=func.now() + timedelta(seconds=delay))
+        async with database.AsyncSessionLocal() as db:
+            await db.execute(update(BackgroundJob).where(self._mine(claim)).values(**values))
+            await db.commit()
+        return delay
+
+    async def _execute(self, claim: _Claim, submitted_at: float) -> None:
+        log = logger.bind(job_id=claim.id, task=claim.task, attempt=claim.attempts, worker_id=self.worker_id)
+        try:
+            with self.metric.running(submitted_at):
+                spec = get_task(claim.task)
+                async with database.AsyncSessionLocal() as db:
+                    result = await spec.handler(db, claim.payload)
+            if await self._succeed(claim, result):
+                log.info("Job succeeded")
+            else:
+                log.warning("Job claim lost before completion")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            try:
+                delay = await self._fail(claim, e)
+            except Exception as fail_error:
+                log.error("Job failure not recorded", error=str(e), record_error=str(fail_error))
+            else:
+                if delay is None:
+                    log.error("Job failed", error=str(e), exc_info=True)
+                else:
+                    log.warning("Job failed; retrying", error=str(e), retry_in_seconds=round(delay, 1))
+        finally:
+            self._running.pop(claim.id, None)
+            self._wake.set()
+
+    async def _heartbeat(self) -> None:
+        """Extend the visibility timeout of every job this worker is running."""
+        interval = settings.jobs_visibility_timeout_seconds / 3
+        while True:
+            await asyncio.sleep(interval)
+            if not self._running:
+                continue
+            try:
+                async with database.AsyncSessionLocal() as db:
+                    await db.execute(
+                        update(BackgroundJob)
+                        .where(
+                            BackgroundJob.id.in_(list(self._running)),
+                            BackgroundJob.locked_by == self.worker_id,
+                            BackgroundJob.status == JobStatus.running,
+                        )
+                        .values(locked_until=self._visibility())
+                    )
+                    await db.commit()
+            except Exception as e:
+                logger.warning("Job heartbeat failed", worker_id=self.worker_id, error=str(e))
+
+    async def _release_all(self) -> None:
+        """Put this worker's interrupted jobs straight back in the queue (shutdown)."""
+        async with database.AsyncSessionLocal() as db:
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.locked_by == self.worker_id, BackgroundJob.status == JobStatus.running)
+                .values(
+                    status=JobStatus.queued,
+                    locked_by=None,
+                    locked_until=None,
+                    run_after=func.now(),
+                    # An interrupted attempt does not count against the job
+                    attempts=func.greatest(BackgroundJob.attempts - 1, 0),
+                )
+                .returning(BackgroundJob.id)
+            )
+            released = result.scalars().all()
+            await db.commit()
+        if released:
+            logger.info("Interrupted jobs released", worker_id=self.worker_id, count=len(released))
+
+    async def run(self) -> None:
+        """Claim and run jobs until ``stop()``; jobs still running then are cancelled and requeued."""
+        logger.info("Job worker started", worker_id=self.worker_id, concurrency=self.concurrency, tasks=self.tasks)
+        heartbeat = asyncio.create_task(self._heartbeat())
+        try:
+            while not self._stopping.is_set():
+                free = self.concurrency - len(self._running)
+                claims: List[_Claim] = []
+                if free:
+                    try:
+                        claims = await self._claim(free)
+                    except Exception as e:
+                        logger.error("Job claim failed", worker_id=self.worker_id, error=str(e))
+                for claim in claims:
+                    submitted_at = self.metric.submitted()
+                    self._running[claim.id] = asyncio.create_task(self._execute(claim, submitted_at))
+                if claims and len(claims) == free:
+                    continue
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), settings.jobs_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            tasks = [heartbeat, *self._running.values()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._release_all()
+            logger.info("Job worker stopped", worker_id=self.worker_id)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+
+
+_worker: Optional[JobWorker] = None
+_worker_task: Optional[asyncio.Task] = None
+
+
+def start_job_worker(worker: Optional[JobWorker] = None) -> JobWorker:
+    """Run a job worker in the background of this process (API startup with JOBS_WORKER_IN_API)."""
+    global _worker, _worker_task
+    if _worker_task is None or _worker_task.done():
+        _worker = worker or JobWorker()
+        _worker_task = asyncio.create_task(_worker.run())
+    return _worker
+
+
+async def stop_job_worker() -> None:
+    global _worker, _worker_task
+    worker, task = _worker, _worker_task
+    _worker = _worker_task = None
+    if worker is not None:
+        worker.stop()
+        await asyncio.gather(task, return_exceptions=True)
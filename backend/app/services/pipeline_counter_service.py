@@ -0,0 +1,214 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, delete, insert, text, or_, cast, Numeric
+from typing import Optional, List, Tuple
+from datetime import datetime
+from decimal import Decimal
+import structlog
+from ..models.opportunity import Opportunity, DealStage, FundingType
+from ..models.pipeline_counter import PipelineCounter
+from ..schemas.dashboard import (
+    PipelineStageTotalSchema,
+    PipelineSummarySchema,
+    PipelineCounterDriftSchema,
+    PipelineCounterReconcileSchema,
+)
+
+logger = structlog.get_logger()
+
+# Stage 5 is the order book (won); everything before it is open pipeline.
+OPEN_STAGES = [stage for stage in DealStage if stage != DealStage.order_book]
+
+
+def _actual_groups_query():
+    """Full-scan aggregate of active opportunities — the source of truth for reconciliation."""
+    return (
+        select(
+            Opportunity.stage.label("stage"),
+            Opportunity.territory_id.label("territory_id"),
+            Opportunity.owner_id.label("owner_id"),
+            Opportunity.funding_type.label("funding_type"),
+            func.count().label("deal_count"),
+            func.coalesce(
+                func.sum(func.round(cast(Opportunity.deal_value_sgd, Numeric), 2)),
+                0,
+            ).label("value_sgd"),
+        )
+        .where(Opportunity.is_active.is_(True))
+        .group_by(
+            Opportunity.stage,
+            Opportunity.territory_id,
+            Opportunity.owner_id,
+            Opportunity.funding_type,
+        )
+    )
+
+
+class PipelineCounterService:
+    """Reads and reconciles the trigger-maintained ``pipeline_counters`` table."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_summary(
+        self,
+        territory_id: Optional[int] = None,
+        owner_id: Optional[int] = None,
+        funding_type: Optional[FundingType] = None,
+    ) -> PipelineSummarySchema:
+        """Headline pipeline KPIs — O(groups), never scans ``opportunities``."""
+        query = (
+            select(
+                PipelineCounter.stage,
+                func.sum(PipelineCounter.deal_count),
+                func.sum(PipelineCounter.value_sgd),
+            )
+            .where(PipelineCounter.deal_count > 0)
+            .group_by(PipelineCounter.stage)
+        )
+        if territory_id is not None:
+            query = query.where(PipelineCounter.territory_id == territory_id)
+        if owner_id is not None:
+            query = query.where(PipelineCounter.owner_id == owner_id)
+        if funding_type is not None:
+            query = query.where(PipelineCounter.funding_type == funding_type)
+
+        result = await self.db.execute(query)
+        totals = {stage: (int(count or 0), Decimal(value or 0)) for stage, count, value in result.all()}
+
+        by_stage = [
+            PipelineStageTotalSchema(
+                stage=stage,
+                deal_count=totals.get(stage, (0, Decimal(0)))[0],
+                value_sgd=totals.get(stage, (0, Decimal(0)))[1],
+            )
+            for stage in DealStage
+        ]
+        open_totals = [row for row in by_stage if row.stage in OPEN_STAGES]
+        order_book = totals.get(DealStage.order_book, (0, Decimal(0)))
+
+        return PipelineSummarySchema(
+            total_pipeline_value=sum((row.value_sgd for row in open_totals), Decimal(0)),
+            deals_in_progress=sum(row.deal_count for row in open_totals),
+            order_book_value=order_book[1],
+            order_book_deals=order_book[0],
+            by_stage=by_stage,
+        )
+
+    async def find_drift(self) -> Tuple[int, List[PipelineCounterDriftSchema]]:
+        """
+        Compare the counters with a full aggregate of ``opportunities``.
+
+        Returns (groups_checked, drifted_groups). Runs as a single statement, so
+        both sides are read from the same snapshot.
+        """
+        actual = _actual_groups_query().subquery("actual")
+        counters = (
+            select(PipelineCounter)
+            .where(or_(PipelineCounter.deal_count != 0, PipelineCounter.value_sgd != 0))
+            .subquery("counters")
+        )
+
+        # FULL JOIN needs hashable join conditions, so NULL territories are
+        # coalesced rather than compared with IS NOT DISTINCT FROM.
+        joined = actual.join(
+            counters,
+            (actual.c.stage == counters.c.stage)
+            & (func.coalesce(actual.c.territory_id, -1) == func.coalesce(counters.c.territory_id, -1))
+            & (actual.c.owner_id == counters.c.owner_id)
+            & (actual.c.funding_type == counters.c.funding_type),
+            full=True,
+        )
+        counted_deals = func.coalesce(counters.c.deal_count, 0)
+        actual_deals = func.coalesce(actual.c.deal_count, 0)
+        counted_value = func.coalesce(counters.c.value_sgd, 0)
+        actual_value = func.coalesce(actual.c.value_sgd, 0)
+        drifted = (counted_deals != actual_deals) | (counted_value != actual_value)
+
+        query = select(
+            func.coalesce(actual.c.stage, counters.c.stage).label("stage"),
+            func.coalesce(actual.c.territory_id, counters.c.territory_id).label("territory_id"),
+            func.coalesce(actual.c.owner_id, counters.c.owner_id).label("owner_id"),
+            func.coalesce(actual.c.funding_type, counters.c.funding_type).label("funding_type"),
+            counted_deals.label("counted_deals"),
+            actual_deals.label("actual_deals"),
+            counted_value.label("counted_value_sgd"),
+            actual_value.label("actual_value_sgd"),
+            drifted.label("drifted"),
+        ).select_from(joined)
+
+        result = await self.db.execute(query)
+        rows = result.mappings().all()
+        drift = [
+            PipelineCounterDriftSchema(
+                stage=row["stage"],
+                territory_id=row["territory_id"],
+                owner_id=row["owner_id"],
+                funding_type=row["funding_type"],
+                counted_deals=row["counted_deals"],
+                actual_deals=row["actual_deals"],
+                counted_value_sgd=row["counted_value_sgd"],
+                actual_value_sgd=row["actual_value_sgd"],
+            )
+            for row in rows
+            if row["drifted"]
+        ]
+        return len(rows), drift
+
+    async def rebuild(self) -> None:
+        """
+        Rebuild every counter row from ``opportunities``.
+
+        Takes a SHARE lock on ``opportunities`` for the duration of the
+        transaction so no write can slip between the delete and the re-insert.
+        Reads are not blocked.
+        """
+        try:
+            await self.db.execute(text("LOCK TABLE opportunities IN SHARE MODE"))
+            await self.db.execute(delete(PipelineCounter))
+            actual = _actual_groups_query().subquery()
+            await self.db.execute(
+                insert(PipelineCounter).from_select(
+                    ["stage", "territory_id", "owner_id", "funding_type", "deal_count", "value_sgd", "updated_at"],
+                    select(
+                        actual.c.stage,
+                        actual.c.territory_id,
+                        actual.c.owner_id,
+                        actual.c.funding_type,
+                        actual.c.deal_count,
+                        actual.c.value_sgd,
+                        func.now(),
+                    ),
+                )
+            )
+            await self.db.commit()
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error rebuilding pipeline counters", error=str(e), exc_info=True)
+            raise
+
+    async def reconcile(self, repair: bool = False) -> PipelineCounterReconcileSchema:
+        """Reconciliation job: detect counter drift and optionally rebuild."""
+        groups_checked, drift = await self.find_drift()
+
+        if drift:
+            logger.warning(
+                "Pipeline counter drift detected",
+                drifted_groups=len(drift),
+                groups_checked=groups_checked,
+                repair=repair,
+            )
+        else:
+            logger.info("Pipeline counters reconciled", groups_checked=groups_checked)
+
+        repaired = False
+        if drift and repair:
+            await self.rebuild()
+            repaired = True
+
+        return PipelineCounterReconcileSchema(
+            groups_checked=groups_checked,
+            drifted_groups=len(drift),
+            drift=drift,
+            repaired=repaired,
+            checked_at=datetime.utcnow(),
+        )
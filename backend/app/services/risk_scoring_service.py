@@ -0,0 +1,137 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, text
+from typing import Optional, List
+from decimal import Decimal
+import structlog
+from ..models.opportunity import Opportunity, DealStage, HealthStatus, O2RPhase
+from ..models.opportunity_risk import OpportunityRisk, RiskSeverity
+from ..schemas.dashboard import AttentionRequiredItemSchema, AttentionRequiredResponseSchema
+
+logger = structlog.get_logger()
+
+# Scoring itself lives in the database (opportunity_risk_score(), migration
+# 8b2d4e6f1a90) so triggers, set-based imports and the refresh job all rank
+# deals identically. These mirror its thresholds for the human-readable reasons.
+STALL_WATCH_DAYS = 15
+STALL_DAYS = 30
+
+STAGE_PROBABILITY = {
+    DealStage.new_hunt: 10,
+    DealStage.discovery: 25,
+    DealStage.proposal: 50,
+    DealStage.negotiation: 75,
+    DealStage.order_book: 100,
+}
+
+STAGE_O2R_PHASE = {
+    DealStage.new_hunt: O2RPhase.phase_1,
+    DealStage.discovery: O2RPhase.phase_1,
+    DealStage.proposal: O2RPhase.phase_2,
+    DealStage.negotiation: O2RPhase.phase_2,
+    DealStage.order_book: O2RPhase.phase_3,
+}
+
+
+def _risk_reasons(risk: OpportunityRisk, stage: DealStage) -> List[str]:
+    """Explain a risk score in the terms the stall register uses."""
+    reasons = []
+    if risk.days_in_stage > STALL_DAYS:
+        reasons.append(f"Stalled {risk.days_in_stage} days in {stage.value}")
+    elif risk.days_in_stage >= STALL_WATCH_DAYS:
+        reasons.append(f"{risk.days_in_stage} days in {stage.value}")
+    if risk.overdue_days > 0:
+        reasons.append(f"Close date overdue by {risk.overdue_days} days")
+    if risk.missing_ace_fields:
+        reasons.append("Missing ACE opportunity ID")
+    if risk.health_status in (HealthStatus.red, HealthStatus.amber):
+        reasons.append(f"Health {risk.health_status.value}")
+    return reasons
+
+
+class RiskScoringService:
+    """Reads the precomputed attention-required ranking and runs its refresh job."""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def get_attention_required(
+        self,
+        limit: int = 10,
+        territory_id: Optional[int] = None,
+        owner_id: Optional[int] = None,
+    ) -> AttentionRequiredResponseSchema:
+        """Top-K risky deals plus critical / warning counts — no per-request scoring."""
+        filters = []
+        if territory_id is not None:
+            filters.append(Opportunity.territory_id == territory_id)
+        if owner_id is not None:
+            filters.append(Opportunity.owner_id == owner_id)
+
+        count_query = (
+            select(OpportunityRisk.severity, func.count())
+            .group_by(OpportunityRisk.severity)
+        )
+        if filters:
+            count_query = count_query.join(
+                Opportunity, Opportunity.id == OpportunityRisk.opportunity_id
+            ).where(*filters)
+        count_result = await self.db.execute(count_query)
+        counts = {severity: count for severity, count in count_result.all()}
+
+        query = (
+            select(OpportunityRisk, Opportunity)
+            .join(Opportunity, Opportunity.id == OpportunityRisk.opportunity_id)
+            .where(*filters)
+            .order_by(OpportunityRisk.risk_score.desc(), OpportunityRisk.opportunity_id)
+            .limit(limit)
+        )
+        result = await self.db.execute(query)
+
+        items = [
+            AttentionRequiredItemSchema(
+                id=opportunity.id,
+                name=opportunity.name,
+                amount_sgd=Decimal(str(opportunity.deal_value_sgd)),
+                amount_local=Decimal(str(opportunity.deal_value)),
+                local_currency=opportunity.currency_code,
+                probability=STAGE_PROBABILITY[opportunity.stage],
+                phase=STAGE_O2R_PHASE[opportunity.stage],
+                health_status=opportunity.health_status,
+                territory_id=opportunity.territory_id,
+                account_id=opportunity.account_id,
+                created_at=opportunity.created_at,
+                updated_at=opportunity.updated_at,
+                risk_score=risk.risk_score,
+                severity=risk.severity.value,
+                risk_reasons=_risk_reasons(risk, opportunity.stage),
+            )
+            for risk, opportunity in result.all()
+        ]
+
+        critical_count = counts.get(RiskSeverity.critical, 0)
+        warning_count = counts.get(RiskSeverity.warning, 0)
+        return AttentionRequiredResponseSchema(
+            items=items,
+            total_count=critical_count + warning_count,
+            critical_count=critical_count,
+            warning_count=warning_count,
+        )
+
+    async def refresh_all(self) -> int:
+        """
+        Re-score every open deal.
+
+        Writes already re-score the rows they touch; this picks up the
+        time-based components (stall age, overdue close dates) that change
+        without a write. Returns the number of deals now requiring attention.
+        """
+        try:
+            result = await self.db.execute(text("SELECT opportunity_risk_refresh_all()"))
+            risky = result.scalar_one()
+            await self.db.commit()
+            logger.info("Opportunity risk ranking refreshed", deals_at_risk=risky)
+            return risky
+        except Exception as e:
+            await self.db.rollback()
+            logger.error("Error refreshing opportunity risk ranking", error=str(e), exc_info=True)
+            raise
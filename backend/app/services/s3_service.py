@@ -2,64 +2,242 @@
 S3 Service for file storage operations
 """
 
+import asyncio
 import boto3
 import logging
-from typing import Optional, BinaryIO, Dict, Any
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, BinaryIO, Dict, Any, AsyncIterator, Callable, List, Tuple, TypeVar
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
 from fastapi import HTTPException
 import os
 from datetime import datetime, timedelta
+from ..core.config import settings
+from ..core.metrics import concurrency_metric
+from .storage.base import ObjectStream, StorageBackend
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar('T')
 
-class S3Service:
-    """Service for handling S3 file operations"""
-    
-    def __init__(self):
-        self.bucket_name = os.getenv('S3_BUCKET_NAME', 'pipeline-pulse-uploads')
-        self.region = os.getenv('AWS_REGION', 'ap-southeast-1')
-        self.s3_client = None
-        self.initialization_error = None
+# boto3 is blocking: every S3 call runs on this bounded pool, never on the
+# event loop. The client's connection pool matches the pool size so a
+# thread never waits for an HTTP connection.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
 
-        try:
-            # Initialize S3 client - let boto3 handle credentials automatically
-            # In ECS, this will use the task's IAM role
-            logger.info(f"🔧 Initializing S3 client for region: {self.region}")
-            self.s3_client = boto3.client('s3', region_name=self.region)
-            logger.info(f"🔧 S3 client created successfully")
 
-            # Test connection with better error handling
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.aws_s3_max_concurrency,
+                thread_name_prefix='s3'
+            )
+        return _executor
+
+
+def shutdown_s3_executor() -> None:
+    """Stop the S3 worker threads (application shutdown)."""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _client_config() -> Config:
+    return Config(
+        max_pool_connections=settings.aws_s3_max_concurrency,
+        retries={'max_attempts': 3, 'mode': 'standard'}
+    )
+
+
+# One boto3 client per process (clients are thread-safe), created on first
+# use or by the startup warm-up — never per S3Service instance. A failed
+# creation (e.g. task-role credentials not served yet) is kept for reporting
+# and retried on the first call after CLIENT_RETRY_SECONDS.
+CLIENT_RETRY_SECONDS = 10
+_client = None
+_client_error: Optional[str] = None
+_client_retry_at = 0.0
+_client_lock = threading.Lock()
+
+# Bucket reachability, refreshed by the background probe instead of a
+# head_bucket round trip on every instantiation
+_bucket_status: Dict[str, Any] = {'status': 'unknown', 'checked_at': None, 'message': 'Not checked yet'}
+_probe_task: Optional[asyncio.Task] = None
+
+# Signed URLs by (key, method): (url, requested expiration, expires at).
+# Signing is pure CPU but runs on the event loop, once per link rendered; a
+# URL is reused until aws_s3_presigned_url_cache_margin_seconds before it
+# expires, so a client handed a cached link still has that long to use it.
+_presigned_urls: "OrderedDict[Tuple[str, str], Tuple[str, int, float]]" = OrderedDict()
+
+
+def _cached_presigned_url(s3_key: str, http_method: str, expiration: int) -> Optional[str]:
+    entry = _presigned_urls.get((s3_key, http_method))
+    if entry is None:
+        return None
+    url, signed_for, expires_at = entry
+    if signed_for != expiration or expires_at - time.time() < settings.aws_s3_presigned_url_cache_margin_seconds:
+        del _presigned_urls[(s3_key, http_method)]
+        return None
+    _presigned_urls.move_to_end((s3_key, http_method))
+    return url
+
+
+def _cache_presigned_url(s3_key: str, http_method: str, expiration: int, url: str) -> None:
+    if expiration <= settings.aws_s3_presigned_url_cache_margin_seconds:
+        return
+    _presigned_urls[(s3_key, http_method)] = (url, expiration, time.time() + expiration)
+    _presigned_urls.move_to_end((s3_key, http_method))
+    while len(_presigned_urls) > settings.aws_s3_presigned_url_cache_size:
+        _presigned_urls.popitem(last=False)
+
+
+def _forget_presigned_urls(s3_key: str) -> None:
+    for http_method in ('GET', 'PUT'):
+        _presigned_urls.pop((s3_key, http_method), None)
+
+
+def get_s3_client():
+    """Return the shared S3 client, creating it on first use (None if creation failed and is not due for a retry)."""
+    global _client, _client_error, _client_retry_at
+    if _client is not None:
+        return _client
+    with _client_lock:
+        if _client is None and time.monotonic() >= _client_retry_at:
+            region = settings.aws_region
             try:
-                logger.info(f"🔧 Testing S3 bucket access: {self.bucket_name}")
-                self.s3_client.head_bucket(Bucket=self.bucket_name)
-                logger.info(f"✅ S3 service initialized successfully for bucket: {self.bucket_name}")
-            except ClientError as e:
-                error_code = e.response['Error']['Code']
-                error_msg = e.response['Error']['Message']
-                if error_code == '403':
-                    logger.warning(f"⚠️  S3 bucket access denied for {self.bucket_name}: {error_msg}")
-                    logger.warning(f"⚠️  Service will continue but S3 operations will fail")
-                elif error_code == '404':
-                    logger.warning(f"⚠️  S3 bucket {self.bucket_name} not found: {error_msg}")
-                    logger.warning(f"⚠️  Service will continue but S3 operations will fail")
-                else:
-                    logger.warning(f"⚠️  S3 bucket test failed ({error_code}): {error_msg}")
-                    logger.warning(f"⚠️  Service will continue but S3 operations will fail")
+                # Let boto3 handle credentials automatically - in ECS this is the task's IAM role
+                logger.info(f"🔧 Initializing S3 client for region: {region}")
+                _client = boto3.client(
+                    's3',
+                    region_name=region,
+                    endpoint_url=settings.aws_s3_endpoint_url or None,
+                    config=_client_config()
+                )
+                _client_error = None
+                logger.info(f"🔧 S3 client created successfully")
+            except NoCredentialsError as e:
+                _client_error = f"AWS credentials not found - check IAM role configuration: {e}"
+                _client_retry_at = time.monotonic() + CLIENT_RETRY_SECONDS
+                logger.error(f"❌ {_client_error}")
             except Exception as e:
-                logger.warning(f"⚠️  S3 bucket test failed with unexpected error: {e}")
-                logger.warning(f"⚠️  Service will continue but S3 operations will fail")
-
-        except NoCredentialsError as e:
-            error_msg = f"AWS credentials not found - check IAM role configuration: {e}"
-            logger.error(f"❌ {error_msg}")
-            self.initialization_error = error_msg
-            self.s3_client = None
+                _client_error = f"Failed to initialize S3 service: {type(e).__name__}: {e}"
+                _client_retry_at = time.monotonic() + CLIENT_RETRY_SECONDS
+                logger.error(f"❌ {_client_error}")
+        return _client
+
+
+def _probe_bucket(bucket_name: str) -> Dict[str, Any]:
+    """Blocking head_bucket check, run on the S3 pool."""
+    checked_at = datetime.utcnow().isoformat()
+    client = get_s3_client()
+    if client is None:
+        return {'status': 'unhealthy', 'checked_at': checked_at, 'message': _client_error}
+    try:
+        client.head_bucket(Bucket=bucket_name)
+        return {'status': 'healthy', 'checked_at': checked_at, 'message': f"Bucket {bucket_name} reachable"}
+    except ClientError as e:
+        error_code = e.response['Error']['Code']
+        error_msg = e.response['Error']['Message']
+        if error_code == '403':
+            message = f"S3 bucket access denied for {bucket_name}: {error_msg}"
+        elif error_code == '404':
+            message = f"S3 bucket {bucket_name} not found: {error_msg}"
+        else:
+            message = f"S3 bucket test failed ({error_code}): {error_msg}"
+    except Exception as e:
+        message = f"S3 bucket test failed with unexpected error: {e}"
+    return {'status': 'unhealthy', 'checked_at': checked_at, 'message': message}
+
+
+async def check_s3_bucket() -> Dict[str, Any]:
+    """Probe the bucket now and update the cached status."""
+    global _bucket_status
+    bucket_name = settings.aws_s3_bucket_name
+    status = await asyncio.wrap_future(_get_executor().submit(_probe_bucket, bucket_name))
+    if status['status'] != _bucket_status['status']:
+        log = logger.info if status['status'] == 'healthy' else logger.warning
+        log(f"S3 bucket status {_bucket_status['status']} -> {status['status']}: {status['message']}")
+    _bucket_status = status
+    return status
+
+
+def s3_bucket_status() -> Dict[str, Any]:
+    """Last probed bucket status (no network call)."""
+    return dict(_bucket_status)
+
+
+async def _probe_loop() -> None:
+    while True:
+        try:
+            await check_s3_bucket()
         except Exception as e:
-            error_msg = f"Failed to initialize S3 service: {type(e).__name__}: {e}"
-            logger.error(f"❌ {error_msg}")
-            self.initialization_error = error_msg
-            self.s3_client = None
+            logger.warning(f"⚠️  S3 health probe failed: {e}")
+        await asyncio.sleep(settings.aws_s3_health_check_interval_seconds)
+
+
+def start_s3_health_probe() -> None:
+    """Warm the shared client and keep the bucket status fresh in the background (application startup)."""
+    global _probe_task
+    if _probe_task is None or _probe_task.done():
+        _probe_task = asyncio.create_task(_probe_loop())
+
+
+async def stop_s3_health_probe() -> None:
+    global _probe_task
+    task, _probe_task = _probe_task, None
+    if task is not None:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class S3Service(StorageBackend):
+    """Service for handling S3 file operations (the S3 storage backend)"""
+
+    name = 's3'
+
+    def __init__(self):
+        # Cheap: the boto3 client is shared and created lazily, the bucket is probed in the background
+        self.bucket_name = settings.aws_s3_bucket_name
+        self.region = settings.aws_region
+
+    @property
+    def s3_client(self):
+        return get_s3_client()
+
+    @property
+    def initialization_error(self) -> Optional[str]:
+        return _client_error
+
+    async def _run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Run blocking boto3 work on the S3 pool, tracking queue depth and latency."""
+        metric = concurrency_metric('s3', limit=settings.aws_s3_max_concurrency)
+        submitted_at = metric.submitted()
+
+        def call() -> T:
+            with metric.running(submitted_at):
+                return func(*args, **kwargs)
+
+        future = _get_executor().submit(call)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Cancelled while still queued: it will never start, so stop counting it
+            if future.cancelled():
+                metric.cancelled()
+            raise
+
+    async def _call(self, operation: str, **kwargs) -> Dict[str, Any]:
+        """Call an S3 client operation off the event loop."""
+        return await self._run(getattr(self.s3_client, operation), **kwargs)
 
     def _check_initialization(self):
         """Check if S3 service is properly initialized, raise HTTPException if not"""
@@ -103,7 +281,7 @@ class S3Service:
                 upload_params['Metadata'] = metadata
             
             # Upload file
-            response = self.s3_client.put_object(**upload_params)
+            response = await self._call('put_object', **upload_params)
             
             logger.info(f"File uploaded successfully to S3: s3://{self.bucket_name}/{s3_key}")
             
@@ -125,6 +303,222 @@ class S3Service:
                 detail=f"Failed to upload file to S3: {error_code}"
             )
     
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        s3_key: str,
+        content_type: str = 'application/octet-stream',
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Upload a byte stream to S3 without holding it in memory
+
+        Chunks are cut into parts of ``aws_s3_multipart_part_size_mb`` and
+        sent as a multipart upload, at most ``aws_s3_multipart_concurrency``
+        parts at a time; the stream is not read further while every slot is
+        busy, so memory stays around (concurrency + 1) parts. Streams that
+        end before the first part fills go up as a single object. On any
+        failure (or cancellation) the multipart upload is aborted so no
+        orphaned parts are billed.
+
+        Args:
+            chunks: Async iterator of file content
+            s3_key: S3 object key (file path in bucket)
+            content_type: MIME type of the file
+            metadata: Optional metadata to store with file
+
+        Returns:
+            Dict with upload result information
+        """
+        self._check_initialization()
+        part_size = settings.aws_s3_multipart_part_size_mb * 1024 * 1024
+        stream = chunks.__aiter__()
+
+        buffer = bytearray()
+        async for chunk in stream:
+            buffer += chunk
+            if len(buffer) >= part_size:
+                break
+        else:
+            return await self.upload_file(bytes(buffer), s3_key, content_type, metadata)
+
+        params = {
+            'Bucket': self.bucket_name,
+            'Key': s3_key,
+            'ContentType': content_type,
+            'ServerSideEncryption': 'AES256'
+        }
+        if metadata:
+            params['Metadata'] = metadata
+        try:
+            upload_id = (await self._call('create_multipart_upload', **params))['UploadId']
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error(f"Failed to start multipart upload to S3: {error_code} - {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to upload file to S3: {error_code}"
+            )
+
+        slots = asyncio.Semaphore(settings.aws_s3_multipart_concurrency)
+        uploads: List[asyncio.Task] = []
+        size_bytes = 0
+
+        async def upload_part(part_number: int, body: bytes) -> Dict[str, Any]:
+            try:
+                response = await self._call(
+                    'upload_part',
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id,
+                    PartNumber=part_number,
+                    Body=body
+                )
+                return {'PartNumber': part_number, 'ETag': response['ETag']}
+            finally:
+                slots.release()
+
+        async def send(body: bytes) -> None:
+            nonlocal size_bytes
+            await slots.acquire()
+            # Surface a failed part before reading more of the stream
+            for upload in uploads:
+                if upload.done() and upload.exception() is not None:
+                    slots.release()
+                    raise upload.exception()
+            size_bytes += len(body)
+            uploads.append(asyncio.create_task(upload_part(len(uploads) + 1, body)))
+
+        try:
+            while True:
+                while len(buffer) >= part_size:
+                    body = bytes(buffer[:part_size])
+                    del buffer[:part_size]
+                    await send(body)
+                chunk = await anext(stream, None)
+                if chunk is None:
+                    break
+                buffer += chunk
+            if buffer:
+                await send(bytes(buffer))
+                buffer.clear()
+
+            parts = await asyncio.gather(*uploads)
+            response = await self._call(
+                'complete_multipart_upload',
+                Bucket=self.bucket_name,
+                Key=s3_key,
+                UploadId=upload_id,
+                MultipartUpload={'Parts': parts}
+            )
+        except BaseException as e:
+            for upload in uploads:
+                upload.cancel()
+            await asyncio.gather(*uploads, return_exceptions=True)
+            # Release whatever feeds the stream (e.g. an export's DB cursor) now, not at GC
+            if hasattr(stream, 'aclose'):
+                await stream.aclose()
+            try:
+                await self._call(
+                    'abort_multipart_upload',
+                    Bucket=self.bucket_name,
+                    Key=s3_key,
+                    UploadId=upload_id
+                )
+                logger.warning(f"Multipart upload aborted: s3://{self.bucket_name}/{s3_key} ({type(e).__name__})")
+            except Exception as abort_error:
+                logger.error(f"Failed to abort multipart upload {upload_id} for {s3_key}: {abort_error}")
+            if isinstance(e, ClientError):
+                error_code = e.response['Error']['Code']
+                logger.error(f"Failed to upload file to S3: {error_code} - {e}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to upload file to S3: {error_code}"
+                )
+            raise
+
+        logger.info(
+            f"Stream uploaded successfully to S3: s3://{self.bucket_name}/{s3_key} "
+            f"({len(uploads)} parts, {size_bytes} bytes)"
+        )
+        return {
+            'success': True,
+            'bucket': self.bucket_name,
+            's3_key': s3_key,
+            's3_url': f"s3://{self.bucket_name}/{s3_key}",
+            'etag': response.get('ETag', '').strip('"'),
+            'version_id': response.get('VersionId'),
+            'size_bytes': size_bytes
+        }
+
+    async def stream_file(
+        self,
+        s3_key: str,
+        byte_range: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> ObjectStream:
+        """
+        Open a file for streaming, optionally a single byte range
+
+        The body is read one chunk at a time on the S3 pool, only when the
+        consumer pulls the next chunk — a slow client slows the reads down
+        instead of buffering the object — so memory per download is one
+        chunk regardless of file size.
+
+        Args:
+            s3_key: S3 object key
+            byte_range: Range in HTTP form ("bytes=0-1023"); see parse_byte_range
+            chunk_size: Bytes per read (default: aws_s3_download_chunk_kb)
+
+        Returns:
+            ObjectStream with headers and the chunk iterator
+        """
+        self._check_initialization()
+        chunk_size = chunk_size or settings.aws_s3_download_chunk_kb * 1024
+        params = {'Bucket': self.bucket_name, 'Key': s3_key}
+        if byte_range:
+            params['Range'] = byte_range
+        try:
+            response = await self._call('get_object', **params)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code in ('NoSuchKey', '404'):
+                logger.error(f"File not found in S3: s3://{self.bucket_name}/{s3_key}")
+                raise HTTPException(status_code=404, detail="File not found")
+            if error_code == 'InvalidRange':
+                size = (await self.get_file_metadata(s3_key))['size_bytes']
+                raise HTTPException(
+                    status_code=416,
+                    detail="Requested range not satisfiable",
+                    headers={'Content-Range': f"bytes */{size}"}
+                )
+            logger.error(f"Failed to download file from S3: {error_code} - {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to download file from S3: {error_code}"
+            )
+
+        body = response['Body']
+
+        async def chunks() -> AsyncIterator[bytes]:
+            try:
+                while True:
+                    chunk = await self._run(body.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                # Also runs when the client disconnects mid-stream
+                await self._run(body.close)
+
+        return ObjectStream(
+            chunks=chunks(),
+            content_length=response.get('ContentLength', 0),
+            content_type=response.get('ContentType'),
+            etag=response.get('ETag'),
+            content_range=response.get('ContentRange') if byte_range else None
+        )
+
     async def download_file(self, s3_key: str) -> bytes:
         """
         Download file from S3
@@ -137,12 +531,12 @@ class S3Service:
         """
         self._check_initialization()
         try:
-            response = self.s3_client.get_object(
-                Bucket=self.bucket_name,
-                Key=s3_key
-            )
-            
-            file_content = response['Body'].read()
+            def get_object() -> bytes:
+                # The body streams over the same connection: read it on the pool thread too
+                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+                return response['Body'].read()
+
+            file_content = await self._run(get_object)
             logger.info(f"File downloaded successfully from S3: s3://{self.bucket_name}/{s3_key}")
             
             return file_content
@@ -168,6 +562,9 @@ class S3Service:
         """
         Generate presigned URL for file access
 
+        URLs are cached per (key, method) and reused until a safety margin
+        before they expire; see _presigned_urls.
+
         Args:
             s3_key: S3 object key
             expiration: URL expiration time in seconds (default: 1 hour)
@@ -177,6 +574,9 @@ class S3Service:
             Presigned URL string
         """
         self._check_initialization()
+        url = _cached_presigned_url(s3_key, http_method, expiration)
+        if url is not None:
+            return url
         try:
             if http_method == 'GET':
                 url = self.s3_client.generate_presigned_url(
@@ -194,6 +594,7 @@ class S3Service:
                 raise ValueError(f"Unsupported HTTP method: {http_method}")
             
             logger.info(f"Generated presigned URL for: s3://{self.bucket_name}/{s3_key}")
+            _cache_presigned_url(s3_key, http_method, expiration, url)
             return url
             
         except ClientError as e:
@@ -215,10 +616,12 @@ class S3Service:
         """
         self._check_initialization()
         try:
-            self.s3_client.delete_object(
+            await self._call(
+                'delete_object',
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
+            _forget_presigned_urls(s3_key)
             
             logger.info(f"File deleted successfully from S3: s3://{self.bucket_name}/{s3_key}")
             return True
@@ -242,7 +645,8 @@ class S3Service:
         """
         self._check_initialization()
         try:
-            self.s3_client.head_object(
+            await self._call(
+                'head_object',
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
@@ -271,7 +675,8 @@ class S3Service:
         """
         self._check_initialization()
         try:
-            response = self.s3_client.head_object(
+            response = await self._call(
+                'head_object',
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
@@ -0,0 +1,21 @@
+from .base import ObjectStream, StorageBackend, parse_byte_range
+from .local import LocalStorageBackend
+from ...core.config import settings
+
+
+def get_storage() -> StorageBackend:
+    """The configured storage backend (STORAGE_BACKEND)."""
+    if settings.storage_backend == "local":
+        return LocalStorageBackend()
+    # Imported here: s3_service itself builds on .base
+    from ..s3_service import S3Service
+    return S3Service()
+
+
+__all__ = [
+    "ObjectStream",
+    "StorageBackend",
+    "LocalStorageBackend",
+    "get_storage",
+    "parse_byte_range",
+]
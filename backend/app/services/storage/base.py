@@ -0,0 +1,113 @@
+"""
+Storage backend interface
+
+Documents, exports and DocAI read and write files through a
+``StorageBackend``; which one is configured by STORAGE_BACKEND. S3 is the
+production backend; the local filesystem backend lets the same code paths
+run (and be benchmarked) without AWS.
+"""
+
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+# A single byte range: "bytes=0-1023", "bytes=1024-" or "bytes=-500"
+_BYTE_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_byte_range(range_header: Optional[str]) -> Optional[str]:
+    """
+    Normalise an HTTP Range header to a single S3-compatible byte range.
+
+    Returns None — serve the whole object — when there is no header, it is
+    malformed, or it asks for several ranges (RFC 9110 allows ignoring it).
+    """
+    if not range_header:
+        return None
+    match = _BYTE_RANGE.match(range_header.strip().replace(' ', ''))
+    if not match or match.group(1) == match.group(2) == '':
+        return None
+    start, end = match.groups()
+    if start and end and int(end) < int(start):
+        return None
+    return f"bytes={start}-{end}"
+
+
+@dataclass
+class ObjectStream:
+    """An opened stored object, read chunk by chunk as the consumer asks for more."""
+    chunks: AsyncIterator[bytes]
+    content_length: int
+    content_type: Optional[str]
+    etag: Optional[str]
+    content_range: Optional[str] = None   # set when a byte range was served
+
+    @property
+    def partial(self) -> bool:
+        return self.content_range is not None
+
+
+class StorageBackend(ABC):
+    """
+    Object storage used by the application, addressed by key
+
+    Errors surface as HTTPException (404 for a missing object, 416 for an
+    unsatisfiable range, 500 otherwise), as endpoints pass them through.
+    """
+
+    name: str
+
+    @abstractmethod
+    async def upload_file(
+        self,
+        file_content: bytes,
+        key: str,
+        content_type: str = 'application/octet-stream',
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Store bytes under a key; returns at least ``s3_key`` and ``size_bytes``."""
+
+    @abstractmethod
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        key: str,
+        content_type: str = 'application/octet-stream',
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Store a byte stream without holding it in memory; nothing is stored if it fails."""
+
+    @abstractmethod
+    async def stream_file(
+        self,
+        key: str,
+        byte_range: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> ObjectStream:
+        """Open an object (or a single byte range of it, see parse_byte_range) for streaming."""
+
+    @abstractmethod
+    async def download_file(self, key: str) -> bytes:
+        """Read a whole object."""
+
+    @abstractmethod
+    async def generate_presigned_url(
+        self,
+        key: str,
+        expiration: int = 3600,
+        http_method: str = 'GET'
+    ) -> str:
+        """URL a client can fetch (GET) or upload (PUT) the object with directly."""
+
+    @abstractmethod
+    async def delete_file(self, key: str) -> bool:
+        """Delete an object; deleting a missing object is not an error."""
+
+    @abstractmethod
+    async def file_exists(self, key: str) -> bool:
+        """Whether an object exists."""
+
+    @abstractmethod
+    async def get_file_metadata(self, key: str) -> Dict[str, Any]:
+        """Size, last modified time, etag, content type and user metadata of an object."""
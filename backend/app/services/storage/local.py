@@ -0,0 +1,249 @@
+"""
+Local filesystem storage backend
+
+Objects are plain files under STORAGE_LOCAL_ROOT, with content type and
+user metadata in a JSON sidecar under ``.meta/``. Reads are memory-mapped:
+each streamed chunk is a copy out of the page cache, with no read()
+syscall per chunk. Meant for development, benchmarks and load tests — not
+shared between hosts.
+"""
+
+import asyncio
+import json
+import mmap
+import os
+import tempfile
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Optional, Tuple
+
+import structlog
+from fastapi import HTTPException
+
+from ...core.config import settings
+from .base import ObjectStream, StorageBackend
+
+logger = structlog.get_logger()
+
+_META_DIR = '.meta'
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix='.upload-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+def _resolve_range(byte_range: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """Inclusive (start, end) for a normalised "bytes=a-b" range; None if unsatisfiable."""
+    start, end = byte_range[len('bytes='):].split('-')
+    if not start:
+        # Suffix range: the last N bytes
+        length = int(end)
+        if length == 0 or size == 0:
+            return None
+        return max(0, size - length), size - 1
+    first = int(start)
+    if first >= size:
+        return None
+    return first, min(int(end), size - 1) if end else size - 1
+
+
+class LocalStorageBackend(StorageBackend):
+    """Storage backend on the local filesystem"""
+
+    name = 'local'
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root or settings.storage_local_root).resolve()
+
+    def _path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if path == self.root or not path.is_relative_to(self.root) or _META_DIR in path.relative_to(self.root).parts:
+            raise HTTPException(status_code=400, detail="Invalid storage key")
+        return path
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root / _META_DIR / f"{key}.json"
+
+    def _read_meta(self, key: str) -> Dict[str, Any]:
+        try:
+            return json.loads(self._meta_path(key).read_text())
+        except FileNotFoundError:
+            return {}
+
+    def _stat(self, key: str) -> os.stat_result:
+        try:
+            return self._path(key).stat()
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found")
+
+    @staticmethod
+    def _etag(stat: os.stat_result) -> str:
+        return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+    def _result(self, key: str, size: int) -> Dict[str, Any]:
+        return {
+            'success': True,
+            's3_key': key,
+            's3_url': self._path(key).as_uri(),
+            'etag': self._etag(self._path(key).stat()).strip('"'),
+            'version_id': None,
+            'size_bytes': size
+        }
+
+    def _store_meta(self, key: str, content_type: str, metadata: Optional[Dict[str, str]]) -> None:
+        meta = json.dumps({'content_type': content_type, 'metadata': metadata or {}})
+        _write_file(self._meta_path(key), meta.encode())
+
+    async def upload_file(
+        self,
+        file_content: bytes,
+        key: str,
+        content_type: str = 'application/octet-stream',
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        path = self._path(key)
+
+        def write() -> Dict[str, Any]:
+            _write_file(path, file_content)
+            self._store_meta(key, content_type, metadata)
+            return self._result(key, len(file_content))
+
+        result = await asyncio.to_thread(write)
+        logger.info("File stored", backend=self.name, key=key, bytes=len(file_content))
+        return result
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        key: str,
+        content_type: str = 'application/octet-stream',
+        metadata: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        path = self._path(key)
+        await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+        tmp = path.parent / f".upload-{uuid.uuid4().hex}"
+        f = await asyncio.to_thread(open, tmp, 'wb')
+        size_bytes = 0
+        try:
+            async for chunk in chunks:
+                await asyncio.to_thread(f.write, chunk)
+                size_bytes += len(chunk)
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(os.replace, tmp, path)
+        except BaseException:
+            await asyncio.to_thread(f.close)
+            await asyncio.to_thread(tmp.unlink, missing_ok=True)
+            # Release whatever feeds the stream (e.g. an export's DB cursor) now, not at GC
+            if hasattr(chunks, 'aclose'):
+                await chunks.aclose()
+            raise
+
+        await asyncio.to_thread(self._store_meta, key, content_type, metadata)
+        logger.info("Stream stored", backend=self.name, key=key, bytes=size_bytes)
+        return await asyncio.to_thread(self._result, key, size_bytes)
+
+    async def stream_file(
+        self,
+        key: str,
+        byte_range: Optional[str] = None,
+        chunk_size: Optional[int] = None
+    ) -> ObjectStream:
+        chunk_size = chunk_size or settings.aws_s3_download_chunk_kb * 1024
+        path = self._path(key)
+        try:
+            f = await asyncio.to_thread(open, path, 'rb')
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found")
+        stat = os.fstat(f.fileno())
+        size = stat.st_size
+
+        start, end = 0, size - 1
+        content_range = None
+        if byte_range:
+            resolved = _resolve_range(byte_range, size)
+            if resolved is None:
+                f.close()
+                raise HTTPException(
+                    status_code=416,
+                    detail="Requested range not satisfiable",
+                    headers={'Content-Range': f"bytes */{size}"}
+                )
+            start, end = resolved
+            content_range = f"bytes {start}-{end}/{size}"
+
+        # mmap rejects empty files; there is nothing to map anyway
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+
+        async def chunks() -> AsyncIterator[bytes]:
+            try:
+                position = start
+                while position <= end:
+                    stop = min(position + chunk_size, end + 1)
+                    # Slicing copies out of the mapping; a cold page faults to disk, so off the loop
+                    yield await asyncio.to_thread(mapped.__getitem__, slice(position, stop))
+                    position = stop
+            finally:
+                if mapped is not None:
+                    mapped.close()
+                f.close()
+
+        meta = await asyncio.to_thread(self._read_meta, key)
+        return ObjectStream(
+            chunks=chunks(),
+            content_length=end - start + 1,
+            content_type=meta.get('content_type'),
+            etag=self._etag(stat),
+            content_range=content_range
+        )
+
+    async def download_file(self, key: str) -> bytes:
+        try:
+            return await asyncio.to_thread(self._path(key).read_bytes)
+        except FileNotFoundError:
+            raise HTTPException(status_code=404, detail="File not found")
+
+    async def generate_presigned_url(
+        self,
+        key: str,
+        expiration: int = 3600,
+        http_method: str = 'GET'
+    ) -> str:
+        if http_method not in ('GET', 'PUT'):
+            raise ValueError(f"Unsupported HTTP method: {http_method}")
+        # No signing on a local disk: the file URI is only usable on this host
+        return self._path(key).as_uri()
+
+    async def delete_file(self, key: str) -> bool:
+        path = self._path(key)
+
+        def delete() -> None:
+            path.unlink(missing_ok=True)
+            self._meta_path(key).unlink(missing_ok=True)
+
+        await asyncio.to_thread(delete)
+        logger.info("File deleted", backend=self.name, key=key)
+        return True
+
+    async def file_exists(self, key: str) -> bool:
+        return await asyncio.to_thread(self._path(key).is_file)
+
+    async def get_file_metadata(self, key: str) -> Dict[str, Any]:
+        stat = await asyncio.to_thread(self._stat, key)
+        meta = await asyncio.to_thread(self._read_meta, key)
+        return {
+            'size_bytes': stat.st_size,
+            'last_modified': datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc),
+            'etag': self._etag(stat).strip('"'),
+            'content_type': meta.get('content_type', ''),
+            'metadata': meta.get('metadata', {}),
+            'version_id': None
+        }
@@ -0,0 +1,463 @@
+"""
+Document AI pipeline throughput.
+
+Generates synthetic PDFs (a purchase order summary on the first page,
+filler clauses after it), uploads them through DocumentService and runs
+the pipeline on the local stand-ins for Textract and Bedrock
+(app.services.docai.stub) until every document reaches review. Reports
+documents per minute, p50 / p99 latency per stage and the depth of each
+pipeline queue over the run, and checks that every document got its own
+PO number back.
+
+Pipeline settings (DOCAI_OCR_CONCURRENCY, DOCAI_EXTRACT_BATCH_SIZE,
+DOCAI_TEXTRACT_POLL_SECONDS, ...) come from the environment as usual; the
+flags shape the workload and the stand-ins. With --min-docs-per-minute
+or --max-p99-seconds the exit status makes a run a regression gate.
+
+Needs a PostgreSQL server, nothing else: a scratch database is created
+next to DATABASE_URL's, migrated and dropped afterwards (--keep-database
+to inspect it). Files go to a temporary local storage directory.
+
+    cd backend
+    python -m benchmarks.docai_pipeline --documents 200 --workers 2 \\
+        --ocr-failure-rate 0.02 --model-throttle-rate 0.05 --min-docs-per-minute 60
+"""
+
+import argparse
+import asyncio
+import io
+import json
+import logging
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+BACKEND = Path(__file__).resolve().parent.parent
+
+# Pipeline statuses in order; a document seen at one has passed every earlier one
+STAGE_ORDER = ["pending", "ocr_running", "extracting", "review"]
+# Stage latency: from reaching the first status to reaching the second
+STAGES = {
+    "ocr_queue": ("uploaded", "ocr_running"),
+    "ocr": ("ocr_running", "extracting"),
+    "extract": ("extracting", "review"),
+    "end_to_end": ("upload_started", "review"),
+}
+FILLER = (
+    "The Supplier shall deliver the Services described in the Statement of Work in accordance "
+    "with the milestones agreed between the parties."
+)
+
+
+def _pdf_string(line: str) -> str:
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def synthetic_pdf(pages: List[List[str]]) -> bytes:
+    """A minimal PDF with a real text layer: one Helvetica line per entry, one page per list."""
+    objects: Dict[int, bytes] = {
+        1: b"<< /Type /Catalog /Pages 2 0 R >>",
+        3: b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    }
+    kids = []
+    for index, lines in enumerate(pages):
+        page_id, content_id = 4 + 2 * index, 5 + 2 * index
+        kids.append(f"{page_id} 0 R")
+        stream = "BT /F1 9 Tf 12 TL 40 800 Td " + " ".join(f"({_pdf_string(line)}) '" for line in lines) + " ET"
+        objects[page_id] = (
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_id} 0 R >>"
+        ).encode()
+        objects[content_id] = f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream".encode()
+    objects[2] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(pages)} >>".encode()
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = {}
+    for number in sorted(objects):
+        offsets[number] = out.tell()
+        out.write(f"{number} 0 obj\n".encode() + objects[number] + b"\nendobj\n")
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    for number in sorted(objects):
+        out.write(f"{offsets[number]:010d} 00000 n \n".encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+def synthetic_document(index: int, pages: int) -> Tuple[bytes, str]:
+    """A purchase order PDF of ``pages`` pages and its PO number."""
+    po_number = f"PO-{index:06d}"
+    summary = [
+        f"Customer: Benchmark Customer {index % 37}",
+        f"Project: Managed services {index}",
+        f"PO Number: {po_number}",
+        f"Total: SGD {1000 + index * 17.5:,.2f}",
+        f"PO Date: 2026-{1 + index % 12:02d}-{1 + index % 28:02d}",
+        "Start Date: 2026-01-01",
+        "End Date: 2026-12-31",
+        "Payment terms: Net 30",
+    ]
+    body = [
+        [f"Clause {page}.{line}: {FILLER}" for line in range(1, 41)]
+        for page in range(2, pages + 1)
+    ]
+    return synthetic_pdf([summary + [FILLER] * 10] + body), po_number
+
+
+def page_mix(count: int, max_pages: int, rng: random.Random) -> List[int]:
+    """Mostly short POs, some longer SOWs, a few long enough to be split into page ranges."""
+    sizes = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.6:
+            sizes.append(1)
+        elif roll < 0.9:
+            sizes.append(rng.randint(2, min(12, max_pages)))
+        else:
+            sizes.append(rng.randint(min(13, max_pages), max_pages))
+    return sizes
+
+
+def percentile(values: List[float], share: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * share))], 2)
+
+
+@asynccontextmanager
+async def scratch_database(url: str, keep: bool) -> AsyncIterator[str]:
+    """Create and migrate a database next to ``url``'s; drop it on the way out."""
+    from sqlalchemy import text
+    from sqlalchemy.engine import make_url
+    from sqlalchemy.ext.asyncio import create_async_engine
+
+    base = make_url(url)
+    name = f"{base.database}_docai_bench_{os.getpid()}"
+    admin = create_async_engine(base.set(database="postgres"), isolation_level="AUTOCOMMIT")
+    async with admin.connect() as conn:
+        await conn.execute(text(f'CREATE DATABASE "{name}"'))
+    # Swap the name in the URL as given: a rendered URL escapes the query, which alembic.ini can't take
+    location, _, query = url.partition("?")
+    scratch = f"{location.rpartition('/')[0]}/{name}" + (f"?{query}" if query else "")
+    try:
+        migration = subprocess.run(
+            [sys.executable, "-m", "alembic", "upgrade", "head"],
+            cwd=BACKEND,
+            env={**os.environ, "DATABASE_URL": scratch},
+            capture_output=True,
+            text=True,
+        )
+        if migration.returncode:
+            raise RuntimeError(f"Migrating the scratch database failed:\n{migration.stderr}")
+        yield scratch
+    finally:
+        if keep:
+            print(f"kept database {name}")
+        else:
+            async with admin.connect() as conn:
+                await conn.execute(text(f'DROP DATABASE IF EXISTS "{name}" WITH (FORCE)'))
+        await admin.dispose()
+
+
+class Sampler:
+    """Polls document statuses: when each document reached each status, and queue depth over time."""
+
+    def __init__(self, pipelines, interval: float):
+        self.pipelines = pipelines
+        self.interval = interval
+        self.reached: Dict[int, Dict[str, float]] = defaultdict(dict)
+        self.depth: Dict[str, List[int]] = defaultdict(list)
+        self.finished: Dict[int, str] = {}
+
+    async def sample(self) -> None:
+        from sqlalchemy import select
+
+        from app.core import database
+        from app.models.document import Document
+
+        async with database.AsyncSessionLocal() as db:
+            rows = (await db.execute(
+                select(Document.id, Document.extraction_status, Document.claimed_by, Document.extraction_completed_at)
+            )).all()
+        now = time.time()
+        counts: Dict[str, int] = defaultdict(int)
+        for document_id, status, claimed_by, completed_at in rows:
+            status = status.value
+            if status == "extracting" and claimed_by is None:
+                counts["extract_waiting"] += 1
+            else:
+                counts[status] += 1
+            if status == "failed":
+                self.finished[document_id] = status
+                continue
+            reached = self.reached[document_id]
+            for earlier in STAGE_ORDER[:STAGE_ORDER.index(status) + 1]:
+                reached.setdefault(earlier, now)
+            if status == "review":
+                reached["review"] = min(reached["review"], completed_at.timestamp())
+                self.finished[document_id] = status
+        for name in ("pending", "ocr_running", "extract_waiting", "extracting"):
+            self.depth[name].append(counts[name])
+        snapshots = [pipeline.snapshot() for pipeline in self.pipelines]
+        self.depth["ocr_jobs_in_flight"].append(sum(snapshot["ocr_jobs"]["in_flight"] for snapshot in snapshots))
+        for stage in ("ocr", "extract"):
+            self.depth[f"{stage}_held"].append(sum(snapshot[stage]["held"] for snapshot in snapshots))
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            await self.sample()
+            try:
+                await asyncio.wait_for(stop.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    from sqlalchemy import select
+
+    from app.core import database
+    from app.core.config import settings
+    from app.core.metrics import metrics_snapshot
+    from app.models.account import Account
+    from app.models.document import Document, DocumentType
+    from app.models.opportunity import Opportunity
+    from app.models.user import User
+    from app.services.docai import DocAIPipeline, StubFieldExtractor, StubOcrEngine
+    from app.services.document_service import DocumentService
+
+    per_worker = settings.docai_ocr_concurrency + settings.docai_extract_concurrency + 2
+    database.init_db(
+        database_url=settings.database_url,
+        pool_size=args.workers * per_worker + args.upload_concurrency + 2,
+        max_overflow=settings.database_max_overflow,
+    )
+    async with database.AsyncSessionLocal() as db:
+        user = User(email="benchmark@example.com", hashed_password="-", first_name="Bench", last_name="Mark")
+        account = Account(name="Benchmark Customer")
+        db.add_all([user, account])
+        await db.flush()
+        opportunity = Opportunity(name="Benchmark deal", account_id=account.id, owner_id=user.id)
+        db.add(opportunity)
+        await db.commit()
+        user_id, opportunity_id = user.id, opportunity.id
+
+    rng = random.Random(args.seed)
+    random.seed(args.seed)
+    sizes = page_mix(args.documents, args.max_pages, rng)
+    print(f"generating {args.documents} PDFs ({sum(sizes)} pages)")
+    files = [synthetic_document(index, pages) for index, pages in enumerate(sizes, start=1)]
+    expected = {}
+
+    pipelines = [
+        DocAIPipeline(
+            StubOcrEngine(
+                job_seconds=args.ocr_job_seconds,
+                seconds_per_page=args.ocr_seconds_per_page,
+                failure_rate=args.ocr_failure_rate,
+            ),
+            StubFieldExtractor(
+                latency_seconds=args.model_latency,
+                seconds_per_1k_tokens=args.model_seconds_per_1k_tokens,
+                throttle_rate=args.model_throttle_rate,
+                failure_rate=args.model_failure_rate,
+            ),
+            worker_id=f"benchmark-{worker}",
+        )
+        for worker in range(args.workers)
+    ]
+    sampler = Sampler(pipelines, args.sample_ms / 1000)
+    stop_sampling = asyncio.Event()
+    tasks = [asyncio.create_task(pipeline.run()) for pipeline in pipelines]
+    sampling = asyncio.create_task(sampler.run(stop_sampling))
+
+    upload_seconds: List[float] = []
+    pending_files = asyncio.Queue()
+    for index, (data, po_number) in enumerate(files, start=1):
+        pending_files.put_nowait((index, data, po_number))
+
+    async def uploader() -> None:
+        while not pending_files.empty():
+            index, data, po_number = pending_files.get_nowait()
+            if args.arrival_rate:
+                await asyncio.sleep(max(0.0, started + index / args.arrival_rate - time.time()))
+            began = time.time()
+            async with database.AsyncSessionLocal() as db:
+                stored = await DocumentService(db).store_document(
+                    opportunity_id,
+                    DocumentType.po,
+                    io.BytesIO(data),
+                    f"benchmark-{index}.pdf",
+                    "application/pdf",
+                    await db.get(User, user_id),
+                )
+            done = time.time()
+            upload_seconds.append(done - began)
+            reached = sampler.reached[stored.document.id]
+            reached["upload_started"], reached["uploaded"] = began, done
+            expected[stored.document.id] = po_number
+
+    started = time.time()
+    await asyncio.gather(*(uploader() for _ in range(args.upload_concurrency)))
+    uploaded = time.time()
+    print(f"uploaded in {uploaded - started:.1f}s; waiting for review")
+
+    deadline = started + args.timeout
+    while len(sampler.finished) < args.documents and time.time() < deadline:
+        await asyncio.sleep(args.sample_ms / 1000)
+    timed_out = len(sampler.finished) < args.documents
+    stop_sampling.set()
+    await sampling
+    await sampler.sample()
+    for pipeline in pipelines:
+        pipeline.stop()
+    await asyncio.gather(*tasks)
+
+    async with database.AsyncSessionLocal() as db:
+        found = dict((await db.execute(select(Document.id, Document.extracted_fields))).all())
+    correct = sum(
+        1 for document_id, po_number in expected.items()
+        if ((found.get(document_id) or {}).get("po_id") or {}).get("value") == po_number
+    )
+    reviewed = [reached for reached in sampler.reached.values() if "review" in reached]
+    finished_at = max((reached["review"] for reached in reviewed), default=time.time())
+    elapsed = finished_at - started
+    await database.engine.dispose()
+
+    latencies = {
+        stage: [reached[end] - reached[begin] for reached in reviewed if begin in reached and end in reached]
+        for stage, (begin, end) in STAGES.items()
+    }
+    latencies = {"upload": upload_seconds, **latencies}
+    extractors = [pipeline.extractor for pipeline in pipelines]
+    model_calls = sum(extractor.calls for extractor in extractors)
+    return {
+        "documents": args.documents,
+        "pages": sum(sizes),
+        "workers": args.workers,
+        "reviewed": len(reviewed),
+        "failed": sum(1 for status in sampler.finished.values() if status == "failed"),
+        "timed_out": timed_out,
+        "po_numbers_correct": correct,
+        "seconds": round(elapsed, 1),
+        "docs_per_minute": round(len(reviewed) / elapsed * 60, 1) if elapsed > 0 else 0.0,
+        "latency": {
+            stage: {"p50": percentile(values, 0.5), "p99": percentile(values, 0.99)}
+            for stage, values in latencies.items()
+        },
+        "queue_depth": {
+            name: {"max": max(values), "mean": round(sum(values) / len(values), 1)}
+            for name, values in sampler.depth.items() if values
+        },
+        "model": {
+            "calls": model_calls,
+            "documents_per_call": round(sum(extractor.documents for extractor in extractors) / model_calls, 2)
+            if model_calls else None,
+            "throttled": sum(extractor.throttled for extractor in extractors),
+        },
+        "metrics": {
+            name: value for name, value in metrics_snapshot().items()
+            if name in ("docai_ocr", "docai_extract", "docai_ocr_jobs", "docai_model")
+        },
+        "settings": {
+            name: getattr(settings, name) for name in (
+                "docai_ocr_concurrency", "docai_extract_concurrency", "docai_stage_queue_size",
+                "docai_ocr_pages_per_range", "docai_textract_poll_seconds", "docai_textract_max_jobs",
+                "docai_extract_batch_size", "docai_extract_batch_wait_ms", "docai_bedrock_tokens_per_minute",
+            )
+        },
+    }
+
+
+async def main_async(args: argparse.Namespace) -> Dict[str, Any]:
+    async with scratch_database(args.database_url, args.keep_database) as url:
+        os.environ["DATABASE_URL"] = url
+        return await run(args)
+
+
+def report(result: Dict[str, Any]) -> None:
+    print(
+        f"{result['reviewed']}/{result['documents']} documents ({result['pages']} pages) reviewed "
+        f"in {result['seconds']}s with {result['workers']} worker(s): {result['docs_per_minute']} docs/min; "
+        f"{result['failed']} failed, {result['po_numbers_correct']} PO numbers correct"
+        + ("; TIMED OUT" if result["timed_out"] else "")
+    )
+    print(f"{'stage':>12}  {'p50_s':>8}  {'p99_s':>8}")
+    for stage, values in result["latency"].items():
+        print(f"{stage:>12}  {values['p50'] if values['p50'] is not None else '-':>8}  "
+              f"{values['p99'] if values['p99'] is not None else '-':>8}")
+    print(f"{'queue':>18}  {'max':>6}  {'mean':>6}")
+    for name, values in result["queue_depth"].items():
+        print(f"{name:>18}  {values['max']:>6}  {values['mean']:>6}")
+    model = result["model"]
+    print(f"model: {model['calls']} calls, {model['documents_per_call']} documents per call, "
+          f"{model['throttled']} throttled")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default=os.environ.get("DATABASE_URL"),
+                        help="server to create the scratch database on (DATABASE_URL)")
+    parser.add_argument("--keep-database", action="store_true", help="leave the scratch database in place")
+    parser.add_argument("--documents", type=int, default=100)
+    parser.add_argument("--max-pages", type=int, default=40, help="longest synthetic document")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=1, help="pipeline workers (each with its own stand-ins)")
+    parser.add_argument("--upload-concurrency", type=int, default=4)
+    parser.add_argument("--arrival-rate", type=float, default=0, help="uploads per second (0: all at once)")
+    parser.add_argument("--ocr-job-seconds", type=float, default=2.0)
+    parser.add_argument("--ocr-seconds-per-page", type=float, default=0.3)
+    parser.add_argument("--ocr-failure-rate", type=float, default=0.0)
+    parser.add_argument("--model-latency", type=float, default=1.0, help="seconds per model call")
+    parser.add_argument("--model-seconds-per-1k-tokens", type=float, default=0.5)
+    parser.add_argument("--model-throttle-rate", type=float, default=0.0)
+    parser.add_argument("--model-failure-rate", type=float, default=0.0)
+    parser.add_argument("--sample-ms", type=int, default=100, help="status sampling interval")
+    parser.add_argument("--timeout", type=float, default=900, help="give up after this many seconds")
+    parser.add_argument("--min-docs-per-minute", type=float, help="fail below this throughput")
+    parser.add_argument("--max-p99-seconds", type=float, help="fail above this end-to-end p99")
+    parser.add_argument("--json", action="store_true", help="print the result as JSON")
+    parser.add_argument("--verbose", action="store_true", help="show the pipeline's logs (simulated failures log errors)")
+    args = parser.parse_args()
+    if not args.database_url:
+        parser.error("set DATABASE_URL or pass --database-url")
+
+    storage_root = tempfile.mkdtemp(prefix="docai-benchmark-")
+    os.environ.update(STORAGE_BACKEND="local", STORAGE_LOCAL_ROOT=storage_root)
+    if not args.verbose:
+        import structlog
+        structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.CRITICAL))
+    try:
+        result = asyncio.run(main_async(args))
+    finally:
+        shutil.rmtree(storage_root, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+    else:
+        report(result)
+
+    failures = []
+    if result["timed_out"]:
+        failures.append("documents still in the pipeline at the timeout")
+    if args.min_docs_per_minute is not None and result["docs_per_minute"] < args.min_docs_per_minute:
+        failures.append(f"{result['docs_per_minute']} docs/min < {args.min_docs_per_minute}")
+    p99 = result["latency"]["end_to_end"]["p99"]
+    if args.max_p99_seconds is not None and (p99 is None or p99 > args.max_p99_seconds):
+        failures.append(f"end-to-end p99 {p99}s > {args.max_p99_seconds}s")
+    if failures:
+        print("FAILED: " + "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
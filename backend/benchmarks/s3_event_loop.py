@@ -0,0 +1,154 @@
+"""
+Event-loop impact of S3 calls.
+
+Uploads several large objects concurrently while a probe coroutine ticks
+every 10 ms, and reports how late the ticks ran — the delay every other
+request on the worker would see. Compares boto3 called directly on the
+loop (the old S3Service behaviour) with the offloaded S3Service.
+
+Runs against a local S3 stand-in: an S3-compatible endpoint given by
+AWS_S3_ENDPOINT_URL (MinIO, LocalStack), or else a moto server started on a
+free port (``pip install -r requirements-dev.txt``).
+
+    cd backend
+    python -m benchmarks.s3_event_loop --uploads 8 --size-mb 20
+"""
+
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+BUCKET = "pipeline-pulse-benchmark"
+TICK_SECONDS = 0.01
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def s3_endpoint() -> Iterator[str]:
+    """Yield an S3 endpoint URL, starting a moto server when none is configured."""
+    configured = os.environ.get("AWS_S3_ENDPOINT_URL")
+    if configured:
+        yield configured
+        return
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "moto.server", "-H", "127.0.0.1", "-p", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 15
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("moto server did not start (is moto[server] installed?)")
+                time.sleep(0.1)
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        server.terminate()
+        server.wait()
+
+
+async def _probe(stop: asyncio.Event, lags: List[float]) -> None:
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        expected = loop.time() + TICK_SECONDS
+        await asyncio.sleep(TICK_SECONDS)
+        lags.append(max(0.0, loop.time() - expected))
+
+
+async def _measure(label: str, uploads, count: int) -> Dict[str, float]:
+    lags: List[float] = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_probe(stop, lags))
+    started = time.perf_counter()
+    await asyncio.gather(*(uploads(index) for index in range(count)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    lags_ms = sorted(lag * 1000 for lag in lags) or [0.0]
+    return {
+        "mode": label,
+        "seconds": round(elapsed, 2),
+        "ticks": len(lags),
+        "lag_p50_ms": round(statistics.median(lags_ms), 1),
+        "lag_p99_ms": round(lags_ms[min(len(lags_ms) - 1, int(len(lags_ms) * 0.99))], 1),
+        "lag_max_ms": round(lags_ms[-1], 1),
+    }
+
+
+async def run(count: int, size_mb: int) -> List[Dict[str, float]]:
+    from app.core.config import settings
+    from app.core.metrics import metrics_snapshot
+    from app.services.s3_service import S3Service, shutdown_s3_executor
+
+    service = S3Service()
+    client = service.s3_client
+    try:
+        client.create_bucket(
+            Bucket=BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": settings.aws_region},
+        )
+    except client.exceptions.BucketAlreadyOwnedByYou:
+        pass
+
+    payload = os.urandom(size_mb * 1024 * 1024)
+
+    async def blocking_upload(index: int) -> None:
+        # What S3Service used to do: a blocking call inside an async method
+        client.put_object(Bucket=BUCKET, Key=f"blocking/{index}", Body=payload)
+
+    async def offloaded_upload(index: int) -> None:
+        await service.upload_file(payload, f"offloaded/{index}", content_type="application/octet-stream")
+
+    results = [
+        await _measure("blocking boto3 on loop", blocking_upload, count),
+        await _measure("S3Service (offloaded)", offloaded_upload, count),
+    ]
+    print(f"s3 pool: {metrics_snapshot().get('s3')}")
+    shutdown_s3_executor()
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--uploads", type=int, default=8, help="concurrent uploads")
+    parser.add_argument("--size-mb", type=int, default=20, help="object size")
+    args = parser.parse_args()
+
+    with s3_endpoint() as endpoint:
+        os.environ["AWS_S3_ENDPOINT_URL"] = endpoint
+        os.environ["AWS_S3_BUCKET_NAME"] = BUCKET
+        os.environ.setdefault("AWS_ACCESS_KEY_ID", "benchmark")
+        os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "benchmark")
+        results = asyncio.run(run(args.uploads, args.size_mb))
+
+    print(f"{args.uploads} x {args.size_mb} MB uploads against {endpoint}")
+    header = ("mode", "seconds", "ticks", "lag_p50_ms", "lag_p99_ms", "lag_max_ms")
+    print("  ".join(f"{column:>22}" if i == 0 else f"{column:>10}" for i, column in enumerate(header)))
+    for result in results:
+        print("  ".join(
+            f"{result[column]:>22}" if i == 0 else f"{result[column]:>10}"
+            for i, column in enumerate(header)
+        ))
+
+
+if __name__ == "__main__":
+    main()